@@ -12,11 +12,7 @@ from app.utils.seeder import seed_elasticsearch
 from app.db.session import get_db
 from app.models.dataset import Dataset
 from app.schemas.common import Dataset as DatasetSchema, DatasetCreate, DatasetUpdate
-
-try:  # pragma: no cover - optional dependency warning handled in runtime
-    from elasticsearch import Elasticsearch
-except ImportError:  # pragma: no cover - fallback for environments without ES client
-    Elasticsearch = None  # type: ignore
+from app.services.es_clients import ElasticsearchUnavailable, get_es_client
 
 router = APIRouter()
 
@@ -76,11 +72,13 @@ def seed_demo_data():
     seed_path = settings.resolve_path(settings.seed_es_path)
     if not seed_path.exists():
         raise HTTPException(status_code=404, detail="Demo seed file not found")
-    if Elasticsearch is None:
-        raise HTTPException(status_code=500, detail="Elasticsearch client is not installed")
     try:
-        es = Elasticsearch(settings.elasticsearch_hosts)
+        es = get_es_client(settings.elasticsearch_hosts)
+    except ElasticsearchUnavailable as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
     except Exception as exc:  # pragma: no cover - connection failures covered via integration test mocks
         raise HTTPException(status_code=503, detail=f"Failed to connect to Elasticsearch: {exc}") from exc
-    indexed = seed_elasticsearch(es, seed_path)
+    indexed = seed_elasticsearch(
+        es, seed_path, chunk_size=settings.seed_bulk_chunk_size, concurrency=settings.seed_bulk_concurrency
+    )
     return {"indexed": indexed, "source": str(seed_path)}
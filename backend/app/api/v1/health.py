@@ -1,8 +1,30 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.services.startup import get_startup_state
 
 router = APIRouter()
 
 
 @router.get("/")
 def read_health():
+    """Liveness: the process is up and serving requests."""
+
     return {"status": "ok"}
+
+
+@router.get("/ready")
+def read_readiness(response: Response, db: Session = Depends(get_db)):
+    """Readiness: startup work has finished and the database answers; ``503`` until then."""
+
+    startup = get_startup_state()
+    try:
+        db.execute(text("SELECT 1"))
+        database = "ok"
+    except Exception as exc:
+        database = f"unavailable: {exc}"
+    ready = startup.ready and database == "ok"
+    response.status_code = 200 if ready else 503
+    return {"status": "ready" if ready else "not_ready", "checks": {"database": database, "startup": startup.as_dict()}}
@@ -10,6 +10,7 @@ from app.db.session import get_db
 from app.models.rulepack import Rule, RulePack
 from app.schemas.common import Rule as RuleSchema
 from app.schemas.common import RuleCreate, RulePack as RulePackSchema, RulePackList, RuleUpdate
+from app.services.rulepack_cache import get_rulepack_cache
 from app.services.rulepack_service import RulepackImportError, load_rulepack_from_excel
 
 router = APIRouter()
@@ -31,6 +32,11 @@ def list_rulepacks(db: Session = Depends(get_db)):
     return rulepacks
 
 
+@router.get("/cache/stats")
+def rulepack_cache_stats():
+    return get_rulepack_cache().stats()
+
+
 @router.get("/{rulepack_id}", response_model=RulePackSchema)
 def get_rulepack(rulepack_id: int, db: Session = Depends(get_db)):
     rulepack = db.query(RulePack).filter(RulePack.id == rulepack_id).first()
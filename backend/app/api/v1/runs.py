@@ -1,20 +1,34 @@
 from __future__ import annotations
 
-import json
+import logging
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Optional
 
-import yaml
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, selectinload
 
 from app.core.config import get_settings
 from app.db.session import get_db
-from app.models.run import Run, RunRuleResult
-from app.schemas.common import Run as RunSchema, RunRuleResultSchema, RunSummary
-from app.schemas.run_requests import RunExportRequest, StartRunRequest
-from app.services.evaluation_service import EvaluationService
+from app.models.run import DecisionTrace, Run, RunRuleResult
+from app.schemas.common import (
+    DecisionTracePage,
+    DecisionTraceRow,
+    RunDetail,
+    RunRuleResultSummary,
+    RunStatus,
+    RunSummary,
+)
+from app.schemas.run_requests import RunExportRequest, RunResultFilter, StartRunRequest
+from app.services.es_clients import get_es_client
+from app.services.evaluation_service import EvaluationService, RunOptions
+from app.services.run_export import RunExporter
+from app.services.run_queue import RunProgress, get_run_queue
+
+logger = logging.getLogger(__name__)
+
+MAX_DECISION_PAGE_SIZE = 1000
 
 router = APIRouter()
 
@@ -25,43 +39,113 @@ def list_runs(db: Session = Depends(get_db)):
     return [RunSummary.from_orm(run) for run in runs]
 
 
-@router.post("/start", response_model=RunSchema)
+@router.post("/start", response_model=RunDetail)
 def start_run(payload: StartRunRequest, db: Session = Depends(get_db)):
-    from elasticsearch import Elasticsearch
-
     settings = get_settings()
     from app.models.dataset import Dataset
 
     dataset = db.query(Dataset).filter(Dataset.id == payload.dataset_id).first()
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
+    options = RunOptions(
+        engine=payload.engine,
+        mode=payload.mode,
+        retention=payload.trace_retention,
+        sample_size=payload.trace_sample_size,
+        baseline_run_id=payload.baseline_run_id,
+        profile=payload.profile,
+    )
+    service = EvaluationService(db, None)
+    try:
+        options.validate()
+        if options.baseline_run_id is not None:
+            service.resolve_baseline(options.baseline_run_id, payload.rulepack_id, payload.dataset_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     hosts = [dataset.host] if dataset.host else settings.elasticsearch_hosts
-    es = Elasticsearch(hosts)
-    service = EvaluationService(db, es)
-    run = service.run(payload.domain, payload.rulepack_id, payload.dataset_id, payload.status_labels)
-    return run
+    run = service.create_run(payload.domain, payload.rulepack_id, payload.dataset_id)
+    run_id = run.id
+    # Serialize before committing so the request session is done with the
+    # database by the time the worker picks the run up.
+    response = RunDetail.from_orm(run)
+    db.commit()
+
+    def execute(progress: RunProgress) -> None:
+        from app.db import session as session_module
+
+        worker_db = session_module.SessionLocal()
+        try:
+            worker_service = EvaluationService(worker_db, get_es_client(hosts))
+            queued_run = worker_db.get(Run, run_id)
+            worker_service.execute(queued_run, payload.status_labels, options=options, progress=progress)
+        except Exception:
+            logger.exception("Run %s failed", run_id)
+        finally:
+            worker_db.close()
+
+    get_run_queue().submit(run_id, execute)
+    return response
+
+
+@router.get("/{run_id}/status", response_model=RunStatus)
+def get_run_status(run_id: int, db: Session = Depends(get_db)):
+    run = db.query(Run).filter(Run.id == run_id).first()
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    status = RunStatus.from_orm(run)
+    live = get_run_queue().progress(run_id)
+    if live is not None:
+        status.progress = live.as_dict()
+    return status
 
 
-@router.get("/{run_id}", response_model=RunSchema)
+@router.get("/{run_id}", response_model=RunDetail)
 def get_run(run_id: int, db: Session = Depends(get_db)):
-    run = db.query(Run).filter(Run.id == run_id).first()
+    run = db.query(Run).options(selectinload(Run.rule_results)).filter(Run.id == run_id).first()
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
-    return run
+    return RunDetail.from_orm(run)
 
 
-@router.get("/{run_id}/rules", response_model=List[RunRuleResultSchema])
+@router.get("/{run_id}/rules", response_model=List[RunRuleResultSummary])
 def get_run_rule_results(run_id: int, db: Session = Depends(get_db)):
-    run_results = db.query(RunRuleResult).filter(RunRuleResult.run_id == run_id).all()
-    return run_results
-
-
-@router.get("/{run_id}/decisions", response_model=List[RunRuleResultSchema])
-def get_run_decisions(run_id: int, db: Session = Depends(get_db)):
-    run_results = (
-        db.query(RunRuleResult).filter(RunRuleResult.run_id == run_id).all()
-    )
-    return run_results
+    run_results = db.query(RunRuleResult).filter(RunRuleResult.run_id == run_id).order_by(RunRuleResult.id).all()
+    return [RunRuleResultSummary.from_orm(result) for result in run_results]
+
+
+@router.get("/{run_id}/decisions", response_model=DecisionTracePage)
+def get_run_decisions(
+    run_id: int,
+    rule_id: Optional[int] = None,
+    status: Optional[str] = None,
+    after: Optional[int] = Query(None, ge=0),
+    page: int = Query(1, ge=1),
+    size: int = Query(50, ge=1, le=MAX_DECISION_PAGE_SIZE),
+    db: Session = Depends(get_db),
+):
+    filters = RunResultFilter(rule_id=rule_id, status=status, after=after, page=page, size=size)
+    if not db.query(Run.id).filter(Run.id == run_id).first():
+        raise HTTPException(status_code=404, detail="Run not found")
+    rule_results = db.query(RunRuleResult.id).filter(RunRuleResult.run_id == run_id)
+    if filters.rule_id is not None:
+        rule_results = rule_results.filter(RunRuleResult.rule_id == filters.rule_id)
+    rule_result_ids = [row.id for row in rule_results]
+    if not rule_result_ids:
+        return DecisionTracePage(items=[])
+
+    # Resolving rule results first keeps the trace query on the
+    # (rule_result_id, status, id) index instead of joining per row.
+    query = db.query(DecisionTrace).filter(DecisionTrace.rule_result_id.in_(rule_result_ids))
+    if filters.status is not None:
+        query = query.filter(DecisionTrace.status == filters.status)
+    if filters.after is not None:
+        query = query.filter(DecisionTrace.id > filters.after)
+    elif filters.page > 1:
+        query = query.offset((filters.page - 1) * filters.size)
+    traces = query.order_by(DecisionTrace.id).limit(filters.size + 1).all()
+    items = [DecisionTraceRow.from_orm(trace) for trace in traces[: filters.size]]
+    next_after = items[-1].id if len(traces) > filters.size else None
+    return DecisionTracePage(items=items, next_after=next_after)
 
 
 @router.post("/{run_id}/export")
@@ -69,14 +153,42 @@ def export_run(run_id: int, payload: RunExportRequest, db: Session = Depends(get
     run = db.query(Run).filter(Run.id == run_id).first()
     if not run:
         raise HTTPException(status_code=404, detail="Run not found")
+    try:
+        RunExporter.validate_format(payload.format, payload.compress)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     settings = get_settings()
+    filename = RunExporter.filename(run_id, payload.format, payload.compress)
+
+    def exporter_for(session: Session) -> RunExporter:
+        return RunExporter(
+            session,
+            session.get(Run, run_id),
+            include_decisions=payload.include_decisions,
+            render_rationales=payload.render_rationales,
+            chunk_size=settings.export_chunk_size,
+        )
+
+    if payload.stream:
+
+        def stream() -> Iterator[bytes]:
+            from app.db import session as session_module
+
+            # The request session is closed before the body streams, so the
+            # body reads through a session of its own.
+            stream_db = session_module.SessionLocal()
+            try:
+                yield from exporter_for(stream_db).iter_bytes(payload.format, payload.compress)
+            finally:
+                stream_db.close()
+
+        return StreamingResponse(
+            stream(),
+            media_type=RunExporter.media_type(payload.format, payload.compress),
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+    exporter = exporter_for(db)
     export_dir = Path(settings.run_export_dir)
     export_dir.mkdir(parents=True, exist_ok=True)
-    data = RunSchema.from_orm(run).dict()
-    if payload.format == "json":
-        export_path = export_dir / f"run_{run_id}.json"
-        export_path.write_text(json.dumps(data, indent=2, default=str))
-    else:
-        export_path = export_dir / f"run_{run_id}.yaml"
-        export_path.write_text(yaml.safe_dump(data))
+    export_path = exporter.write(export_dir / filename, payload.format, payload.compress)
     return {"path": str(export_path)}
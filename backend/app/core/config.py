@@ -46,6 +46,18 @@ class Settings(BaseSettings):
     seed_dataset_path: str = Field(default="backend/data/datasets.json")
     run_export_dir: str = Field(default="backend/data/exports")
     seed_es_path: str = Field(default="backend/data/es_seed.json")
+    trace_batch_size: int = Field(default=1000, gt=0)
+    evaluation_workers: int = Field(default=1, ge=1)
+    run_queue_workers: int = Field(default=2, ge=1)
+    export_chunk_size: int = Field(default=1000, gt=0)
+    rulepack_import_workers: int = Field(default=1, ge=1)
+    rulepack_cache_size: int = Field(default=32, ge=0)
+    elasticsearch_connections_per_node: int = Field(default=10, ge=1)
+    elasticsearch_request_timeout: float = Field(default=30.0, gt=0)
+    elasticsearch_max_retries: int = Field(default=3, ge=0)
+    elasticsearch_retry_on_timeout: bool = True
+    seed_bulk_chunk_size: int = Field(default=1000, gt=0)
+    seed_bulk_concurrency: int = Field(default=1, ge=1)
 
     _backend_dir: Path = PrivateAttr(default=Path(__file__).resolve().parents[2])
     _project_root: Path = PrivateAttr(default=Path(__file__).resolve().parents[3])
@@ -5,21 +5,27 @@ from typing import Optional
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 
 from app.api.v1.router import api_router
 from app.core.config import get_settings
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, cache_metrics, registry
+from app.db import session as session_module
 from app.db.base import Base
-from app.db.session import SessionLocal, engine
 from app.models.dataset import Dataset
+from app.services.es_clients import close_es_clients, get_es_client
+from app.services.rulepack_cache import get_rulepack_cache
 from app.services.rulepack_service import load_rulepack_from_excel
+from app.services.run_queue import fail_orphaned_runs, shutdown_run_queue
+from app.services.startup import get_startup_state
+from app.utils.field_paths import compile_field_path, compile_projection
 from app.utils.seeder import seed_elasticsearch
 
 logger = logging.getLogger(__name__)
 
 
 settings = get_settings()
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(title=settings.app_name)
 
@@ -31,18 +37,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(api_router, prefix="/api")
 
 
+def _cache_stats():
+    rulepacks = get_rulepack_cache().stats()
+    stats = {"rulepack": {"hits": rulepacks["hits"], "misses": rulepacks["misses"], "size": rulepacks["size"]}}
+    for name, cached in (("field_path", compile_field_path), ("projection", compile_projection)):
+        info = cached.cache_info()
+        stats[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+    return cache_metrics(stats)
+
+
+registry.register_collector(_cache_stats)
+
+
 @app.on_event("startup")
 async def startup_event():
-    await seed_data()
+    # Routes need the schema, which is quick to create; seeding can take a while,
+    # so it runs in the background and gates readiness instead of startup.
+    Base.metadata.create_all(bind=session_module.engine)
+    _fail_orphaned_runs()
+    get_startup_state().run_in_background(_seed)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    shutdown_run_queue()
+    close_es_clients()
+
+
+def _fail_orphaned_runs() -> None:
+    # Queued and active runs only live in the memory of the process that
+    # started them, so any left over from a previous process will never finish.
+    db = session_module.SessionLocal()
+    try:
+        count = fail_orphaned_runs(db)
+    finally:
+        db.close()
+    if count:
+        logger.warning("Marked %d runs interrupted by a restart as failed", count)
 
 
 async def seed_data(db: Optional[Session] = None):
+    try:
+        _seed(db)
+    except Exception as exc:
+        logger.exception("Failed to seed data: %s", exc)
+
+
+def _seed(db: Optional[Session] = None) -> None:
     created_session = False
     if db is None:
-        db = SessionLocal()
+        db = session_module.SessionLocal()
         created_session = True
     try:
         if settings.seed_excel_path:
@@ -64,12 +113,12 @@ async def seed_data(db: Optional[Session] = None):
         if settings.seed_es_path:
             es_seed_path = settings.resolve_path(settings.seed_es_path)
             if es_seed_path.exists():
-                from elasticsearch import Elasticsearch
-
-                es = Elasticsearch(settings.elasticsearch_hosts)
-                seed_elasticsearch(es, es_seed_path)
-    except Exception as exc:
-        logger.exception("Failed to seed data: %s", exc)
+                seed_elasticsearch(
+                    get_es_client(settings.elasticsearch_hosts),
+                    es_seed_path,
+                    chunk_size=settings.seed_bulk_chunk_size,
+                    concurrency=settings.seed_bulk_concurrency,
+                )
     finally:
         if created_session and db:
             db.close()
@@ -78,3 +127,8 @@ async def seed_data(db: Optional[Session] = None):
 @app.get("/")
 def root():
     return {"message": "RuleTrail API"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(registry.render(), media_type=CONTENT_TYPE)
@@ -14,4 +14,6 @@ class Dataset(Base):
     host = Column(String, nullable=False)
     index_name = Column(String, nullable=False)
     query = Column(JSON, default=dict)
+    page_size = Column(Integer, default=1000, nullable=False)
+    change_field = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, JSON, String, Text
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
+from app.utils.rationale import render_rationale
+
+RUN_QUEUED = "queued"
+RUN_RUNNING = "running"
+RUN_COMPLETED = "completed"
+RUN_FAILED = "failed"
 
 
 class Run(Base):
@@ -17,6 +23,12 @@ class Run(Base):
     dataset_id = Column(Integer, ForeignKey("datasets.id"), nullable=False)
     dataset_snapshot = Column(JSON, nullable=False)
     status_counts = Column(JSON, default=dict)
+    state = Column(String, nullable=False, default=RUN_QUEUED, index=True)
+    progress = Column(JSON, default=dict)
+    error = Column(Text)
+    baseline_run_id = Column(Integer, ForeignKey("runs.id"))
+    watermark = Column(JSON)
+    timing = Column(JSON)
     started_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     completed_at = Column(DateTime)
 
@@ -35,11 +47,19 @@ class RunRuleResult(Base):
     summary = Column(JSON, default=dict)
 
     run = relationship("Run", back_populates="rule_results")
-    decisions = relationship("DecisionTrace", back_populates="rule_result", cascade="all, delete-orphan")
+    rule = relationship("Rule")
+    decisions = relationship(
+        "DecisionTrace", back_populates="rule_result", cascade="all, delete-orphan", order_by="DecisionTrace.id"
+    )
 
 
 class DecisionTrace(Base):
     __tablename__ = "decision_traces"
+    __table_args__ = (
+        # Keyset pagination of a rule's decisions, with and without a status filter.
+        Index("ix_decision_traces_rule_result_status_id", "rule_result_id", "status", "id"),
+        Index("ix_decision_traces_rule_result_id_id", "rule_result_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     rule_result_id = Column(Integer, ForeignKey("run_rule_results.id", ondelete="CASCADE"), nullable=False)
@@ -47,7 +67,20 @@ class DecisionTrace(Base):
     status = Column(String, nullable=False)
     inputs = Column(JSON, default=dict)
     clauses = Column(JSON, default=list)
-    rationale = Column(Text)
     extras = Column(JSON, default=dict)
 
     rule_result = relationship("RunRuleResult", back_populates="decisions")
+
+    @property
+    def rationale(self) -> str:
+        """Rendered on read from the stored clause results and inputs."""
+
+        clauses = self.clauses or []
+        rule_logic_business = None
+        if not clauses:
+            rule = self.rule_result.rule
+            # The rule may have been deleted after the run.
+            rule_logic_business = (
+                rule.rule_logic_business if rule is not None else f"Rule {self.rule_result.rule_id} (deleted)"
+            )
+        return render_rationale(self.status, clauses, self.inputs or {}, rule_logic_business)
@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ConditionClause(BaseModel):
@@ -89,6 +89,8 @@ class DatasetBase(BaseModel):
     host: str
     index_name: str
     query: Dict[str, Any] = {}
+    page_size: int = Field(1000, gt=0)
+    change_field: Optional[str] = None
 
 
 class DatasetCreate(DatasetBase):
@@ -114,10 +116,29 @@ class RunBase(BaseModel):
     rulepack_checksum: str
     dataset_snapshot: Dict[str, Any]
     status_counts: Dict[str, int] = {}
+    state: str
+    progress: Dict[str, Any] = {}
+    error: Optional[str] = None
+    baseline_run_id: Optional[int] = None
+    watermark: Optional[Dict[str, Any]] = None
+    timing: Optional[Dict[str, Any]] = None
     started_at: datetime
     completed_at: Optional[datetime] = None
 
 
+class RunStatus(BaseModel):
+    id: int
+    state: str
+    status_counts: Dict[str, int] = {}
+    progress: Dict[str, Any] = {}
+    error: Optional[str] = None
+    started_at: datetime
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
+
+
 class DecisionTraceSchema(BaseModel):
     id: int
     record_id: str
@@ -130,17 +151,29 @@ class DecisionTraceSchema(BaseModel):
         orm_mode = True
 
 
-class RunRuleResultSchema(BaseModel):
+class DecisionTraceRow(DecisionTraceSchema):
+    rule_result_id: int
+
+
+class DecisionTracePage(BaseModel):
+    items: List[DecisionTraceRow]
+    next_after: Optional[int] = None
+
+
+class RunRuleResultSummary(BaseModel):
     id: int
     rule_id: int
     status: str
     summary: Dict[str, Any]
-    decisions: List[DecisionTraceSchema]
 
     class Config:
         orm_mode = True
 
 
+class RunRuleResultSchema(RunRuleResultSummary):
+    decisions: List[DecisionTraceSchema]
+
+
 class Run(RunBase):
     id: int
     rule_results: List[RunRuleResultSchema] = []
@@ -149,9 +182,20 @@ class Run(RunBase):
         orm_mode = True
 
 
+class RunDetail(RunBase):
+    """Run metadata with per-rule status and counts; decisions are paged separately."""
+
+    id: int
+    rule_results: List[RunRuleResultSummary] = []
+
+    class Config:
+        orm_mode = True
+
+
 class RunSummary(BaseModel):
     id: int
     domain: str
+    state: str
     status_counts: Dict[str, int]
     started_at: datetime
     completed_at: Optional[datetime]
@@ -13,18 +13,34 @@ class StartRunRequest(BaseModel):
         "warn": "WARN",
         "na": "N/A",
     }
+    engine: str = "row"
+    mode: str = "full"
+    trace_retention: str = "all"
+    trace_sample_size: int = 100
+    baseline_run_id: Optional[int] = None
+    profile: bool = False
 
 
 class RunResultFilter(BaseModel):
+    """Decision filters; ``after`` is the last trace id of the previous page (keyset pagination).
+
+    ``page`` is only used when no ``after`` cursor is given and falls back to an
+    offset scan, so clients should follow ``next_after`` instead.
+    """
+
     rule_id: Optional[int] = None
     status: Optional[str] = None
+    after: Optional[int] = None
     page: int = 1
     size: int = 50
 
 
 class RunExportRequest(BaseModel):
     include_decisions: bool = True
+    render_rationales: bool = True
     format: str = "json"
+    compress: bool = False
+    stream: bool = False
 
 
 class RunDecisionResponse(BaseModel):
@@ -6,19 +6,26 @@ import argparse
 from pathlib import Path
 
 from app.core.config import get_settings
-from app.utils.seeder import seed_elasticsearch
-
-try:  # pragma: no cover - optional import guard mirrors runtime behaviour
-    from elasticsearch import Elasticsearch
-except ImportError as exc:  # pragma: no cover
-    raise SystemExit("Elasticsearch client is required. Install `elasticsearch` package.") from exc
+from app.services.es_clients import ElasticsearchUnavailable, close_es_clients, get_es_client
+from app.utils.seeder import bulk_seed
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Populate Elasticsearch with RuleTrail demo data")
     parser.add_argument(
-        "--seed", dest="seed_path", type=Path, default=None, help="Path to JSON file containing documents"
+        "--seed",
+        dest="seed_path",
+        type=Path,
+        default=None,
+        help="Path to a JSON or NDJSON file (optionally .gz) containing documents",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=None, help="Documents per bulk request (default: SEED_BULK_CHUNK_SIZE)"
     )
+    parser.add_argument(
+        "--concurrency", type=int, default=None, help="Parallel bulk requests (default: SEED_BULK_CONCURRENCY)"
+    )
+    parser.add_argument("--index", default=None, help="Index for NDJSON documents without an '_index' field")
     return parser.parse_args()
 
 
@@ -29,10 +36,27 @@ def main() -> int:
     if not seed_path.exists():
         raise SystemExit(f"Seed file not found at {seed_path}")
 
-    es = Elasticsearch(settings.elasticsearch_hosts)
-    indexed = seed_elasticsearch(es, seed_path)
-    print(f"Indexed {indexed} documents into Elasticsearch from {seed_path}")
-    return indexed
+    chunk_size = args.chunk_size if args.chunk_size is not None else settings.seed_bulk_chunk_size
+    concurrency = args.concurrency if args.concurrency is not None else settings.seed_bulk_concurrency
+    if chunk_size <= 0 or concurrency <= 0:
+        raise SystemExit("--chunk-size and --concurrency must be positive")
+    try:
+        stats = bulk_seed(
+            get_es_client(settings.elasticsearch_hosts),
+            seed_path,
+            chunk_size=chunk_size,
+            concurrency=concurrency,
+            default_index=args.index,
+        )
+    except ElasticsearchUnavailable as exc:
+        raise SystemExit("Elasticsearch client is required. Install `elasticsearch` package.") from exc
+    finally:
+        close_es_clients()
+    print(
+        f"Indexed {stats.indexed} documents into Elasticsearch from {seed_path} "
+        f"in {stats.seconds:.2f}s ({stats.docs_per_second:.0f} docs/sec)"
+    )
+    return stats.indexed
 
 
 if __name__ == "__main__":  # pragma: no cover - exercised via integration test instead
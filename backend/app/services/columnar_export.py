@@ -0,0 +1,249 @@
+"""Parquet and Arrow IPC export of run decisions.
+
+Each decision becomes one row with ``record_id``, ``rule_id``, ``rule_no``,
+``status``, one boolean ``clause_<n>`` column per clause position and one
+``input.<field>`` column per input field referenced by the run's rules.
+Decisions of rules deleted after the run are kept, with the rule number
+recorded in the run's summary and columns for the inputs and clauses their
+traces hold.
+Rows are written one row group (or record batch) per ``chunk_size``
+decisions, so memory stays bounded. Arrow IPC files can be memory-mapped and
+read back zero-copy.
+
+Input column types are inferred from every decision's inputs in a pass
+before the first row group is written, since the schema cannot change
+afterwards: a column is boolean, int64 or float64 when all its values fit
+(ints mixed with floats widen to float64) and string otherwise, so no value
+is ever dropped. All-null columns are strings and nested inputs are stored
+as JSON strings. ``pyarrow`` is an optional dependency and
+is only imported when a columnar format is requested.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+
+from app.models.rulepack import Rule
+from app.models.run import DecisionTrace, RunRuleResult
+from app.services.evaluation_service import RuleSpec
+
+if TYPE_CHECKING:  # pragma: no cover
+    from app.services.run_export import RunExporter
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as exc:
+        raise ValueError("Columnar exports require the 'pyarrow' package") from exc
+    return pyarrow
+
+
+class _CountingSink(io.RawIOBase):
+    """Write-only sink that hands written bytes back to a generator while keeping a running offset."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ColumnarExporter:
+    def __init__(self, exporter: "RunExporter"):
+        self.exporter = exporter
+        self.pa = require_pyarrow()
+        rules = (
+            exporter.db.query(RunRuleResult.id, RunRuleResult.rule_id, RunRuleResult.summary, Rule)
+            .outerjoin(Rule, Rule.id == RunRuleResult.rule_id)
+            .filter(RunRuleResult.run_id == exporter.run.id)
+            .all()
+        )
+        self.rule_ids: Dict[int, int] = {result_id: rule_id for result_id, rule_id, _, _ in rules}
+        self.rule_nos: Dict[int, Optional[str]] = {
+            result_id: rule.rule_no if rule is not None else (summary or {}).get("rule_no")
+            for result_id, _, summary, rule in rules
+        }
+        self.deleted_results = [result_id for result_id, _, _, rule in rules if rule is None]
+        specs = [RuleSpec.from_rule(rule) for _, _, _, rule in rules if rule is not None]
+        self.clause_count = max((len(spec.conditions) for spec in specs), default=0)
+        self.input_fields = list(dict.fromkeys(field for spec in specs for field in spec.input_fields))
+        self._schema = None
+        self._input_kinds: Optional[Dict[str, Optional[str]]] = None
+
+    def iter_bytes(self, fmt: str) -> Iterator[bytes]:
+        self._input_kinds = self._infer_input_kinds()
+        sink = _CountingSink()
+        writer = None
+        for columns in self._iter_column_chunks():
+            table = self._table(columns)
+            if writer is None:
+                writer = self._open_writer(sink, fmt, table.schema)
+            if fmt == "parquet":
+                writer.write_table(table)
+            else:
+                writer.write_table(table, max_chunksize=self.exporter.chunk_size)
+            data = sink.drain()
+            if data:
+                yield data
+        if writer is None:
+            writer = self._open_writer(sink, fmt, self._table(self._empty_columns()).schema)
+        writer.close()
+        data = sink.drain()
+        if data:
+            yield data
+
+    def write(self, path: Path, fmt: str) -> Path:
+        with Path(path).open("wb") as handle:
+            for chunk in self.iter_bytes(fmt):
+                handle.write(chunk)
+        return Path(path)
+
+    def _open_writer(self, sink: _CountingSink, fmt: str, schema):
+        output = self.pa.PythonFile(sink, mode="w")
+        if fmt == "parquet":
+            return self.pa.parquet.ParquetWriter(output, schema)
+        return self.pa.ipc.new_file(output, schema)
+
+    def _empty_columns(self) -> Dict[str, List[Any]]:
+        names = ["trace_id", "record_id", "rule_id", "rule_no", "status"]
+        names += [f"clause_{index}" for index in range(self.clause_count)]
+        if self.exporter.render_rationales:
+            names.append("rationale")
+        names += [f"input.{field}" for field in self.input_fields]
+        return {name: [] for name in names}
+
+    def _iter_column_chunks(self) -> Iterator[Dict[str, List[Any]]]:
+        decisions = self.exporter.iter_decisions()
+        while True:
+            chunk = list(islice(decisions, self.exporter.chunk_size))
+            if not chunk:
+                return
+            columns = self._empty_columns()
+            for decision in chunk:
+                result_id = decision["rule_result_id"]
+                columns["trace_id"].append(decision["id"])
+                columns["record_id"].append(decision["record_id"])
+                columns["rule_id"].append(self.rule_ids[result_id])
+                columns["rule_no"].append(self.rule_nos[result_id])
+                columns["status"].append(decision["status"])
+                clauses = decision["clauses"]
+                for index in range(self.clause_count):
+                    result = clauses[index].get("result") if index < len(clauses) else None
+                    columns[f"clause_{index}"].append(None if result is None else bool(result))
+                if self.exporter.render_rationales:
+                    columns["rationale"].append(decision["rationale"])
+                inputs = decision["inputs"]
+                for field in self.input_fields:
+                    columns[f"input.{field}"].append(inputs.get(field))
+            yield columns
+
+    def _infer_input_kinds(self) -> Dict[str, Optional[str]]:
+        """Scan every decision's inputs, in chunks, for the narrowest kind holding all values of each field.
+
+        Decisions of deleted rules also add their input fields and clause
+        positions, which are otherwise taken from the rules.
+        """
+
+        kinds: Dict[str, Optional[str]] = {field: None for field in self.input_fields}
+        deleted = set(self.deleted_results)
+        table = DecisionTrace.__table__
+        columns = [table.c.rule_result_id, table.c.inputs] + ([table.c.clauses] if deleted else [])
+        statement = (
+            select(*columns)
+            .where(table.c.rule_result_id.in_(list(self.rule_ids)))
+            .execution_options(yield_per=self.exporter.chunk_size)
+        )
+        for partition in self.exporter.db.execute(statement).partitions():
+            for row in partition:
+                orphaned = row[0] in deleted
+                if orphaned:
+                    self.clause_count = max(self.clause_count, len(row[2] or []))
+                for field, value in (row[1] or {}).items():
+                    if field not in kinds and orphaned:
+                        kinds[field] = None
+                        self.input_fields.append(field)
+                    if field in kinds:
+                        kinds[field] = _merge_kinds(kinds[field], _value_kind(value))
+        return kinds
+
+    def _kind(self, name: str) -> Optional[str]:
+        if name in ("trace_id", "rule_id"):
+            return "int"
+        if name.startswith("clause_"):
+            return "bool"
+        if name.startswith("input.") and self._input_kinds is not None:
+            return self._input_kinds.get(name[len("input.") :])
+        return "string"
+
+    def _table(self, columns: Dict[str, List[Any]]):
+        pa = self.pa
+        arrow_types = {"bool": pa.bool_(), "int": pa.int64(), "float": pa.float64()}
+        if self._schema is None:
+            self._schema = pa.schema(
+                [pa.field(name, arrow_types.get(self._kind(name), pa.string())) for name in columns]
+            )
+        arrays = [
+            pa.array([_coerce(value, self._kind(field.name)) for value in columns[field.name]], type=field.type)
+            for field in self._schema
+        ]
+        return pa.Table.from_arrays(arrays, schema=self._schema)
+
+
+def _value_kind(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int" if -(2**63) <= value < 2**63 else "string"
+    if isinstance(value, float):
+        return "float"
+    return "string"
+
+
+def _merge_kinds(current: Optional[str], kind: Optional[str]) -> Optional[str]:
+    if kind is None or kind == current:
+        return current
+    if current is None:
+        return kind
+    if {current, kind} == {"int", "float"}:
+        return "float"
+    return "string"
+
+
+def _coerce(value: Any, kind: Optional[str]) -> Any:
+    """Convert ``value`` for a column of ``kind``; kinds are inferred from all values, so every value fits."""
+
+    if value is None or kind in ("bool", "int"):
+        return value
+    if kind == "float":
+        return float(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(value)
@@ -0,0 +1,84 @@
+"""Process-wide registry of pooled Elasticsearch clients.
+
+One client is created per distinct host list and shared by every request,
+background run and seeding job, so keep-alive connections (and TLS sessions)
+are reused instead of being re-established per run. Connection pool size,
+request timeout and retry behaviour come from ``Settings``. Clients are
+thread-safe; ``close_es_clients`` is called when the application stops.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from app.core.config import get_settings
+
+# The client class is imported on first use so importing the application does not load it.
+Elasticsearch: Any = None
+
+
+class ElasticsearchUnavailable(RuntimeError):
+    """Raised when the ``elasticsearch`` package is not installed."""
+
+
+class ElasticsearchClients:
+    def __init__(self) -> None:
+        self._clients: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, hosts: Sequence[str]) -> Any:
+        key = tuple(hosts)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = self._create(list(key))
+            return client
+
+    def close(self) -> None:
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                client.close()
+            except Exception:  # pragma: no cover - closing is best effort during shutdown
+                pass
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    @staticmethod
+    def _create(hosts: Sequence[str]) -> Any:
+        settings = get_settings()
+        return _client_class()(
+            hosts,
+            connections_per_node=settings.elasticsearch_connections_per_node,
+            request_timeout=settings.elasticsearch_request_timeout,
+            max_retries=settings.elasticsearch_max_retries,
+            retry_on_timeout=settings.elasticsearch_retry_on_timeout,
+        )
+
+
+def _client_class() -> Any:
+    global Elasticsearch
+    if Elasticsearch is None:
+        try:
+            from elasticsearch import Elasticsearch as client_class
+        except ImportError as exc:  # pragma: no cover - fallback for environments without ES client
+            raise ElasticsearchUnavailable("Elasticsearch client is not installed") from exc
+        Elasticsearch = client_class
+    return Elasticsearch
+
+
+_registry = ElasticsearchClients()
+
+
+def get_es_client(hosts: Optional[Sequence[str]] = None) -> Any:
+    """Return the shared client for ``hosts`` (the configured hosts by default)."""
+
+    return _registry.get(hosts or get_settings().elasticsearch_hosts)
+
+
+def close_es_clients() -> None:
+    _registry.close()
@@ -1,17 +1,55 @@
 from __future__ import annotations
 
+import cProfile
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
 from collections import Counter
+from contextlib import ExitStack
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, List, Tuple
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from elasticsearch import Elasticsearch
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
+from app.core.metrics import DOCUMENTS_EVALUATED, RUN_DOCUMENTS_PER_SECOND, RUN_SECONDS, RUNS
 from app.models.dataset import Dataset
-from app.models.rulepack import Rule
-from app.models.run import DecisionTrace, Run, RunRuleResult
+from app.models.rulepack import Rule, RulePack
+from app.models.run import RUN_COMPLETED, RUN_FAILED, RUN_QUEUED, RUN_RUNNING, Run, RunRuleResult
 from app.schemas.common import ConditionClause
-from app.utils.conditions import evaluate_boolean_chain, evaluate_conditions
+from app.services.incremental import SEQ_NO_FIELD, Watermark, baseline_statuses, carry_over_traces, delta_query
+from app.services.run_queue import RunProgress
+from app.services.run_timing import RunTiming
+from app.services.trace_retention import (
+    RETAIN_ALL,
+    RETAIN_FAILURES,
+    RETAIN_NONE,
+    RETAIN_SAMPLE,
+    RETENTION_POLICIES,
+    PageSampler,
+    SampleAccumulator,
+    page_selector,
+)
+from app.services.trace_writer import DecisionTraceWriter
+from app.utils.conditions import ClausePool, CompiledRule, EvaluatedClause, compile_clauses
+from app.utils.es_query import array_probes, flatten_mapping, translate_clauses
+from app.utils.field_paths import compile_projection, source_path
+from app.utils.streaming import DEFAULT_PAGE_SIZE, iter_search_pages, prefetch
+
+if TYPE_CHECKING:  # pragma: no cover
+    from elasticsearch import Elasticsearch
+
+    from app.services.rulepack_cache import CompiledRulepack
+
+logger = logging.getLogger(__name__)
+
+# cProfile allows one active profiler per process (Python 3.12+), so profiled runs take turns.
+_profile_lock = threading.Lock()
 
 DEFAULT_LABELS = {
     "pass": "PASS",
@@ -20,15 +58,148 @@ DEFAULT_LABELS = {
     "na": "N/A",
 }
 
+ENGINES = ("row", "vectorized")
+MODE_FULL = "full"
+MODE_SUMMARY = "summary"
+MODES = (MODE_FULL, MODE_SUMMARY)
+DEFAULT_SAMPLE_SIZE = 100
+
+# Per-rule output of evaluating one page of documents: decisions and status counts.
+PageResult = List[Tuple[List[Dict[str, Any]], Counter]]
+
+
+@dataclass(frozen=True)
+class RunOptions:
+    """How a run is evaluated.
+
+    ``engine`` picks row-by-row or vectorized clause evaluation. ``mode`` is
+    ``full`` to persist per-record decision traces, or ``summary`` to only
+    compute counts, pushing translatable rules down to Elasticsearch.
+    ``retention`` selects which traces a full run keeps (see
+    ``app.services.trace_retention``); counts are always exact.
+    ``baseline_run_id`` makes the run incremental (see
+    ``app.services.incremental``). ``profile`` captures a cProfile dump of
+    the run into the export directory.
+    """
+
+    engine: str = "row"
+    mode: str = MODE_FULL
+    retention: str = RETAIN_ALL
+    sample_size: int = DEFAULT_SAMPLE_SIZE
+    baseline_run_id: Optional[int] = None
+    profile: bool = False
+
+    def validate(self) -> None:
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unknown evaluation engine: {self.engine}")
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown run mode: {self.mode}")
+        if self.retention not in RETENTION_POLICIES:
+            raise ValueError(f"Unknown trace retention policy: {self.retention}")
+        if self.sample_size <= 0:
+            raise ValueError("Trace sample size must be positive")
+        if self.baseline_run_id is not None:
+            if self.mode != MODE_FULL:
+                raise ValueError("Incremental runs require the full run mode")
+            if self.retention == RETAIN_SAMPLE:
+                raise ValueError("Incremental runs cannot carry over sampled traces")
+
+    @property
+    def effective_retention(self) -> str:
+        return RETAIN_NONE if self.mode == MODE_SUMMARY else self.retention
+
+
+@dataclass(frozen=True)
+class RuleSpec:
+    """ORM-detached, picklable view of the rule attributes evaluation needs."""
+
+    id: int
+    rule_no: str
+    new_rule_name: str
+    domain: Optional[str]
+    rule_logic_business: Optional[str]
+    conditions: List[Dict[str, Any]]
+    input_fields: Tuple[str, ...]
+
+    @property
+    def condition_hash(self) -> str:
+        """Digest of everything that determines a rule's decisions, used to detect edited rules."""
+
+        payload = json.dumps([self.conditions, list(self.input_fields)], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @classmethod
+    def from_rule(cls, rule: Rule) -> "RuleSpec":
+        return cls(
+            id=rule.id,
+            rule_no=rule.rule_no,
+            new_rule_name=rule.new_rule_name,
+            domain=rule.rulepack.domain if rule.rulepack else None,
+            rule_logic_business=rule.rule_logic_business,
+            conditions=list(rule.conditions or []),
+            # Condition fields are recorded too so rationales can be rendered on read.
+            input_fields=tuple(
+                dict.fromkeys(
+                    [
+                        *(rule.original_fields or []),
+                        *(rule.aggregated_fields or []),
+                        *(clause["field"] for clause in rule.conditions or []),
+                    ]
+                )
+            ),
+        )
+
+
+@dataclass
+class RuleOutcomes:
+    """One rule's outcome for each document of a page.
+
+    ``matched[i]`` says whether document ``i`` matched the rule (a failure);
+    ``clauses(i)`` builds its evaluated clauses, which is only done for
+    records whose decision is kept.
+    """
+
+    matched: List[bool]
+    matched_count: int
+    clauses: Callable[[int], List[EvaluatedClause]]
+
 
 class EvaluationService:
-    def __init__(self, db: Session, es_client: Elasticsearch):
+    def __init__(
+        self,
+        db: Session,
+        es_client: Elasticsearch,
+        *,
+        trace_batch_size: int | None = None,
+        workers: int | None = None,
+    ):
+        settings = get_settings()
         self.db = db
         self.es = es_client
+        self.trace_batch_size = trace_batch_size or settings.trace_batch_size
+        self.workers = workers or settings.evaluation_workers
+
+    def run(
+        self,
+        domain: str,
+        rulepack_id: int,
+        dataset_id: int,
+        status_labels: Dict[str, str] | None = None,
+        *,
+        options: RunOptions | None = None,
+        progress: RunProgress | None = None,
+    ) -> Run:
+        """Create and evaluate a run synchronously."""
 
-    def run(self, domain: str, rulepack_id: int, dataset_id: int, status_labels: Dict[str, str] | None = None) -> Run:
-        status_labels = status_labels or DEFAULT_LABELS
-        rulepack = self._get_rulepack(rulepack_id)
+        options = options or RunOptions()
+        options.validate()
+        run = self.create_run(domain, rulepack_id, dataset_id)
+        return self.execute(run, status_labels, options=options, progress=progress)
+
+    def create_run(self, domain: str, rulepack_id: int, dataset_id: int) -> Run:
+        """Add a ``queued`` run for the rulepack and dataset and flush it to obtain an id."""
+
+        rulepack = self.db.query(RulePack).filter(RulePack.id == rulepack_id).one()
         dataset = self.db.query(Dataset).filter(Dataset.id == dataset_id).one()
         snapshot = {
             "host": dataset.host,
@@ -41,80 +212,436 @@ class EvaluationService:
             rulepack_checksum=rulepack.checksum,
             dataset_id=dataset.id,
             dataset_snapshot=snapshot,
+            state=RUN_QUEUED,
             started_at=datetime.now(timezone.utc),
         )
         self.db.add(run)
         self.db.flush()
+        return run
+
+    def execute(
+        self,
+        run: Run,
+        status_labels: Dict[str, str] | None = None,
+        *,
+        options: RunOptions | None = None,
+        progress: RunProgress | None = None,
+    ) -> Run:
+        """Evaluate a queued run, committing its results.
+
+        On failure the transaction is rolled back and, if the run row was
+        already committed, it is marked ``failed`` with the error message.
+        Either way the run's timing breakdown is stored on ``Run.timing``.
+        """
+
+        options = options or RunOptions()
+        options.validate()
+        run_id = run.id
+        timing = RunTiming()
+        profiler = None
+        try:
+            if options.profile:
+                profiler = _start_profiler(run_id, timing)
+            run = self._execute(run, status_labels or DEFAULT_LABELS, options, progress or RunProgress(), timing)
+        except Exception as exc:
+            RUNS.inc(state=RUN_FAILED)
+            self.db.rollback()
+            failed = self.db.get(Run, run_id)
+            if failed is not None:
+                failed.state = RUN_FAILED
+                failed.error = str(exc)
+                failed.completed_at = datetime.now(timezone.utc)
+                failed.timing = timing.as_dict()
+                self.db.commit()
+            raise
+        finally:
+            if profiler is not None:
+                try:
+                    profiler.disable()
+                    profiler.dump_stats(timing.profile_path)
+                finally:
+                    _profile_lock.release()
+        RUNS.inc(state=RUN_COMPLETED)
+        RUN_SECONDS.observe(run.timing["wall_seconds"])
+        DOCUMENTS_EVALUATED.inc(run.timing["documents"])
+        RUN_DOCUMENTS_PER_SECOND.set(run.timing["documents_per_second"])
+        return run
+
+    def resolve_baseline(self, baseline_run_id: int, rulepack_id: int, dataset_id: int) -> Run:
+        """Return the baseline for an incremental run, raising ``ValueError`` if it cannot serve as one."""
+
+        baseline = self.db.get(Run, baseline_run_id)
+        if baseline is None:
+            raise ValueError(f"Baseline run {baseline_run_id} not found")
+        if baseline.state != RUN_COMPLETED:
+            raise ValueError(f"Baseline run {baseline_run_id} has not completed")
+        if baseline.rulepack_id != rulepack_id or baseline.dataset_id != dataset_id:
+            raise ValueError("Baseline run must use the same rulepack and dataset")
+        dataset = self.db.get(Dataset, dataset_id)
+        watermark = baseline.watermark or {}
+        if not dataset.change_field or watermark.get("field") != dataset.change_field or watermark.get("value") is None:
+            raise ValueError(f"Baseline run {baseline_run_id} has no watermark for the dataset's change field")
+        return baseline
+
+    def _execute(
+        self, run: Run, status_labels: Dict[str, str], options: RunOptions, progress: RunProgress, timing: RunTiming
+    ) -> Run:
+        run.state = RUN_RUNNING
+        self.db.commit()
+        with timing.phase("rulepack"):
+            rulepack = self._get_rulepack(run.rulepack_id)
+        dataset = self.db.query(Dataset).filter(Dataset.id == run.dataset_id).one()
+        baseline = None
+        if options.baseline_run_id is not None:
+            baseline = self.resolve_baseline(options.baseline_run_id, run.rulepack_id, run.dataset_id)
+            run.baseline_run_id = baseline.id
+        watermark = self._watermark(dataset, baseline)
 
-        documents = self._fetch_documents(dataset)
         status_counter: Counter[str] = Counter()
-        for rule in rulepack.rules:
-            result, counter_update = self._evaluate_rule(rule, documents, status_labels)
-            status_counter.update(counter_update)
-            run_rule = RunRuleResult(
-                run_id=run.id,
-                rule_id=rule.id,
-                status=result["status"],
-                summary=result,
+        specs = list(rulepack.specs)
+        progress.rules_total = len(specs)
+        states: List[Tuple[RuleSpec, RunRuleResult, Counter[str]]] = []
+        with timing.phase("prepare", len(specs)):
+            for spec in specs:
+                run_rule = RunRuleResult(run_id=run.id, rule_id=spec.id, status=status_labels["pass"], summary={})
+                self.db.add(run_rule)
+                states.append((spec, run_rule, Counter()))
+            self.db.flush()
+
+        pushed_down: Dict[int, Counter[str]] = {}
+        total_records = 0
+        if options.mode == MODE_SUMMARY:
+            with timing.phase("pushdown"):
+                pushed_down, total_records = self._count_in_elasticsearch(dataset, specs, status_labels)
+            for spec, _, rule_counter in states:
+                rule_counter.update(pushed_down.get(spec.id, Counter()))
+        carried = self._carried_rules(baseline, specs) if baseline is not None else {}
+        writer = DecisionTraceWriter(self.db, self.trace_batch_size) if options.mode == MODE_FULL else None
+        in_process = [state for state in states if state[0].id not in pushed_down and state[0].id not in carried]
+        if in_process:
+            specs_in_process = [spec for spec, _, _ in in_process]
+            pages = self._iter_document_pages(dataset, watermark=watermark, specs=specs_in_process, timing=timing)
+            total_records = self._evaluate_documents(
+                pages, in_process, options, status_labels, progress, writer, rulepack, timing
             )
-            self.db.add(run_rule)
-            for decision in result["decisions"]:
-                trace = DecisionTrace(
-                    rule_result=run_rule,
-                    record_id=decision["record_id"],
-                    status=decision["status"],
-                    inputs=decision["inputs"],
-                    clauses=decision["clauses"],
-                    rationale=decision["rationale"],
-                    extras=decision["extras"],
-                )
-                self.db.add(trace)
+        if carried:
+            incremental = [state for state in states if state[0].id in carried]
+            self._evaluate_changes(
+                dataset, baseline, incremental, carried, options, status_labels, progress, writer, watermark, timing
+            )
+
+        with timing.phase("summarize", len(states)):
+            for rule, run_rule, rule_counter in states:
+                rule_total = sum(rule_counter.values()) if rule.id in carried else total_records
+                summary = self._summarize_rule(rule, rule_counter, rule_total, status_labels)
+                if rule.id in pushed_down:
+                    summary["evaluated_by"] = "elasticsearch"
+                else:
+                    summary["evaluated_by"] = "incremental" if rule.id in carried else "engine"
+                summary["retention"] = options.effective_retention
+                summary["condition_hash"] = rule.condition_hash
+                run_rule.status = summary["status"]
+                run_rule.summary = summary
+                status_counter.update(rule_counter)
 
         run.status_counts = dict(status_counter)
+        run.watermark = watermark.as_dict() if watermark is not None else None
+        run.state = RUN_COMPLETED
+        run.progress = progress.as_dict()
         run.completed_at = datetime.now(timezone.utc)
+        run.timing = timing.as_dict()
+        with timing.phase("commit"):
+            self.db.commit()
+        # The commit's own cost is only known afterwards; storing it is a single-row update.
+        run.timing = timing.as_dict()
         self.db.commit()
+        logger.info(
+            "Run %s evaluated %s documents in %.3fs (%s)",
+            run.id,
+            timing.documents,
+            run.timing["wall_seconds"],
+            ", ".join(f"{name} {phase['wall_seconds']:.3f}s" for name, phase in run.timing["phases"].items()),
+        )
         self.db.refresh(run)
         return run
 
-    def _get_rulepack(self, rulepack_id: int):
-        from app.models.rulepack import RulePack
+    def _watermark(self, dataset: Dataset, baseline: Run | None) -> Watermark | None:
+        if not dataset.change_field:
+            return None
+        if dataset.change_field == SEQ_NO_FIELD:
+            # Sequence numbers are per shard, so one watermark only covers single-shard indices.
+            index_settings = self.es.indices.get_settings(index=dataset.index_name)
+            for name, entry in index_settings.items():
+                if int(entry["settings"]["index"]["number_of_shards"]) > 1:
+                    raise ValueError(f"Index {name} has several shards; _seq_no change tracking needs a single shard")
+        return Watermark(dataset.change_field, baseline.watermark["value"] if baseline is not None else None)
 
-        rulepack = self.db.query(RulePack).filter(RulePack.id == rulepack_id).one()
-        rulepack.rules  # ensure loaded
-        return rulepack
+    def _carried_rules(self, baseline: Run, specs: Sequence[RuleSpec]) -> Dict[int, RunRuleResult]:
+        """Baseline results of the rules that are unchanged and whose baseline kept every trace."""
+
+        previous = {
+            result.rule_id: result
+            for result in self.db.query(RunRuleResult).filter(RunRuleResult.run_id == baseline.id)
+        }
+        carried: Dict[int, RunRuleResult] = {}
+        for spec in specs:
+            result = previous.get(spec.id)
+            if result is None:
+                continue
+            summary = result.summary or {}
+            if summary.get("condition_hash") == spec.condition_hash and summary.get("retention", RETAIN_ALL) == RETAIN_ALL:
+                carried[spec.id] = result
+        return carried
+
+    def _evaluate_changes(
+        self,
+        dataset: Dataset,
+        baseline: Run,
+        states: List[Tuple[RuleSpec, RunRuleResult, Counter[str]]],
+        carried: Dict[int, RunRuleResult],
+        options: RunOptions,
+        status_labels: Dict[str, str],
+        progress: RunProgress,
+        writer: DecisionTraceWriter | None,
+        watermark: Watermark,
+        timing: RunTiming,
+    ) -> None:
+        """Evaluate documents changed since ``baseline`` and carry its other decisions and counts over."""
+
+        changed_ids: List[str] = []
+
+        def changed_pages() -> Iterator[List[Dict]]:
+            query_body = delta_query(self._query_body(dataset), baseline.watermark)
+            specs = [spec for spec, _, _ in states]
+            for documents in self._iter_document_pages(dataset, query_body, watermark, specs, timing):
+                changed_ids.extend(_record_id(doc) for doc in documents)
+                yield documents
+
+        self._evaluate_documents(changed_pages(), states, options, status_labels, progress, writer, timing=timing)
+        retention = options.effective_retention
+        with timing.phase("incremental", len(states)):
+            for spec, run_rule, rule_counter in states:
+                previous = carried[spec.id]
+                rule_counter.update((previous.summary or {}).get("counts", {}))
+                rule_counter.subtract(baseline_statuses(self.db, previous.id, changed_ids))
+                for status in [status for status, count in rule_counter.items() if count <= 0]:
+                    del rule_counter[status]
+                if writer is not None and retention != RETAIN_NONE:
+                    statuses = [status_labels["fail"]] if retention == RETAIN_FAILURES else None
+                    carry_over_traces(self.db, previous.id, run_rule.id, changed_ids, statuses)
+
+    def _evaluate_documents(
+        self,
+        pages: Iterator[List[Dict]],
+        states: List[Tuple[RuleSpec, RunRuleResult, Counter[str]]],
+        options: RunOptions,
+        status_labels: Dict[str, str],
+        progress: RunProgress,
+        writer: DecisionTraceWriter | None,
+        rulepack: "CompiledRulepack | None" = None,
+        timing: RunTiming | None = None,
+    ) -> int:
+        """Run the ``pages`` of documents through the rules in ``states``; returns the number of documents seen.
+
+        Decisions are only persisted when a ``writer`` is given. The compiled
+        clauses of ``rulepack`` are reused when ``states`` cover all its rules.
+        """
+        timing = timing or RunTiming()
+        specs = [spec for spec, _, _ in states]
+        precompiled = None
+        # ``states`` are drawn from the rulepack's specs in order, so equal length means all of them.
+        if rulepack is not None and len(specs) == len(rulepack.specs):
+            precompiled = (rulepack.pool, rulepack.compiled)
+        retention = options.effective_retention if writer is not None else RETAIN_NONE
+        # Samples are only final once every page has been seen, so they are
+        # accumulated per rule and written at the end of the run.
+        samples = (
+            [SampleAccumulator(options.sample_size, random.Random()) for _ in states]
+            if retention == RETAIN_SAMPLE
+            else None
+        )
+        total_records = 0
+        with ExitStack() as stack:
+            if self.workers > 1:
+                from app.services.parallel_evaluation import ParallelPageEvaluator
+
+                evaluate_page = stack.enter_context(
+                    ParallelPageEvaluator(
+                        specs, options.engine, status_labels, self.workers, retention, options.sample_size
+                    )
+                )
+            else:
+                evaluate_page = PageEvaluator(
+                    specs, options.engine, status_labels, retention, options.sample_size, precompiled, timing
+                )
+            for documents in timing.timed("fetch_wait", prefetch(pages)):
+                progress.raise_if_cancelled()
+                total_records += len(documents)
+                with timing.phase("evaluate", len(documents)):
+                    page_results = evaluate_page(documents)
+                for index, ((spec, run_rule, rule_counter), (decisions, counter_update)) in enumerate(
+                    zip(states, page_results)
+                ):
+                    rule_counter.update(counter_update)
+                    if samples is not None:
+                        samples[index].merge(decisions, counter_update)
+                if writer is not None and samples is None:
+                    with timing.phase("write_traces", sum(len(decisions) for decisions, _ in page_results)):
+                        for (_, run_rule, _), (decisions, _) in zip(states, page_results):
+                            for decision in decisions:
+                                writer.add(run_rule.id, decision)
+                progress.documents_processed += len(documents)
+                progress.pages_processed += 1
+        timing.documents += total_records
+        if writer is not None:
+            sampled = [sample.decisions() for sample in samples] if samples is not None else []
+            with timing.phase("write_traces", sum(len(decisions) for decisions in sampled)):
+                for (_, run_rule, _), decisions in zip(states, sampled):
+                    for decision in decisions:
+                        writer.add(run_rule.id, decision)
+                writer.flush()
+        return total_records
+
+    def _count_in_elasticsearch(
+        self, dataset: Dataset, specs: List[RuleSpec], status_labels: Dict[str, str]
+    ) -> Tuple[Dict[int, Counter[str]], int]:
+        """Count failing records per rule with a single ``filters`` aggregation.
+
+        Returns per-rule status counters for the rules that could be translated
+        into Elasticsearch queries, plus the dataset's total hit count. Rules
+        over a field that holds an array in some document are left out, since
+        Elasticsearch would match the array element-wise.
+        """
+
+        try:
+            mapping = self.es.indices.get_mapping(index=dataset.index_name)
+        except Exception:
+            logger.warning(
+                "Could not read the mapping of index %s; evaluating every rule in-process",
+                dataset.index_name,
+                exc_info=True,
+            )
+            return {}, 0
+        field_types = flatten_mapping(getattr(mapping, "body", mapping))
+        filters: Dict[str, Dict[str, Any]] = {}
+        rule_fields: Dict[str, set] = {}
+        for spec in specs:
+            clauses = [ConditionClause(**clause) for clause in spec.conditions]
+            query = translate_clauses(clauses, field_types)
+            if query is not None:
+                filters[str(spec.id)] = query
+                rule_fields[str(spec.id)] = {clause.field for clause in clauses}
+        if not filters:
+            return {}, 0
+        runtime_mappings, array_filters = array_probes(sorted(set().union(*rule_fields.values())))
+        body = {
+            **self._query_body(dataset),
+            "size": 0,
+            "track_total_hits": True,
+            "runtime_mappings": runtime_mappings,
+            "aggs": {
+                "rules": {"filters": {"filters": filters}},
+                "arrays": {"filters": {"filters": array_filters}},
+            },
+        }
+        response = self.es.search(index=dataset.index_name, body=body)
+        total = response["hits"]["total"]["value"]
+        arrays = {
+            field for field, bucket in response["aggregations"]["arrays"]["buckets"].items() if bucket["doc_count"]
+        }
+        counts: Dict[int, Counter[str]] = {}
+        for rule_id, bucket in response["aggregations"]["rules"]["buckets"].items():
+            # Elasticsearch matches arrays element-wise, so these rules are evaluated in-process.
+            if rule_fields[rule_id] & arrays:
+                continue
+            failed = bucket["doc_count"]
+            counts[int(rule_id)] = +Counter({status_labels["fail"]: failed, status_labels["pass"]: total - failed})
+        return counts, total
 
-    def _fetch_documents(self, dataset: Dataset) -> List[Dict]:
+    def _get_rulepack(self, rulepack_id: int) -> "CompiledRulepack":
+        from app.services.rulepack_cache import get_rulepack_cache
+
+        return get_rulepack_cache().get(self.db, rulepack_id)
+
+    @staticmethod
+    def _query_body(dataset: Dataset) -> Dict[str, Any]:
         query_body = dataset.query or {"query": {"match_all": {}}}
         if "query" not in query_body:
             query_body = {"query": query_body}
-        response = self.es.search(
-            index=dataset.index_name,
-            body=query_body,
-            size=1000,
-        )
-        hits = response.get("hits", {}).get("hits", [])
-        return [{"_id": hit.get("_id"), **hit.get("_source", {})} for hit in hits]
+        return query_body
 
-    def _evaluate_rule(
+    def _iter_document_pages(
         self,
-        rule: Rule,
-        documents: List[Dict],
+        dataset: Dataset,
+        query_body: Dict[str, Any] | None = None,
+        watermark: Watermark | None = None,
+        specs: Sequence[RuleSpec] | None = None,
+        timing: RunTiming | None = None,
+    ) -> Iterator[List[Dict]]:
+        """Yield pages of documents as ``_source`` dicts carrying the hit's ``_id``.
+
+        When ``specs`` are given only the fields they reference (plus the
+        watermark field) are fetched, unless the dataset query sets its own
+        ``_source``. Page fetches are recorded under the ``fetch`` phase of ``timing``.
+        """
+
+        page_size = dataset.page_size or DEFAULT_PAGE_SIZE
+        query_body = query_body or self._query_body(dataset)
+        if watermark is not None:
+            query_body = {**query_body, **watermark.search_options}
+        if specs is not None and "_source" not in query_body:
+            query_body = {**query_body, "_source": source_includes(specs, watermark) or False}
+        hit_pages = iter_search_pages(self.es, dataset.index_name, query_body, page_size)
+        if timing is not None:
+            hit_pages = timing.timed("fetch", hit_pages)
+        for hits in hit_pages:
+            if watermark is not None:
+                for hit in hits:
+                    watermark.observe(hit)
+            page = []
+            for hit in hits:
+                document = hit.get("_source") or {}
+                document.setdefault("_id", hit.get("_id"))
+                page.append(document)
+            yield page
+
+    @staticmethod
+    def _count_statuses(outcomes: RuleOutcomes, status_labels: Dict[str, str]) -> Counter[str]:
+        counter: Counter[str] = Counter()
+        if outcomes.matched_count:
+            counter[status_labels["fail"]] = outcomes.matched_count
+        if len(outcomes.matched) > outcomes.matched_count:
+            counter[status_labels["pass"]] = len(outcomes.matched) - outcomes.matched_count
+        return counter
+
+    @staticmethod
+    def _evaluate_rule(
+        rule: RuleSpec,
+        documents: Sequence[Dict],
+        outcomes: RuleOutcomes,
         status_labels: Dict[str, str],
-    ) -> Tuple[Dict[str, any], Counter[str]]:
+        keep: Callable[[str], bool] | None = None,
+    ) -> Tuple[List[Dict[str, any]], Counter[str]]:
+        """Count statuses for every outcome and build decisions for those ``keep`` accepts (all by default)."""
+
         decisions: List[Dict[str, any]] = []
-        counter: Counter[str] = Counter()
-        clauses = [ConditionClause(**clause) for clause in (rule.conditions or [])]
-        for doc in documents:
-            inputs = {field: doc.get(field) for field in rule.original_fields or []}
-            inputs.update({field: doc.get(field) for field in rule.aggregated_fields or []})
-            evaluated_clauses = evaluate_conditions(clauses, doc)
-            boolean_result = evaluate_boolean_chain(evaluated_clauses)
-            status = status_labels["fail"] if boolean_result else status_labels["pass"]
-            counter.update([status])
-            rationale = self._build_rationale(rule, doc, evaluated_clauses, boolean_result, status_labels)
+        counter = EvaluationService._count_statuses(outcomes, status_labels)
+        projection = compile_projection(rule.input_fields)
+        extras = {
+            "rule_no": rule.rule_no,
+            "new_rule_name": rule.new_rule_name,
+            "domain": rule.domain,
+        }
+        fail_label, pass_label = status_labels["fail"], status_labels["pass"]
+        for index, boolean_result in enumerate(outcomes.matched):
+            status = fail_label if boolean_result else pass_label
+            if keep is not None and not keep(status):
+                continue
+            doc = documents[index]
+            inputs = {field: get(doc) for field, get in projection}
             decisions.append(
                 {
-                    "record_id": str(doc.get("_id", doc.get("id", "unknown"))),
+                    "record_id": _record_id(doc),
                     "status": status,
                     "inputs": inputs,
                     "clauses": [
@@ -125,51 +652,170 @@ class EvaluationService:
                             "connector": ec.clause.connector,
                             "result": ec.result,
                         }
-                        for ec in evaluated_clauses
+                        for ec in outcomes.clauses(index)
                     ],
-                    "rationale": rationale,
-                    "extras": {
-                        "rule_no": rule.rule_no,
-                        "new_rule_name": rule.new_rule_name,
-                        "domain": rule.rulepack.domain if rule.rulepack else None,
-                    },
+                    "extras": dict(extras),
                 }
             )
+        return decisions, counter
+
+    @staticmethod
+    def _summarize_rule(rule: RuleSpec, counter: Counter[str], total_records: int, status_labels: Dict[str, str]) -> Dict[str, any]:
         overall_status = status_labels["pass"]
         if counter.get(status_labels["fail"], 0) > 0:
             overall_status = status_labels["fail"]
         elif counter.get(status_labels["warn"], 0) > 0:
             overall_status = status_labels["warn"]
-        summary = {
+        return {
             "rule_id": rule.id,
             "rule_no": rule.rule_no,
             "new_rule_name": rule.new_rule_name,
             "status": overall_status,
-            "decisions": decisions,
-            "total_records": len(documents),
+            "counts": dict(counter),
+            "total_records": total_records,
         }
-        return summary, counter
-
-    def _build_rationale(self, rule: Rule, doc: Dict, evaluated_clauses, boolean_result: bool, status_labels: Dict[str, str]) -> str:
-        if not evaluated_clauses:
-            return rule.rule_logic_business or "Rule evaluated without explicit clauses."
-        failing = [ec for ec in evaluated_clauses if not ec.result]
-        if boolean_result:
-            clause = next((ec for ec in evaluated_clauses if ec.result), None)
-            if clause:
-                value = doc.get(clause.clause.field)
-                return (
-                    f"Because {clause.clause.field} value {value} satisfied {clause.clause.operator} {clause.clause.value}, "
-                    f"the rule triggered and marked the record as {status_labels['fail']}."
-                )
+
+    @staticmethod
+    def _page_outcomes(
+        pool: ClausePool, documents: List[Dict], engine: str
+    ) -> Callable[[CompiledRule], RuleOutcomes]:
+        """Evaluate every distinct clause of the pool over a page once and return a per-rule view of the results."""
+
+        if engine == "vectorized":
+            # numpy is only needed by the vectorized engine, so it is imported on first use.
+            from app.utils.columnar import ColumnarBatch, evaluate_pool_masks, evaluate_rule_masks
+
+            batch = ColumnarBatch(documents)
+            pool_masks = evaluate_pool_masks(batch, pool)
+
+            def vectorized_outcomes(compiled: CompiledRule) -> RuleOutcomes:
+                masks, matched = evaluate_rule_masks(batch, compiled, pool_masks)
+
+                def clauses(index: int) -> List[EvaluatedClause]:
+                    return [
+                        EvaluatedClause(clause=clause.clause, result=bool(mask[index]))
+                        for clause, mask in zip(compiled.clauses, masks)
+                    ]
+
+                return RuleOutcomes(matched.tolist(), int(matched.sum()), clauses)
+
+            return vectorized_outcomes
+
+        pool_rows = [pool.evaluate(doc) for doc in documents]
+
+        def row_outcomes(compiled: CompiledRule) -> RuleOutcomes:
+            matched = [bool(compiled.matches_results(results)) for results in pool_rows]
+            return RuleOutcomes(matched, sum(matched), lambda index: compiled.select(pool_rows[index]))
+
+        return row_outcomes
+
+
+def source_includes(specs: Sequence[RuleSpec], watermark: Watermark | None = None) -> List[str]:
+    """``_source`` include patterns for every field the rules read, plus a document watermark field."""
+
+    fields = {source_path(field) for spec in specs for field in spec.input_fields}
+    if watermark is not None and watermark.field != SEQ_NO_FIELD:
+        fields.add(watermark.field)
+    return sorted(fields)
+
+
+def _start_profiler(run_id: int, timing: RunTiming) -> Optional[cProfile.Profile]:
+    """Start profiling a run, or return ``None`` if another run is already being profiled.
+
+    The dump covers the whole process while the run is active; on Python 3.12+
+    that includes work done on other threads.
+    """
+
+    if not _profile_lock.acquire(blocking=False):
+        logger.warning("Not profiling run %s: another run is already being profiled", run_id)
+        return None
+    try:
+        profile_path = _profile_path(run_id)
+        profiler = cProfile.Profile()
+        profiler.enable()
+    except Exception:
+        _profile_lock.release()
+        raise
+    timing.profile_path = str(profile_path)
+    return profiler
+
+
+def _profile_path(run_id: int) -> Path:
+    export_dir = Path(get_settings().run_export_dir)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    return export_dir / f"run_{run_id}.prof"
+
+
+def _record_id(doc: Dict[str, Any]) -> str:
+    return str(doc.get("_id", doc.get("id", "unknown")))
+
+
+class PageEvaluator:
+    """Evaluate pages of documents against a compiled rulepack in the current process.
+
+    Decisions are filtered by the trace retention ``policy``; under
+    ``sample`` each page yields a per-status reservoir sample of
+    ``sample_size`` decisions per rule. When ``timing`` is given, clause
+    evaluation and each rule's share of a page are timed into it.
+    """
+
+    def __init__(
+        self,
+        specs: Sequence[RuleSpec],
+        engine: str,
+        status_labels: Dict[str, str],
+        retention: str = RETAIN_ALL,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        precompiled: Optional[Tuple[ClausePool, Sequence[CompiledRule]]] = None,
+        timing: Optional[RunTiming] = None,
+    ):
+        self.specs = list(specs)
+        self.timing = timing
+        self.engine = engine
+        self.status_labels = status_labels
+        self.retention = retention
+        self.sample_size = sample_size
+        self.rng = random.Random()
+        self.keep = page_selector(retention, status_labels["fail"])
+        if precompiled is not None:
+            self.pool, compiled = precompiled
+            self.compiled = list(compiled)
         else:
-            clause = next((ec for ec in evaluated_clauses if not ec.result), None)
-            if clause:
-                value = doc.get(clause.clause.field)
-                return (
-                    f"Clause {clause.clause.field} value {value} did not satisfy {clause.clause.operator} {clause.clause.value}, "
-                    f"so the record is considered {status_labels['pass']}."
-                )
-        clause = evaluated_clauses[0]
-        value = doc.get(clause.clause.field)
-        return f"{clause.clause.field} with value {value} maintained rule outcome {status_labels['pass'] if not boolean_result else status_labels['fail']}."
+            self.pool = ClausePool()
+            self.compiled = [compile_clauses(spec.conditions, self.pool) for spec in self.specs]
+
+    def __call__(self, documents: List[Dict]) -> PageResult:
+        if self.timing is None:
+            outcomes_for = EvaluationService._page_outcomes(self.pool, documents, self.engine)
+            return [
+                self._evaluate(spec, compiled, documents, outcomes_for)
+                for spec, compiled in zip(self.specs, self.compiled)
+            ]
+        with self.timing.phase("clauses", len(documents)):
+            outcomes_for = EvaluationService._page_outcomes(self.pool, documents, self.engine)
+        results: PageResult = []
+        for spec, compiled in zip(self.specs, self.compiled):
+            wall, cpu = time.perf_counter(), time.thread_time()
+            results.append(self._evaluate(spec, compiled, documents, outcomes_for))
+            self.timing.record_rule(
+                spec.id, spec.rule_no, time.perf_counter() - wall, time.thread_time() - cpu, len(documents)
+            )
+        return results
+
+    def _evaluate(
+        self,
+        spec: RuleSpec,
+        compiled: CompiledRule,
+        documents: List[Dict],
+        outcomes_for: Callable[[CompiledRule], RuleOutcomes],
+    ) -> Tuple[List[Dict[str, Any]], Counter]:
+        outcomes = outcomes_for(compiled)
+        if self.retention == RETAIN_NONE:
+            return [], EvaluationService._count_statuses(outcomes, self.status_labels)
+        if self.retention == RETAIN_SAMPLE:
+            sampler = PageSampler(self.sample_size, self.rng)
+            decisions, counter = EvaluationService._evaluate_rule(
+                spec, documents, outcomes, self.status_labels, sampler.offer
+            )
+            return sampler.collect(decisions), counter
+        return EvaluationService._evaluate_rule(spec, documents, outcomes, self.status_labels, self.keep)
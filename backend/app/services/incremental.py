@@ -0,0 +1,124 @@
+"""Helpers for incremental runs evaluated against a baseline run.
+
+A dataset opts in by naming a ``change_field``: either a timestamp field in
+the documents or ``_seq_no``. Every run on such a dataset records the highest
+value it saw as its watermark. An incremental run only fetches documents past
+the baseline's watermark for rules whose condition hash is unchanged, and
+carries the baseline's decisions and counts over for every other record.
+
+Deleted documents cannot be detected this way; their baseline decisions are
+carried over until the next full run.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.models.run import DecisionTrace
+
+SEQ_NO_FIELD = "_seq_no"
+_ID_CHUNK_SIZE = 500
+
+
+class Watermark:
+    """Track the highest ``field`` value among the hits of a run."""
+
+    def __init__(self, field: str, value: Any = None):
+        self.field = field
+        self.value = value
+
+    @property
+    def search_options(self) -> Dict[str, Any]:
+        return {"seq_no_primary_term": True} if self.field == SEQ_NO_FIELD else {}
+
+    def observe(self, hit: Dict[str, Any]) -> None:
+        if self.field == SEQ_NO_FIELD:
+            value = hit.get(SEQ_NO_FIELD)
+        else:
+            value = hit.get("_source", {})
+            for part in self.field.split("."):
+                value = value.get(part) if isinstance(value, dict) else None
+        if value is None:
+            return
+        try:
+            if self.value is None or value > self.value:
+                self.value = value
+        except TypeError:
+            # Values of another type than the watermark cannot be ordered against it.
+            pass
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"field": self.field, "value": self.value}
+
+
+def delta_query(query_body: Dict[str, Any], watermark: Dict[str, Any]) -> Dict[str, Any]:
+    """Restrict ``query_body`` to documents changed after ``watermark``."""
+
+    changed = {"range": {watermark["field"]: {"gt": watermark["value"]}}}
+    return {**query_body, "query": {"bool": {"filter": [query_body["query"], changed]}}}
+
+
+def _chunks(values: Sequence[str]) -> Iterable[List[str]]:
+    for start in range(0, len(values), _ID_CHUNK_SIZE):
+        yield list(values[start : start + _ID_CHUNK_SIZE])
+
+
+def baseline_statuses(db: Session, baseline_result_id: int, record_ids: Sequence[str]) -> Counter:
+    """Count the baseline statuses of ``record_ids`` for one rule result."""
+
+    counts: Counter = Counter()
+    for chunk in _chunks(record_ids):
+        rows = db.execute(
+            select(DecisionTrace.status, func.count())
+            .where(DecisionTrace.rule_result_id == baseline_result_id, DecisionTrace.record_id.in_(chunk))
+            .group_by(DecisionTrace.status)
+        )
+        counts.update({status: count for status, count in rows})
+    return counts
+
+
+def carry_over_traces(
+    db: Session,
+    baseline_result_id: int,
+    rule_result_id: int,
+    replaced_ids: Sequence[str],
+    statuses: Optional[Sequence[str]] = None,
+) -> None:
+    """Copy baseline traces onto ``rule_result_id`` except for the ``replaced_ids`` records.
+
+    Rows are copied with one ``INSERT ... SELECT``; copies of replaced records
+    are then deleted. Only rows with ids above the pre-copy maximum are
+    deleted, so traces already written for the new run are kept.
+    ``statuses`` limits the copy to those statuses.
+    """
+
+    table = DecisionTrace.__table__
+    boundary = db.execute(select(func.coalesce(func.max(table.c.id), 0))).scalar_one()
+    source = select(
+        literal(rule_result_id),
+        table.c.record_id,
+        table.c.status,
+        table.c.inputs,
+        table.c.clauses,
+        table.c.extras,
+    ).where(table.c.rule_result_id == baseline_result_id)
+    if statuses is not None:
+        source = source.where(table.c.status.in_(list(statuses)))
+    db.execute(
+        insert(table).from_select(
+            ["rule_result_id", "record_id", "status", "inputs", "clauses", "extras"],
+            source.order_by(table.c.id),
+        )
+    )
+    for chunk in _chunks(replaced_ids):
+        db.execute(
+            delete(table).where(
+                table.c.rule_result_id == rule_result_id,
+                table.c.id > boundary,
+                table.c.record_id.in_(chunk),
+            )
+        )
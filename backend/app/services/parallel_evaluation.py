@@ -0,0 +1,130 @@
+"""Process-pool evaluation of document pages for multi-core hosts.
+
+Each worker compiles the rulepack once in its initializer. Pages are encoded
+once into a shared memory segment as newline-delimited JSON; tasks only carry
+the segment name and the byte range of their shard, so documents are never
+pickled per task. Shards are contiguous and results are merged in shard order,
+which keeps decisions and counters identical to the serial evaluator.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.services.evaluation_service import DEFAULT_SAMPLE_SIZE, PageEvaluator, PageResult, RuleSpec
+from app.services.trace_retention import RETAIN_ALL, RETAIN_SAMPLE, SampleAccumulator
+
+_worker_evaluator: Optional[PageEvaluator] = None
+
+
+def _init_worker(
+    specs: Sequence[RuleSpec], engine: str, status_labels: Dict[str, str], retention: str, sample_size: int
+) -> None:
+    global _worker_evaluator
+    _worker_evaluator = PageEvaluator(specs, engine, status_labels, retention, sample_size)
+
+
+def _evaluate_shard(segment_name: str, start: int, end: int) -> PageResult:
+    segment = shared_memory.SharedMemory(name=segment_name)
+    try:
+        payload = bytes(segment.buf[start:end])
+    finally:
+        segment.close()
+    documents = [json.loads(line) for line in payload.split(b"\n")]
+    if _worker_evaluator is None:
+        raise RuntimeError("Evaluation worker was not initialised")
+    return _worker_evaluator(documents)
+
+
+def mp_context():
+    """The multiprocessing context for worker process pools."""
+
+    methods = multiprocessing.get_all_start_methods()
+    # Avoid plain fork: the document prefetch thread may hold locks at fork time.
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class ParallelPageEvaluator:
+    """Drop-in replacement for ``PageEvaluator`` that shards pages across processes."""
+
+    def __init__(
+        self,
+        specs: Sequence[RuleSpec],
+        engine: str,
+        status_labels: Dict[str, str],
+        workers: int,
+        retention: str = RETAIN_ALL,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+    ):
+        self.workers = workers
+        self.rule_count = len(specs)
+        self.retention = retention
+        self.sample_size = sample_size
+        self.rng = random.Random()
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp_context(),
+            initializer=_init_worker,
+            initargs=(list(specs), engine, status_labels, retention, sample_size),
+        )
+
+    def __enter__(self) -> "ParallelPageEvaluator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __call__(self, documents: List[Dict]) -> PageResult:
+        if not documents:
+            return [([], Counter()) for _ in range(self.rule_count)]
+        lines = [json.dumps(doc, default=str).encode() for doc in documents]
+        ranges = self._shard_ranges(lines)
+        payload = b"\n".join(lines)
+        segment = shared_memory.SharedMemory(create=True, size=len(payload))
+        try:
+            segment.buf[: len(payload)] = payload
+            futures = [self._executor.submit(_evaluate_shard, segment.name, start, end) for start, end in ranges]
+            shard_results = [future.result() for future in futures]
+        finally:
+            segment.close()
+            segment.unlink()
+        if self.retention == RETAIN_SAMPLE:
+            return self._merge_samples(shard_results)
+        merged: PageResult = [([], Counter()) for _ in range(self.rule_count)]
+        for shard in shard_results:
+            for (decisions, counter), (shard_decisions, shard_counter) in zip(merged, shard):
+                decisions.extend(shard_decisions)
+                counter.update(shard_counter)
+        return merged
+
+    def _merge_samples(self, shard_results: List[PageResult]) -> PageResult:
+        merged: PageResult = []
+        for rule_index in range(self.rule_count):
+            sample = SampleAccumulator(self.sample_size, self.rng)
+            counter: Counter = Counter()
+            for shard in shard_results:
+                shard_decisions, shard_counter = shard[rule_index]
+                sample.merge(shard_decisions, shard_counter)
+                counter.update(shard_counter)
+            merged.append((sample.decisions(), counter))
+        return merged
+
+    def _shard_ranges(self, lines: List[bytes]) -> List[Tuple[int, int]]:
+        shard_count = min(self.workers, len(lines))
+        shard_size, remainder = divmod(len(lines), shard_count)
+        ranges: List[Tuple[int, int]] = []
+        offset = 0
+        line_index = 0
+        for shard in range(shard_count):
+            count = shard_size + (1 if shard < remainder else 0)
+            length = sum(len(line) for line in lines[line_index : line_index + count]) + count - 1
+            ranges.append((offset, offset + length))
+            offset += length + 1
+            line_index += count
+        return ranges
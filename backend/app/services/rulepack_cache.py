@@ -0,0 +1,150 @@
+"""In-process LRU cache of compiled, ORM-detached rulepacks.
+
+Entries are keyed by rulepack id and checksum and hold everything a run needs
+from the rulepack: its metadata, the ``RuleSpec`` of every rule and the
+rules compiled against one shared ``ClausePool``. Editing rules does not
+change a rulepack's checksum, so committed changes to ``Rule`` or
+``RulePack`` rows evict the affected rulepacks; the cache lives in one
+process and does not see edits made by other processes.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.rulepack import Rule, RulePack
+from app.services.evaluation_service import RuleSpec
+from app.utils.conditions import ClausePool, CompiledRule, compile_clauses
+
+_PENDING_KEY = "rulepack_cache_pending"
+
+
+@dataclass(frozen=True)
+class CompiledRulepack:
+    id: int
+    checksum: str
+    domain: str
+    version: int
+    specs: Tuple[RuleSpec, ...]
+    pool: ClausePool
+    compiled: Tuple[CompiledRule, ...]
+
+    @classmethod
+    def from_rulepack(cls, rulepack: RulePack) -> "CompiledRulepack":
+        specs = tuple(RuleSpec.from_rule(rule) for rule in rulepack.rules)
+        pool = ClausePool()
+        compiled = tuple(compile_clauses(spec.conditions, pool) for spec in specs)
+        return cls(
+            id=rulepack.id,
+            checksum=rulepack.checksum,
+            domain=rulepack.domain,
+            version=rulepack.version,
+            specs=specs,
+            pool=pool,
+            compiled=compiled,
+        )
+
+
+class RulepackCache:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[int, str], CompiledRulepack]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, db: Session, rulepack_id: int) -> CompiledRulepack:
+        """Return the compiled rulepack, compiling and caching it on a miss.
+
+        Raises ``sqlalchemy.orm.exc.NoResultFound`` for unknown rulepacks.
+        """
+
+        checksum = db.query(RulePack.checksum).filter(RulePack.id == rulepack_id).one()[0]
+        key = (rulepack_id, checksum)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        rulepack = db.query(RulePack).filter(RulePack.id == rulepack_id).one()
+        entry = CompiledRulepack.from_rulepack(rulepack)
+        if self.maxsize > 0:
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return entry
+
+    def invalidate(self, rulepack_id: int) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == rulepack_id]:
+                del self._entries[key]
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+_cache: Optional[RulepackCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_rulepack_cache() -> RulepackCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = RulepackCache(get_settings().rulepack_cache_size)
+        return _cache
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_edited_rulepacks(session: Session, flush_context) -> None:
+    pending: Set[int] = session.info.setdefault(_PENDING_KEY, set())
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, Rule) and instance.rulepack_id is not None:
+            pending.add(instance.rulepack_id)
+        elif isinstance(instance, RulePack) and instance.id is not None:
+            pending.add(instance.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_edited_rulepacks(session: Session) -> None:
+    # Evict on commit rather than on flush so a concurrent run cannot re-cache
+    # the rules as they were before the edit became visible.
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and _cache is not None:
+        for rulepack_id in pending:
+            _cache.invalidate(rulepack_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_edited_rulepacks(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
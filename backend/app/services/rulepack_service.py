@@ -1,18 +1,25 @@
 from __future__ import annotations
 
 import hashlib
+import logging
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from io import BytesIO
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-import pandas as pd
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.models.rulepack import Rule, RulePack
 from app.schemas.common import ConditionClause
 from app.utils.conditions import ConditionParserError, parse_conditions
 
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
 COLUMN_MAP = {
     "Rule No.": "rule_no",
     "Rule No": "rule_no",
@@ -47,6 +54,8 @@ COLUMN_MAP = {
 
 LIST_COLUMNS = {"Original Fields", "Aggregated or Calculated Fields"}
 
+logger = logging.getLogger(__name__)
+
 
 def _clean_columns(df: pd.DataFrame) -> pd.DataFrame:
     df = df.rename(columns={col: col.strip() for col in df.columns if isinstance(col, str)})
@@ -61,54 +70,102 @@ class RulepackImportError(Exception):
         self.row = row
         super().__init__(message)
 
+    def __reduce__(self):
+        # Keep the sheet/row diagnostics when errors cross process boundaries.
+        return (self.__class__, (str(self),), {"sheet": self.sheet, "row": self.row})
+
+
+@dataclass
+class SheetTiming:
+    sheet: str
+    rules: int
+    read_seconds: float
+    map_seconds: float
+
+
+@dataclass
+class _ParsedSheet:
+    sheet: str
+    rules: List[Tuple[int, Dict[str, Any], Dict[Any, Any]]]
+    timing: SheetTiming
+    error: Optional[RulepackImportError] = None
+
+
+def load_rulepack_from_excel(
+    db: Session,
+    file_bytes: bytes,
+    metadata: Optional[Dict[str, str]] = None,
+    *,
+    workers: Optional[int] = None,
+    timings: Optional[List[SheetTiming]] = None,
+) -> List[RulePack]:
+    """Import every sheet of a workbook as a rulepack version for the sheet's domain.
+
+    Sheets are parsed in ``workers`` processes (``rulepack_import_workers`` by
+    default) and mapped to rules column-wise. Errors are reported for the
+    first failing sheet in workbook order. Per-sheet timings are logged and
+    appended to ``timings`` when a list is given.
+    """
 
-def load_rulepack_from_excel(db: Session, file_bytes: bytes, metadata: Optional[Dict[str, str]] = None) -> List[RulePack]:
     checksum = hashlib.sha256(file_bytes).hexdigest()
     existing = db.query(RulePack).filter(RulePack.checksum == checksum).first()
     if existing:
         return [existing]
 
+    # pandas (and openpyxl through it) is only imported when a workbook is read, keeping it off the API's startup path.
+    import pandas as pd
+
     try:
         excel = pd.ExcelFile(BytesIO(file_bytes))
     except Exception as exc:  # pragma: no cover - pandas provides rich error context
         raise RulepackImportError("Unable to read Excel document") from exc
+    sheet_names = list(excel.sheet_names)
+    workers = min(workers or get_settings().rulepack_import_workers, len(sheet_names) or 1)
+    if workers > 1:
+        from app.services.parallel_evaluation import mp_context
+
+        excel.close()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp_context(),
+            initializer=_init_import_worker,
+            initargs=(file_bytes,),
+        ) as executor:
+            parsed_sheets = list(executor.map(_parse_sheet_in_worker, sheet_names))
+    else:
+        conditions_cache: Dict[str, List[ConditionClause]] = {}
+        parsed_sheets = [_parse_sheet(excel, sheet_name, conditions_cache) for sheet_name in sheet_names]
+
+    for parsed in parsed_sheets:
+        if parsed.error is not None:
+            raise parsed.error
     rulepacks: List[RulePack] = []
-    for sheet_name in excel.sheet_names:
-        df = excel.parse(sheet_name)
-        df = _clean_columns(df)
-        rules: List[Rule] = []
-        for row_number, (_, row) in enumerate(df.iterrows(), start=1):
-            if row.dropna().empty:
-                continue
-            try:
-                rule_data, extra_fields = _map_row_to_rule(row, sheet_name, row_number)
-            except RulepackImportError:
-                raise
-            except Exception as exc:
-                raise RulepackImportError(
-                    f"Failed to import row {row_number} from sheet '{sheet_name}': {exc}",
-                    sheet=sheet_name,
-                    row=row_number,
-                ) from exc
-            clauses = rule_data.pop("conditions", [])
-            rule = Rule(
-                order_index=_resolve_order_index(row, sheet_name, row_number),
-                **rule_data,
-                conditions=[clause.dict() for clause in clauses],
-                extra=extra_fields,
-            )
-            rules.append(rule)
-        if not rules:
+    for parsed in parsed_sheets:
+        timing = parsed.timing
+        logger.info(
+            "Parsed sheet '%s': %d rules (read %.3fs, map %.3fs)",
+            timing.sheet,
+            timing.rules,
+            timing.read_seconds,
+            timing.map_seconds,
+        )
+        if timings is not None:
+            timings.append(timing)
+        if not parsed.rules:
             continue
+        rules = [
+            Rule(order_index=order_index, **rule_data, extra=extra_fields)
+            for order_index, rule_data, extra_fields in parsed.rules
+        ]
         latest_version = (
             db.query(RulePack)
-            .filter(RulePack.domain == sheet_name)
+            .filter(RulePack.domain == parsed.sheet)
             .order_by(RulePack.version.desc())
             .first()
         )
         version = latest_version.version + 1 if latest_version else 1
         rulepack = RulePack(
-            domain=sheet_name,
+            domain=parsed.sheet,
             version=version,
             checksum=checksum,
             uploaded_at=datetime.now(timezone.utc),
@@ -123,22 +180,100 @@ def load_rulepack_from_excel(db: Session, file_bytes: bytes, metadata: Optional[
     return rulepacks
 
 
-def _map_row_to_rule(row: pd.Series, sheet_name: str, row_number: int) -> Tuple[Dict[str, any], Dict[str, any]]:
-    rule_data: Dict[str, any] = {}
-    extra_fields: Dict[str, any] = {}
-    for col, value in row.items():
-        if pd.isna(value):
+_worker_excel: Optional[pd.ExcelFile] = None
+_worker_conditions: Dict[str, List[ConditionClause]] = {}
+
+
+def _init_import_worker(file_bytes: bytes) -> None:
+    import pandas as pd
+
+    global _worker_excel
+    _worker_excel = pd.ExcelFile(BytesIO(file_bytes))
+
+
+def _parse_sheet_in_worker(sheet_name: str) -> _ParsedSheet:
+    if _worker_excel is None:
+        raise RuntimeError("Import worker was not initialised")
+    return _parse_sheet(_worker_excel, sheet_name, _worker_conditions)
+
+
+def _parse_sheet(excel: pd.ExcelFile, sheet_name: str, conditions_cache: Dict[str, List[ConditionClause]]) -> _ParsedSheet:
+    """Map one sheet to ``(order_index, rule_data, extra_fields)`` tuples, capturing the first error."""
+
+    import pandas as pd
+
+    started = time.perf_counter()
+    df = _clean_columns(excel.parse(sheet_name))
+    read_done = time.perf_counter()
+    columns = list(df.columns)
+    targets = [COLUMN_MAP.get(col, None) for col in columns]
+    order_position = columns.index("S. No.") if "S. No." in columns else None
+    # ``df.values`` and ``pd.isna`` match what ``iterrows`` and per-cell checks saw.
+    values = df.values
+    missing = pd.isna(values)
+    rules: List[Tuple[int, Dict[str, Any], Dict[Any, Any]]] = []
+    error: Optional[RulepackImportError] = None
+    for position, (row, row_missing) in enumerate(zip(values.tolist(), missing.tolist())):
+        row_number = position + 1
+        if all(row_missing):
             continue
-        normalized = COLUMN_MAP.get(col, None)
-        if normalized == "conditions":
+        try:
             try:
-                clauses = parse_conditions(str(value))
-            except ConditionParserError as exc:
+                rule_data, extra_fields = _map_row_to_rule(
+                    columns, targets, row, row_missing, df.index[position], sheet_name, row_number, conditions_cache
+                )
+            except RulepackImportError:
+                raise
+            except Exception as exc:
                 raise RulepackImportError(
-                    f"Unable to parse conditions in sheet '{sheet_name}' row {row_number}: {value}",
+                    f"Failed to import row {row_number} from sheet '{sheet_name}': {exc}",
                     sheet=sheet_name,
                     row=row_number,
                 ) from exc
+            clauses = rule_data.pop("conditions", [])
+            rule_data["conditions"] = [clause.dict() for clause in clauses]
+            order_value = row[order_position] if order_position is not None else row_number
+            rules.append((_resolve_order_index(order_value, sheet_name, row_number), rule_data, extra_fields))
+        except RulepackImportError as exc:
+            error = exc
+            break
+    timing = SheetTiming(
+        sheet=sheet_name,
+        rules=len(rules),
+        read_seconds=round(read_done - started, 4),
+        map_seconds=round(time.perf_counter() - read_done, 4),
+    )
+    return _ParsedSheet(sheet=sheet_name, rules=rules, timing=timing, error=error)
+
+
+def _map_row_to_rule(
+    columns: List[Any],
+    targets: List[Optional[str]],
+    row: List[Any],
+    row_missing: List[bool],
+    row_name: Any,
+    sheet_name: str,
+    row_number: int,
+    conditions_cache: Dict[str, List[ConditionClause]],
+) -> Tuple[Dict[str, any], Dict[str, any]]:
+    rule_data: Dict[str, any] = {}
+    extra_fields: Dict[str, any] = {}
+    for col, normalized, value, is_missing in zip(columns, targets, row, row_missing):
+        if is_missing:
+            continue
+        if normalized == "conditions":
+            text = str(value)
+            clauses = conditions_cache.get(text)
+            if clauses is None:
+                try:
+                    clauses = parse_conditions(text)
+                except ConditionParserError as exc:
+                    raise RulepackImportError(
+                        f"Unable to parse conditions in sheet '{sheet_name}' row {row_number}: {value}",
+                        sheet=sheet_name,
+                        row=row_number,
+                    ) from exc
+                conditions_cache[text] = clauses
             rule_data["conditions"] = clauses
         elif normalized in {"original_fields", "aggregated_fields"}:
             if isinstance(value, str):
@@ -153,9 +288,9 @@ def _map_row_to_rule(row: pd.Series, sheet_name: str, row_number: int) -> Tuple[
         else:
             extra_fields[col] = value
     if "rule_no" not in rule_data:
-        rule_data["rule_no"] = str(row.name)
+        rule_data["rule_no"] = str(row_name)
     if "new_rule_name" not in rule_data or not rule_data["new_rule_name"]:
-        fallback_name = rule_data.get("de_rule_name") or rule_data.get("bi_rule_name") or f"Rule {row.name}"
+        fallback_name = rule_data.get("de_rule_name") or rule_data.get("bi_rule_name") or f"Rule {row_name}"
         rule_data["new_rule_name"] = fallback_name
     return rule_data, extra_fields
 
@@ -164,8 +299,7 @@ def re_split(value: str) -> List[str]:
     return [segment.strip() for segment in re.split(r"[,;\n]", value)]
 
 
-def _resolve_order_index(row: pd.Series, sheet_name: str, row_number: int) -> int:
-    value = row.get("S. No.", row_number)
+def _resolve_order_index(value: Any, sheet_name: str, row_number: int) -> int:
     try:
         return int(value)
     except (TypeError, ValueError) as exc:
@@ -0,0 +1,219 @@
+"""Constant-memory export of runs and their decision traces.
+
+Decision traces are read with a streaming cursor in chunks of ``chunk_size``
+rows, ordered by rule result and trace id, and encoded incrementally so the
+full run is never materialised in memory.
+
+Formats:
+
+* ``json``: a single document shaped like the ``Run`` schema.
+* ``ndjson``: one record per line, tagged ``run``, ``rule_result`` or
+  ``decision``.
+* ``yaml``: the same records as a stream of YAML documents.
+* ``parquet`` / ``arrow``: one row per decision in columnar form (see
+  ``app.services.columnar_export``).
+
+The text formats can be gzip-compressed.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.rulepack import Rule
+from app.models.run import DecisionTrace, Run, RunRuleResult
+from app.schemas.common import RunDetail
+from app.services.columnar_export import COLUMNAR_FORMATS, ColumnarExporter, require_pyarrow
+from app.utils.rationale import render_rationale
+
+TEXT_FORMATS = ("json", "ndjson", "yaml")
+EXPORT_FORMATS = TEXT_FORMATS + COLUMNAR_FORMATS
+DEFAULT_CHUNK_SIZE = 1000
+
+_MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "yaml": "application/x-yaml",
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.file",
+}
+_EXTENSIONS = {"json": "json", "ndjson": "ndjson", "yaml": "yaml", "parquet": "parquet", "arrow": "arrow"}
+
+
+class RunExporter:
+    def __init__(
+        self,
+        db: Session,
+        run: Run,
+        *,
+        include_decisions: bool = True,
+        render_rationales: bool = True,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.db = db
+        self.run = run
+        self.include_decisions = include_decisions
+        self.render_rationales = render_rationales
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def validate_format(fmt: str, compress: bool = False) -> None:
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+        if fmt in COLUMNAR_FORMATS:
+            if compress:
+                raise ValueError(f"The {fmt} format is already compressed; 'compress' only applies to text formats")
+            require_pyarrow()
+
+    @staticmethod
+    def media_type(fmt: str, compress: bool = False) -> str:
+        return "application/gzip" if compress else _MEDIA_TYPES[fmt]
+
+    @staticmethod
+    def filename(run_id: int, fmt: str, compress: bool = False) -> str:
+        return f"run_{run_id}.{_EXTENSIONS[fmt]}" + (".gz" if compress else "")
+
+    def run_record(self) -> Dict[str, Any]:
+        return {name: getattr(self.run, name) for name in RunDetail.__fields__ if name != "rule_results"}
+
+    def rule_result_records(self) -> List[Dict[str, Any]]:
+        results = (
+            self.db.query(RunRuleResult)
+            .filter(RunRuleResult.run_id == self.run.id)
+            .order_by(RunRuleResult.id)
+            .all()
+        )
+        return [
+            {"id": result.id, "rule_id": result.rule_id, "status": result.status, "summary": result.summary}
+            for result in results
+        ]
+
+    def iter_decisions(self) -> Iterator[Dict[str, Any]]:
+        """Yield decision records ordered by ``(rule_result_id, id)``, read in chunks."""
+
+        # Rules deleted after the run keep their decisions; they are named by id instead.
+        business_logic = {
+            result_id: logic if rule_exists is not None else f"Rule {rule_id} (deleted)"
+            for result_id, rule_id, rule_exists, logic in (
+                self.db.query(RunRuleResult.id, RunRuleResult.rule_id, Rule.id, Rule.rule_logic_business)
+                .outerjoin(Rule, Rule.id == RunRuleResult.rule_id)
+                .filter(RunRuleResult.run_id == self.run.id)
+                .all()
+            )
+        }
+        if not business_logic:
+            return
+        table = DecisionTrace.__table__
+        statement = (
+            select(
+                table.c.id,
+                table.c.rule_result_id,
+                table.c.record_id,
+                table.c.status,
+                table.c.inputs,
+                table.c.clauses,
+            )
+            .where(table.c.rule_result_id.in_(list(business_logic)))
+            .order_by(table.c.rule_result_id, table.c.id)
+            .execution_options(yield_per=self.chunk_size)
+        )
+        for partition in self.db.execute(statement).mappings().partitions():
+            for row in partition:
+                clauses = row["clauses"] or []
+                inputs = row["inputs"] or {}
+                rationale = None
+                if self.render_rationales:
+                    rationale = render_rationale(
+                        row["status"], clauses, inputs, business_logic[row["rule_result_id"]]
+                    )
+                yield {
+                    "id": row["id"],
+                    "rule_result_id": row["rule_result_id"],
+                    "record_id": row["record_id"],
+                    "status": row["status"],
+                    "inputs": inputs,
+                    "clauses": clauses,
+                    "rationale": rationale,
+                }
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        yield {"type": "run", **self.run_record()}
+        for result in self.rule_result_records():
+            yield {"type": "rule_result", **result}
+        if self.include_decisions:
+            for decision in self.iter_decisions():
+                yield {"type": "decision", **decision}
+
+    def iter_text(self, fmt: str) -> Iterator[str]:
+        if fmt not in TEXT_FORMATS:
+            raise ValueError(f"Unsupported text export format: {fmt}")
+        if fmt == "json":
+            yield from self._iter_json()
+        elif fmt == "ndjson":
+            for record in self.iter_records():
+                yield json.dumps(record, default=str) + "\n"
+        else:
+            import yaml
+
+            for record in self.iter_records():
+                yield yaml.safe_dump(record, explicit_start=True, sort_keys=False)
+
+    def iter_bytes(self, fmt: str, compress: bool = False) -> Iterator[bytes]:
+        self.validate_format(fmt, compress)
+        if fmt in COLUMNAR_FORMATS:
+            yield from ColumnarExporter(self).iter_bytes(fmt)
+            return
+        encoder = zlib.compressobj(wbits=31) if compress else None
+        buffer: List[str] = []
+        buffered = 0
+        for text in self.iter_text(fmt):
+            buffer.append(text)
+            buffered += len(text)
+            if buffered >= 64 * 1024:
+                chunk = "".join(buffer).encode()
+                buffer, buffered = [], 0
+                chunk = encoder.compress(chunk) if encoder else chunk
+                if chunk:
+                    yield chunk
+        tail = "".join(buffer).encode()
+        if encoder:
+            tail = encoder.compress(tail) + encoder.flush()
+        if tail:
+            yield tail
+
+    def write(self, path: Path, fmt: str, compress: bool = False) -> Path:
+        with Path(path).open("wb") as handle:
+            for chunk in self.iter_bytes(fmt, compress):
+                handle.write(chunk)
+        return Path(path)
+
+    def _iter_json(self) -> Iterator[str]:
+        header = json.dumps(self.run_record(), default=str)
+        yield header[:-1] + ', "rule_results": ['
+        decisions = self.iter_decisions() if self.include_decisions else iter(())
+        pending: Optional[Dict[str, Any]] = next(decisions, None)
+        for index, result in enumerate(self.rule_result_records()):
+            body = json.dumps(result, default=str)
+            yield ("," if index else "") + body[:-1]
+            if not self.include_decisions:
+                yield "}"
+                continue
+            yield ', "decisions": ['
+            first = True
+            while pending is not None and pending["rule_result_id"] == result["id"]:
+                decision = dict(pending)
+                decision.pop("rule_result_id")
+                yield ("" if first else ",") + json.dumps(decision, default=str)
+                first = False
+                pending = next(decisions, None)
+            yield "]}"
+        yield "]}"
+
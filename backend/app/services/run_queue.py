@@ -0,0 +1,146 @@
+"""In-process background execution of evaluation runs.
+
+Runs are queued on a small thread pool owned by the API process, so no
+external broker is needed. Live progress for active runs is kept in memory and
+the final snapshot is persisted on the ``Run`` row by ``EvaluationService``.
+
+Because the queue only lives in memory, shutting down cancels queued runs and
+asks active ones to stop after their current page instead of waiting for them,
+and on startup ``fail_orphaned_runs`` marks runs that a previous process left
+``queued`` or ``running`` as failed.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.run import RUN_FAILED, RUN_QUEUED, RUN_RUNNING, Run
+
+ORPHANED_RUN_ERROR = "The API restarted before the run finished"
+CANCELLED_RUN_ERROR = "The API shut down before the run finished"
+
+
+class RunCancelled(RuntimeError):
+    """Raised inside a run that was asked to stop because the queue is shutting down."""
+
+
+@dataclass
+class RunProgress:
+    rules_total: int = 0
+    documents_processed: int = 0
+    pages_processed: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    _cancelled: threading.Event = field(default_factory=threading.Event, repr=False, compare=False)
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._cancelled.is_set():
+            raise RunCancelled(CANCELLED_RUN_ERROR)
+
+    def as_dict(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started_at
+        return {
+            "rules_total": self.rules_total,
+            "documents_processed": self.documents_processed,
+            "pages_processed": self.pages_processed,
+            "elapsed_seconds": round(elapsed, 3),
+            "documents_per_second": round(self.documents_processed / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+
+class RunQueue:
+    def __init__(self, workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="run-worker")
+        self._lock = threading.Lock()
+        self._progress: Dict[int, RunProgress] = {}
+        self._futures: Dict[int, Future] = {}
+
+    def submit(self, run_id: int, job: Callable[[RunProgress], Any]) -> Future:
+        progress = RunProgress()
+        with self._lock:
+            self._progress[run_id] = progress
+            future = self._executor.submit(job, progress)
+            self._futures[run_id] = future
+        future.add_done_callback(lambda _: self._forget(run_id))
+        return future
+
+    def progress(self, run_id: int) -> Optional[RunProgress]:
+        with self._lock:
+            return self._progress.get(run_id)
+
+    def wait(self, run_id: int, timeout: Optional[float] = None) -> None:
+        """Block until the run finishes; returns immediately for unknown or finished runs."""
+
+        with self._lock:
+            future = self._futures.get(run_id)
+        if future is not None:
+            try:
+                future.result(timeout=timeout)
+            except Exception:
+                # Failures are recorded on the Run row by the job itself.
+                pass
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Cancel queued runs and ask active ones to stop at their next page.
+
+        With ``wait`` this also blocks until the active runs have stopped.
+        """
+
+        with self._lock:
+            active = list(self._progress.values())
+        for progress in active:
+            progress.cancel()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _forget(self, run_id: int) -> None:
+        with self._lock:
+            self._progress.pop(run_id, None)
+            self._futures.pop(run_id, None)
+
+
+_queue: Optional[RunQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_run_queue() -> RunQueue:
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = RunQueue(get_settings().run_queue_workers)
+        return _queue
+
+
+def shutdown_run_queue(wait: bool = False) -> None:
+    global _queue
+    with _queue_lock:
+        queue, _queue = _queue, None
+    if queue is not None:
+        queue.shutdown(wait=wait)
+
+
+def fail_orphaned_runs(db: Session) -> int:
+    """Mark runs left ``queued`` or ``running`` by a previous process as failed; returns how many.
+
+    Only call this before the process has queued runs of its own.
+    """
+
+    count = (
+        db.query(Run)
+        .filter(Run.state.in_((RUN_QUEUED, RUN_RUNNING)))
+        .update(
+            {Run.state: RUN_FAILED, Run.error: ORPHANED_RUN_ERROR, Run.completed_at: datetime.now(timezone.utc)},
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return count
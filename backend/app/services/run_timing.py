@@ -0,0 +1,117 @@
+"""Per-phase and per-rule timing of evaluation runs.
+
+``EvaluationService`` records where a run spends its time into a
+``RunTiming`` and stores the breakdown on ``Run.timing``. Phases are:
+
+- ``rulepack``: loading the compiled rulepack (cached after the first run);
+- ``prepare``: creating and flushing the per-rule result rows;
+- ``pushdown``: counting translatable rules with an Elasticsearch aggregation;
+- ``fetch``: Elasticsearch page fetches, on the prefetch thread, so its wall
+  time overlaps evaluation; ``fetch_wait`` is the time evaluation sat idle
+  waiting for the next page;
+- ``evaluate``: evaluating pages of documents. It includes ``clauses``
+  (evaluating the rulepack's distinct clauses once per page) and the per-rule
+  work of combining clause results and building decisions, reported under
+  ``rules``;
+- ``write_traces``: inserting decision traces;
+- ``incremental``: carrying unchanged decisions over from a baseline run;
+- ``summarize`` and ``commit``: building rule summaries and the final commit.
+
+CPU time is that of the thread running the phase, and the run's total is
+that of the thread executing the run, so concurrent runs and requests are
+not counted. Work done in evaluation worker processes is not counted either,
+and per-rule timings are only available when pages are evaluated in-process.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sized, Tuple, TypeVar
+
+T = TypeVar("T", bound=Sized)
+
+
+@dataclass
+class PhaseTiming:
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    calls: int = 0
+    items: int = 0
+
+    def add(self, wall: float, cpu: float, items: int = 0) -> None:
+        self.wall_seconds += wall
+        self.cpu_seconds += cpu
+        self.calls += 1
+        self.items += items
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "calls": self.calls,
+            "items": self.items,
+            "items_per_second": round(self.items / self.wall_seconds, 2) if self.items and self.wall_seconds > 0 else None,
+        }
+
+
+class RunTiming:
+    def __init__(self) -> None:
+        self.phases: Dict[str, PhaseTiming] = {}
+        self.rules: Dict[Tuple[int, str], PhaseTiming] = {}
+        self.documents = 0
+        self.profile_path: Optional[str] = None
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._cpu_started = time.thread_time()
+
+    @contextmanager
+    def phase(self, name: str, items: int = 0) -> Iterator[None]:
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - wall, time.thread_time() - cpu, items)
+
+    def record(self, name: str, wall: float, cpu: float, items: int = 0) -> None:
+        with self._lock:
+            self.phases.setdefault(name, PhaseTiming()).add(wall, cpu, items)
+
+    def record_rule(self, rule_id: int, rule_no: str, wall: float, cpu: float, items: int = 0) -> None:
+        with self._lock:
+            self.rules.setdefault((rule_id, rule_no), PhaseTiming()).add(wall, cpu, items)
+
+    def timed(self, name: str, items: Iterator[T]) -> Iterator[T]:
+        """Yield from ``items``, recording the time spent producing each one (and its length) under ``name``."""
+
+        iterator = iter(items)
+        while True:
+            wall, cpu = time.perf_counter(), time.thread_time()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.record(name, time.perf_counter() - wall, time.thread_time() - cpu, len(item))
+            yield item
+
+    def as_dict(self) -> Dict[str, Any]:
+        wall = time.perf_counter() - self._started
+        with self._lock:
+            phases = {name: phase.as_dict() for name, phase in self.phases.items()}
+            rules: List[Dict[str, Any]] = [
+                {"rule_id": rule_id, "rule_no": rule_no, **timing.as_dict()}
+                for (rule_id, rule_no), timing in sorted(
+                    self.rules.items(), key=lambda item: item[1].wall_seconds, reverse=True
+                )
+            ]
+        return {
+            "wall_seconds": round(wall, 6),
+            "cpu_seconds": round(time.thread_time() - self._cpu_started, 6),
+            "documents": self.documents,
+            "documents_per_second": round(self.documents / wall, 2) if wall > 0 else 0.0,
+            "phases": phases,
+            "rules": rules,
+            "profile": self.profile_path,
+        }
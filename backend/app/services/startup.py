@@ -0,0 +1,83 @@
+"""Background startup work and the readiness it gates.
+
+The API starts accepting requests as soon as the database schema exists;
+seeding (importing the demo rulepack, registering datasets and loading
+documents into Elasticsearch) runs on a background thread. Liveness
+(``/api/health``) only says the process is serving, readiness
+(``/api/health/ready``) additionally waits for the startup work to finish.
+A failed seed is reported but does not keep the API unready, since demo data
+is optional.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+STARTUP_PENDING = "pending"
+STARTUP_RUNNING = "running"
+STARTUP_COMPLETED = "completed"
+STARTUP_FAILED = "failed"
+
+
+class StartupState:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self.status = STARTUP_PENDING
+        self.error: Optional[str] = None
+        self.seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def run_in_background(self, job: Callable[[], Any]) -> threading.Thread:
+        """Run ``job`` on a daemon thread, recording its outcome."""
+
+        with self._lock:
+            self.status = STARTUP_RUNNING
+            self.error = None
+            self.seconds = None
+            self._done.clear()
+        thread = threading.Thread(target=self._run, args=(job,), name="startup", daemon=True)
+        thread.start()
+        return thread
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"status": self.status, "error": self.error, "seconds": self.seconds}
+
+    def _run(self, job: Callable[[], Any]) -> None:
+        started = time.perf_counter()
+        try:
+            job()
+        except Exception as exc:
+            logger.exception("Startup work failed: %s", exc)
+            status, error = STARTUP_FAILED, str(exc)
+        else:
+            status, error = STARTUP_COMPLETED, None
+        with self._lock:
+            self.status = status
+            self.error = error
+            self.seconds = round(time.perf_counter() - started, 3)
+        self._done.set()
+
+
+_state: Optional[StartupState] = None
+_state_lock = threading.Lock()
+
+
+def get_startup_state() -> StartupState:
+    global _state
+    with _state_lock:
+        if _state is None:
+            _state = StartupState()
+        return _state
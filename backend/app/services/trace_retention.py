@@ -0,0 +1,109 @@
+"""Decision-trace retention policies.
+
+Counts are always exact; a policy only decides which per-record decisions are
+materialised and persisted. Counts come straight from each rule's outcomes;
+records that are not retained never have their clause results or decision
+payload built.
+"""
+
+from __future__ import annotations
+
+import random
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+RETAIN_ALL = "all"
+RETAIN_FAILURES = "failures"
+RETAIN_SAMPLE = "sample"
+RETAIN_NONE = "none"
+RETENTION_POLICIES = (RETAIN_ALL, RETAIN_FAILURES, RETAIN_SAMPLE, RETAIN_NONE)
+
+Decision = Dict[str, Any]
+
+
+def page_selector(policy: str, fail_label: str) -> Optional[Callable[[str], bool]]:
+    """Return a per-status keep predicate for the non-sampling policies, or ``None`` to keep everything."""
+
+    if policy == RETAIN_FAILURES:
+        return lambda status: status == fail_label
+    if policy == RETAIN_NONE:
+        return lambda status: False
+    return None
+
+
+class PageSampler:
+    """Reservoir-sample up to ``size`` decisions per status while a page is evaluated.
+
+    ``offer`` is called with each record's status before its decision is
+    built; only admitted records are materialised. ``collect`` then places the
+    admitted decisions, in evaluation order, into their reservoir slots.
+    """
+
+    def __init__(self, size: int, rng: random.Random):
+        self.size = size
+        self.rng = rng
+        self._seen: Counter = Counter()
+        self._pending: List[Tuple[str, int]] = []
+
+    def offer(self, status: str) -> bool:
+        self._seen[status] += 1
+        seen = self._seen[status]
+        if seen <= self.size:
+            slot = seen - 1
+        else:
+            slot = self.rng.randrange(seen)
+            if slot >= self.size:
+                return False
+        self._pending.append((status, slot))
+        return True
+
+    def collect(self, decisions: List[Decision]) -> List[Decision]:
+        reservoirs: Dict[str, List[Decision]] = defaultdict(list)
+        for (status, slot), decision in zip(self._pending, decisions):
+            reservoir = reservoirs[status]
+            if slot == len(reservoir):
+                reservoir.append(decision)
+            else:
+                reservoir[slot] = decision
+        return [decision for reservoir in reservoirs.values() for decision in reservoir]
+
+
+def merge_samples(
+    left: List[Decision], left_seen: int, right: List[Decision], right_seen: int, size: int, rng: random.Random
+) -> List[Decision]:
+    """Merge two uniform samples (drawn from populations of ``*_seen`` records) into one of ``size``."""
+
+    left, right = list(left), list(right)
+    merged: List[Decision] = []
+    while len(merged) < size and (left or right):
+        take_left = rng.randrange(left_seen + right_seen) < left_seen
+        source = left if take_left else right
+        merged.append(source.pop(rng.randrange(len(source))))
+        if take_left:
+            left_seen -= 1
+        else:
+            right_seen -= 1
+    return merged
+
+
+class SampleAccumulator:
+    """Combine per-page (or per-shard) samples of one rule into a run-wide sample per status."""
+
+    def __init__(self, size: int, rng: random.Random):
+        self.size = size
+        self.rng = rng
+        self._samples: Dict[str, List[Decision]] = defaultdict(list)
+        self._seen: Counter = Counter()
+
+    def merge(self, decisions: List[Decision], counter: Counter) -> None:
+        by_status: Dict[str, List[Decision]] = defaultdict(list)
+        for decision in decisions:
+            by_status[decision["status"]].append(decision)
+        for status, seen in counter.items():
+            self._samples[status] = merge_samples(
+                self._samples[status], self._seen[status], by_status.get(status, []), seen, self.size, self.rng
+            )
+            self._seen[status] += seen
+
+    def decisions(self) -> List[Decision]:
+        return [decision for sample in self._samples.values() for decision in sample]
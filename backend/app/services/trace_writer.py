@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.metrics import TRACES_WRITTEN
+from app.models.run import DecisionTrace
+
+
+class DecisionTraceWriter:
+    """Buffer decision trace rows and write them with Core ``INSERT`` executemany batches.
+
+    Rows bypass the ORM unit of work entirely: no ``DecisionTrace`` instances
+    are created and nothing is kept in the session identity map, so memory use
+    is bounded by ``batch_size`` regardless of how many traces a run produces.
+    Rows are written inside the session's transaction and become visible with
+    the caller's commit.
+    """
+
+    def __init__(self, db: Session, batch_size: int = 1000):
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        self.db = db
+        self.batch_size = batch_size
+        self.written = 0
+        self._pending: List[Dict[str, Any]] = []
+
+    def add(self, rule_result_id: int, decision: Dict[str, Any]) -> None:
+        self._pending.append(
+            {
+                "rule_result_id": rule_result_id,
+                "record_id": decision["record_id"],
+                "status": decision["status"],
+                "inputs": decision["inputs"],
+                "clauses": decision["clauses"],
+                "extras": decision["extras"],
+            }
+        )
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        self.db.execute(insert(DecisionTrace.__table__), self._pending)
+        self.written += len(self._pending)
+        TRACES_WRITTEN.inc(len(self._pending))
+        self._pending = []
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from app.utils.conditions import ClausePool, CompiledClause, CompiledRule
+from app.utils.field_paths import AllValues, AnyValues, compile_field_path
+
+# Comparison operators that map onto NumPy ufuncs. Everything else in
+# ``_OPERATORS`` (contains, exists, ...) is evaluated element-wise through the
+# clause's compiled predicate, which keeps the semantics identical to the
+# row-by-row engine.
+_UFUNCS: Dict[str, Callable[..., np.ndarray]] = {
+    "==": np.equal,
+    "=": np.equal,
+    "!=": np.not_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+}
+
+# Integers beyond this magnitude lose precision as float64.
+_MAX_EXACT_INT = 2**53
+
+
+def _is_exact_number(value: Any) -> bool:
+    if isinstance(value, float):
+        return True
+    if isinstance(value, int):
+        return -_MAX_EXACT_INT <= value <= _MAX_EXACT_INT
+    return False
+
+
+def _is_scalar(value: Any) -> bool:
+    # NumPy broadcasts sequences against the column instead of comparing each
+    # element with the whole sequence, as the row engine does.
+    return not isinstance(value, (list, tuple, set, frozenset, dict, np.ndarray))
+
+
+class ColumnarBatch:
+    """Column-oriented view over a list of documents.
+
+    Columns are extracted lazily, once per field, and shared by every clause
+    that references the field, so a rulepack touching the same field from many
+    rules only walks the documents once for it.
+    """
+
+    def __init__(self, documents: Sequence[Dict[str, Any]]):
+        self.documents = documents
+        self._columns: Dict[str, np.ndarray] = {}
+        self._numeric: Dict[str, Optional[Tuple[np.ndarray, np.ndarray]]] = {}
+        self._multi_valued: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def column(self, compiled: CompiledClause) -> np.ndarray:
+        field = compiled.clause.field
+        column = self._columns.get(field)
+        if column is None:
+            column = np.empty(len(self.documents), dtype=object)
+            column[:] = [compiled.accessor(doc) for doc in self.documents]
+            self._columns[field] = column
+            if compile_field_path(field).multi_valued and any(isinstance(value, (AnyValues, AllValues)) for value in column):
+                self._multi_valued.add(field)
+        return column
+
+    def multi_valued(self, compiled: CompiledClause) -> bool:
+        """Whether some document holds several values for the clause's field (see ``app.utils.field_paths``)."""
+
+        self.column(compiled)
+        return compiled.clause.field in self._multi_valued
+
+    def numeric(self, compiled: CompiledClause) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Return ``(values, missing)`` as float64/bool arrays, or ``None`` if the column is not numeric."""
+
+        field = compiled.clause.field
+        if field not in self._numeric:
+            column = self.column(compiled)
+            missing = np.fromiter((value is None for value in column), dtype=bool, count=len(column))
+            present = column[~missing]
+            if all(_is_exact_number(value) for value in present):
+                values = np.full(len(column), np.nan)
+                values[~missing] = present.astype(np.float64)
+                self._numeric[field] = (values, missing)
+            else:
+                self._numeric[field] = None
+        return self._numeric[field]
+
+
+def clause_mask(batch: ColumnarBatch, compiled: CompiledClause) -> np.ndarray:
+    """Evaluate one clause over every document in ``batch`` as a boolean mask."""
+
+    ufunc = _UFUNCS.get(compiled.clause.operator.lower())
+    expected = compiled.clause.value
+    if ufunc is not None and _is_scalar(expected) and not batch.multi_valued(compiled):
+        if _is_exact_number(expected):
+            numeric = batch.numeric(compiled)
+            if numeric is not None:
+                values, missing = numeric
+                with np.errstate(invalid="ignore"):
+                    mask = ufunc(values, expected)
+                if missing.any():
+                    mask[missing] = bool(compiled.predicate(None))
+                return mask
+        try:
+            return np.asarray(ufunc(batch.column(compiled), expected), dtype=bool)
+        except Exception:
+            # Mixed or incomparable types: fall through to the per-element
+            # predicate, which maps comparison errors to ``False``.
+            pass
+    column = batch.column(compiled)
+    predicate = compiled.predicate
+    return np.fromiter((bool(predicate(value)) for value in column), dtype=bool, count=len(column))
+
+
+def combine_masks(masks: List[np.ndarray], connectors: Sequence[str], size: int) -> np.ndarray:
+    """Chain clause masks left to right, mirroring ``evaluate_boolean_chain``."""
+
+    if not masks:
+        return np.ones(size, dtype=bool)
+    result = masks[0].copy()
+    for connector, mask in zip(connectors, masks[1:]):
+        if connector == "AND":
+            result &= mask
+        else:
+            result |= mask
+    return result
+
+
+def evaluate_pool_masks(batch: ColumnarBatch, pool: ClausePool) -> List[np.ndarray]:
+    """Evaluate each distinct clause in ``pool`` once over ``batch``, indexed by slot."""
+
+    return [clause_mask(batch, clause) for clause in pool.clauses]
+
+
+def evaluate_rule_masks(
+    batch: ColumnarBatch,
+    compiled: CompiledRule,
+    pool_masks: Optional[List[np.ndarray]] = None,
+) -> Tuple[List[np.ndarray], np.ndarray]:
+    """Return the per-clause masks and the combined rule outcome for ``batch``.
+
+    When ``pool_masks`` from ``evaluate_pool_masks`` are given, clause masks are
+    looked up by slot instead of being recomputed.
+    """
+
+    if pool_masks is not None:
+        masks = [pool_masks[clause.slot] for clause in compiled.clauses]
+    else:
+        masks = [clause_mask(batch, clause) for clause in compiled.clauses]
+    return masks, combine_masks(masks, compiled.connectors, len(batch))
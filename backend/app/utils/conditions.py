@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import json
 import operator
 import re
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from app.schemas.common import ConditionClause
+from app.utils.field_paths import FieldPathError, compile_field_path, match_values
 
 
 def _value_is_present(value: Any) -> bool:
@@ -32,11 +34,11 @@ _OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
 }
 
 _CONDITION_PATTERN = re.compile(
-    r"^\s*(?P<field>[\w.\s]+?)\s*(?P<operator>>=|<=|!=|==|=|>|<|contains)\s*(?P<value>.+?)\s*$",
+    r"^\s*(?P<field>[\w.\s\[\]]+?)\s*(?P<operator>>=|<=|!=|==|=|>|<|contains)\s*(?P<value>.+?)\s*$",
     re.IGNORECASE,
 )
 
-_SIMPLE_FIELD_PATTERN = re.compile(r"^\s*(?P<field>[\w.\s\-]+?)\s*$")
+_SIMPLE_FIELD_PATTERN = re.compile(r"^\s*(?P<field>[\w.\s\-\[\]]+?)\s*$")
 
 _CONNECTOR_PATTERN = re.compile(r"\b(AND|OR)\b", re.IGNORECASE)
 
@@ -58,6 +60,11 @@ def parse_conditions(raw_value: str) -> List[ConditionClause]:
     clauses: List[ConditionClause] = []
     for segment, connector in _split_into_segments(raw_value):
         clause = _parse_segment(segment, connector)
+        # Reject malformed paths on import rather than when a run evaluates them.
+        try:
+            compile_field_path(clause.field)
+        except FieldPathError as exc:
+            raise ConditionParserError(str(exc)) from exc
         clauses.append(clause)
     return clauses
 
@@ -142,32 +149,143 @@ def _normalize_value(value_str: str) -> Any:
 
 
 def evaluate_conditions(clauses: List[ConditionClause], inputs: Dict[str, Any]) -> List[EvaluatedClause]:
-    evaluated: List[EvaluatedClause] = []
-    for clause in clauses:
-        value = _extract_input_value(inputs, clause.field)
+    return compile_clauses(clauses).evaluate(inputs)
+
+
+@dataclass(frozen=True)
+class CompiledClause:
+    """A clause with its operator, field accessor and constant resolved up front."""
+
+    clause: ConditionClause
+    accessor: Callable[[Dict[str, Any]], Any]
+    predicate: Callable[[Any], bool]
+    slot: int = 0
+
+    def evaluate(self, inputs: Dict[str, Any]) -> bool:
+        return self.predicate(self.accessor(inputs))
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """Prebuilt predicates for a rule's clauses plus the connectors that chain them."""
+
+    clauses: Tuple[CompiledClause, ...]
+    connectors: Tuple[str, ...]
+
+    def evaluate(self, inputs: Dict[str, Any]) -> List[EvaluatedClause]:
+        return [EvaluatedClause(clause=compiled.clause, result=compiled.evaluate(inputs)) for compiled in self.clauses]
+
+    def select(self, results: Sequence[bool]) -> List[EvaluatedClause]:
+        """Build evaluated clauses from a ``ClausePool.evaluate`` result row."""
+
+        return [EvaluatedClause(clause=compiled.clause, result=results[compiled.slot]) for compiled in self.clauses]
+
+    def matches_results(self, results: Sequence[bool]) -> bool:
+        """``matches`` over a ``ClausePool.evaluate`` result row, without building evaluated clauses."""
+
+        if not self.clauses:
+            return True
+        result = results[self.clauses[0].slot]
+        for connector, compiled in zip(self.connectors, self.clauses[1:]):
+            if connector == "AND":
+                result = result and results[compiled.slot]
+            else:
+                result = result or results[compiled.slot]
+        return result
+
+    def matches(self, evaluated: List[EvaluatedClause]) -> bool:
+        if not evaluated:
+            return True
+        result = evaluated[0].result
+        for connector, clause in zip(self.connectors, evaluated[1:]):
+            if connector == "AND":
+                result = result and clause.result
+            else:
+                result = result or clause.result
+        return result
+
+
+class ClausePool:
+    """Hash-conses identical clauses so each distinct one is evaluated once per document.
+
+    Clauses are identical when they read the same field with the same operator
+    function and constant; connectors are not part of the identity because they
+    belong to the rule's chain, not to the clause predicate.
+    """
+
+    def __init__(self) -> None:
+        self.clauses: List[CompiledClause] = []
+        self._slots: Dict[Tuple[str, Callable[[Any, Any], bool], str, str], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.clauses)
+
+    def intern(self, clause: ConditionClause) -> CompiledClause:
         op = _OPERATORS.get(clause.operator.lower())
         if not op:
             raise ConditionParserError(f"Unsupported operator: {clause.operator}")
+        key = (clause.field, op, type(clause.value).__name__, json.dumps(clause.value, sort_keys=True, default=str))
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self.clauses)
+            self._slots[key] = slot
+            self.clauses.append(_compile_predicate(clause, op, slot))
+        shared = self.clauses[slot]
+        return CompiledClause(clause=clause, accessor=shared.accessor, predicate=shared.predicate, slot=slot)
+
+    def evaluate(self, inputs: Dict[str, Any]) -> List[bool]:
+        """Evaluate every distinct clause against ``inputs``, indexed by slot."""
+
+        return [compiled.predicate(compiled.accessor(inputs)) for compiled in self.clauses]
+
+
+def compile_clause(clause: ConditionClause) -> CompiledClause:
+    op = _OPERATORS.get(clause.operator.lower())
+    if not op:
+        raise ConditionParserError(f"Unsupported operator: {clause.operator}")
+    return _compile_predicate(clause, op, 0)
+
+
+def _compile_predicate(clause: ConditionClause, op: Callable[[Any, Any], bool], slot: int) -> CompiledClause:
+    expected = clause.value
+    try:
+        path = compile_field_path(clause.field)
+    except FieldPathError as exc:
+        raise ConditionParserError(str(exc)) from exc
+
+    def predicate(value: Any) -> bool:
         try:
-            result = op(value, clause.value)
+            return op(value, expected)
         except Exception:
-            result = False
-        evaluated.append(EvaluatedClause(clause=clause, result=result))
-    return evaluated
-
-
-def _extract_input_value(inputs: Dict[str, Any], field: str) -> Any:
-    if field in inputs:
-        return inputs[field]
-    if "." in field:
-        current = inputs
-        for part in field.split("."):
-            if isinstance(current, dict) and part in current:
-                current = current[part]
-            else:
-                return None
-        return current
-    return inputs.get(field)
+            return False
+
+    if path.multi_valued:
+        single = predicate
+
+        def predicate(value: Any) -> bool:  # noqa: F811 - wraps the single-value predicate
+            return match_values(single, value)
+
+    return CompiledClause(clause=clause, accessor=path.get, predicate=predicate, slot=slot)
+
+
+def compile_clauses(
+    clauses: Iterable[ConditionClause | Dict[str, Any]],
+    pool: Optional[ClausePool] = None,
+) -> CompiledRule:
+    """Compile raw clause dicts or ``ConditionClause`` models into a ``CompiledRule``.
+
+    Connectors are validated here so the per-document chain never has to. Pass
+    a shared ``pool`` to compile several rules against one set of distinct
+    clauses; otherwise the rule gets a private pool.
+    """
+
+    pool = pool if pool is not None else ClausePool()
+    models = [clause if isinstance(clause, ConditionClause) else ConditionClause(**clause) for clause in clauses]
+    connectors = tuple(clause.connector or "AND" for clause in models[:-1])
+    for connector in connectors:
+        if connector not in {"AND", "OR"}:
+            raise ConditionParserError(f"Unsupported connector: {connector}")
+    return CompiledRule(clauses=tuple(pool.intern(clause) for clause in models), connectors=connectors)
 
 
 def evaluate_boolean_chain(evaluated: List[EvaluatedClause]) -> bool:
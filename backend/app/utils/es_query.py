@@ -0,0 +1,156 @@
+"""Translate rule conditions into Elasticsearch queries.
+
+Only clauses whose Elasticsearch semantics match the in-process operators in
+``app.utils.conditions`` are translated; anything else makes the whole rule
+untranslatable so callers can fall back to evaluating documents in Python.
+Translation relies on the index mapping to pick exact-match fields.
+
+Elasticsearch matches a query on an array when any element matches, while the
+in-process operators compare the array as a whole. So ``!=`` and negated
+``exists``, whose results differ on arrays, are never translated, nor are
+nested and array paths, which can cross arrays of objects. Flat fields may
+still hold arrays in some documents; ``array_probes`` lets callers detect that
+in the same request and evaluate those rules in-process instead.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.schemas.common import ConditionClause
+from app.utils.field_paths import compile_field_path
+
+NUMERIC_TYPES = {
+    "long",
+    "integer",
+    "short",
+    "byte",
+    "double",
+    "float",
+    "half_float",
+    "scaled_float",
+    "unsigned_long",
+}
+
+_RANGE_OPERATORS = {">": "gt", ">=": "gte", "<": "lt", "<=": "lte"}
+
+ARRAY_PROBE_SCRIPT = "def value = params._source[params.field]; emit(value instanceof List);"
+
+
+def flatten_mapping(mapping_response: Dict[str, Any]) -> Dict[str, str]:
+    """Return ``{dotted_field: type}`` for every index in a ``get_mapping`` response.
+
+    Fields mapped with conflicting types across indices are dropped so they are
+    never translated.
+    """
+
+    field_types: Dict[str, str] = {}
+    conflicts = set()
+    for index_mapping in mapping_response.values():
+        properties = index_mapping.get("mappings", {}).get("properties", {})
+        for field, field_type in _walk_properties(properties, ""):
+            if field in field_types and field_types[field] != field_type:
+                conflicts.add(field)
+            field_types[field] = field_type
+    for field in conflicts:
+        field_types.pop(field, None)
+    return field_types
+
+
+def _walk_properties(properties: Dict[str, Any], prefix: str):
+    for name, definition in properties.items():
+        path = f"{prefix}{name}"
+        if "properties" in definition:
+            yield from _walk_properties(definition["properties"], f"{path}.")
+            continue
+        yield path, definition.get("type", "object")
+        for sub_name, sub_definition in definition.get("fields", {}).items():
+            yield f"{path}.{sub_name}", sub_definition.get("type", "object")
+
+
+def translate_clause(clause: ConditionClause, field_types: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    operator_symbol = clause.operator.lower()
+    value = clause.value
+    field_type = field_types.get(clause.field)
+    if field_type is None or compile_field_path(clause.field).multi_valued:
+        return None
+
+    if operator_symbol in {"=", "=="}:
+        target = _exact_field(clause.field, value, field_types)
+        if target is None:
+            return None
+        return {"term": {target: value}}
+
+    if operator_symbol in _RANGE_OPERATORS:
+        if field_type not in NUMERIC_TYPES or not _is_number(value):
+            return None
+        return {"range": {clause.field: {_RANGE_OPERATORS[operator_symbol]: value}}}
+
+    if operator_symbol == "exists":
+        # Blank strings and empty containers count as "missing" in Python but
+        # exist for Elasticsearch, so only non-string scalar fields translate.
+        if field_type not in NUMERIC_TYPES | {"boolean", "date"}:
+            return None
+        return {"exists": {"field": clause.field}} if value else None
+
+    return None
+
+
+def translate_clauses(clauses: Sequence[ConditionClause], field_types: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """Build a bool query equivalent to the clauses' left-to-right AND/OR chain."""
+
+    if not clauses:
+        return {"match_all": {}}
+    translated: List[Dict[str, Any]] = []
+    for clause in clauses:
+        query = translate_clause(clause, field_types)
+        if query is None:
+            return None
+        translated.append(query)
+    result = translated[0]
+    for previous, query in zip(clauses, translated[1:]):
+        connector = previous.connector or "AND"
+        if connector == "AND":
+            result = {"bool": {"filter": [result, query]}}
+        elif connector == "OR":
+            result = {"bool": {"should": [result, query], "minimum_should_match": 1}}
+        else:
+            return None
+    return result
+
+
+def array_probes(fields: Sequence[str]) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """Runtime mappings and per-field filters matching documents whose ``_source`` holds an array for a field.
+
+    Use the mappings as the search's ``runtime_mappings`` and the filters in a
+    ``filters`` aggregation; a non-zero bucket means the field holds an array.
+    """
+
+    runtime_mappings: Dict[str, Any] = {}
+    filters: Dict[str, Dict[str, Any]] = {}
+    for index, field in enumerate(fields):
+        name = f"ruletrail_array_{index}"
+        runtime_mappings[name] = {
+            "type": "boolean",
+            "script": {"source": ARRAY_PROBE_SCRIPT, "params": {"field": field}},
+        }
+        filters[field] = {"term": {name: True}}
+    return runtime_mappings, filters
+
+
+def _exact_field(field: str, value: Any, field_types: Dict[str, str]) -> Optional[str]:
+    field_type = field_types.get(field)
+    if isinstance(value, bool):
+        return field if field_type == "boolean" else None
+    if _is_number(value):
+        return field if field_type in NUMERIC_TYPES else None
+    if isinstance(value, str):
+        if field_type in {"keyword", "constant_keyword"}:
+            return field
+        if field_types.get(f"{field}.keyword") == "keyword":
+            return f"{field}.keyword"
+    return None
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
@@ -0,0 +1,170 @@
+"""Field paths compiled once into document accessors.
+
+A clause field is one of:
+
+* a flat key (``amount``), read with ``dict.get``. A field with an empty
+  dot segment (``Ref. No.``) cannot be a path, so it is always a flat key;
+* a nested path (``employee.grade``). A key that literally contains the dots
+  wins over the nested lookup, so already-flattened documents keep working.
+  When the walk meets a list, the rest of the path is applied to every
+  element, like Elasticsearch does for arrays of objects, and the collected
+  values are matched with *any* semantics;
+* an array path with an explicit quantifier on a segment: ``items[].price``
+  or ``items[any].price`` match when any element matches, ``items[all].price``
+  only when every element does. A non-list value at that segment counts as a
+  single element.
+
+Multi-valued lookups return ``AnyValues`` / ``AllValues`` tuples; an empty
+one is matched as a missing value. Both serialise as JSON arrays.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+FLAT = "flat"
+NESTED = "nested"
+ARRAY = "array"
+
+_SEGMENT_PATTERN = re.compile(r"^(?P<key>[^\[\]]+)(?:\[(?P<quantifier>any|all)?\])?$")
+_QUANTIFIER_PATTERN = re.compile(r"\[(?:any|all)?\]")
+
+
+class FieldPathError(ValueError):
+    pass
+
+
+class AnyValues(tuple):
+    """Values collected from an array path; a clause holds if it holds for any of them."""
+
+
+class AllValues(tuple):
+    """Values collected from an array path; a clause holds only if it holds for all of them."""
+
+
+class FieldPath:
+    """A parsed field with a specialised ``get(document)`` accessor."""
+
+    __slots__ = ("field", "kind", "get")
+
+    def __init__(self, field: str):
+        self.field = field
+        if ("." not in field and "[" not in field) or "" in field.split("."):
+            self.kind = FLAT
+            self.get: Callable[[Dict[str, Any]], Any] = lambda document: document.get(field)
+            return
+        parts, quantifier = _parse(field)
+        if quantifier is None:
+            self.kind = NESTED
+            self.get = _nested_getter(field, parts)
+        else:
+            self.kind = ARRAY
+            self.get = _array_getter(parts, AllValues if quantifier == "all" else AnyValues)
+
+    @property
+    def multi_valued(self) -> bool:
+        """Whether ``get`` can return ``AnyValues``/``AllValues``."""
+
+        return self.kind != FLAT
+
+
+@lru_cache(maxsize=4096)
+def compile_field_path(field: str) -> FieldPath:
+    return FieldPath(field)
+
+
+@lru_cache(maxsize=1024)
+def compile_projection(fields: Tuple[str, ...]) -> Tuple[Tuple[str, Callable[[Dict[str, Any]], Any]], ...]:
+    """Accessors for projecting ``fields`` out of a document, e.g. a decision's ``inputs``."""
+
+    return tuple((field, compile_field_path(field).get) for field in fields)
+
+
+def source_path(field: str) -> str:
+    """The ``_source`` include pattern that covers ``field``: the path without quantifiers."""
+
+    return _QUANTIFIER_PATTERN.sub("", field)
+
+
+def match_values(predicate: Callable[[Any], bool], value: Any) -> bool:
+    """Apply ``predicate`` to a possibly multi-valued lookup result."""
+
+    if isinstance(value, tuple) and type(value) in (AnyValues, AllValues):
+        if not value:
+            return predicate(None)
+        if type(value) is AllValues:
+            return all(predicate(item) for item in value)
+        return any(predicate(item) for item in value)
+    return predicate(value)
+
+
+def _parse(field: str) -> Tuple[Tuple[Tuple[str, bool], ...], Optional[str]]:
+    """Split ``field`` into ``(key, expands)`` segments and its quantifier."""
+
+    parts: List[Tuple[str, bool]] = []
+    explicit = set()
+    for segment in field.split("."):
+        match = _SEGMENT_PATTERN.match(segment)
+        if match is None:
+            raise FieldPathError(f"Invalid field path: {field}")
+        if match.group("quantifier"):
+            explicit.add(match.group("quantifier"))
+        parts.append((match.group("key"), segment.endswith("]")))
+    if len(explicit) > 1:
+        raise FieldPathError(f"Field path mixes 'any' and 'all' quantifiers: {field}")
+    quantifier = explicit.pop() if explicit else ("any" if any(expands for _, expands in parts) else None)
+    return tuple(parts), quantifier
+
+
+def _collect(current: Any, parts: Tuple[Tuple[str, bool], ...], index: int, out: List[Any]) -> None:
+    """Walk ``parts[index:]`` from ``current``, fanning out over lists, and append the leaf values to ``out``."""
+
+    for position in range(index, len(parts)):
+        if isinstance(current, list):
+            for item in current:
+                _collect(item, parts, position, out)
+            return
+        key, expands = parts[position]
+        if not isinstance(current, dict) or key not in current:
+            return
+        current = current[key]
+        if expands and not isinstance(current, list):
+            current = [current]
+    if isinstance(current, list) and parts[-1][1]:
+        out.extend(current)
+    else:
+        out.append(current)
+
+
+def _nested_getter(field: str, parts: Tuple[Tuple[str, bool], ...]) -> Callable[[Dict[str, Any]], Any]:
+    keys = tuple(key for key, _ in parts)
+
+    def get(document: Dict[str, Any]) -> Any:
+        if field in document:
+            return document[field]
+        current: Any = document
+        for position, key in enumerate(keys):
+            if isinstance(current, dict):
+                if key not in current:
+                    return None
+                current = current[key]
+            elif isinstance(current, list):
+                values: List[Any] = []
+                _collect(current, parts, position, values)
+                return AnyValues(values)
+            else:
+                return None
+        return current
+
+    return get
+
+
+def _array_getter(parts: Tuple[Tuple[str, bool], ...], kind: type) -> Callable[[Dict[str, Any]], Any]:
+    def get(document: Dict[str, Any]) -> Any:
+        values: List[Any] = []
+        _collect(document, parts, 0, values)
+        return kind(values)
+
+    return get
@@ -0,0 +1,55 @@
+"""Render decision rationales from stored clause results.
+
+Rationales are not persisted with decision traces; they are derived on read
+from the trace's status, its evaluated clauses and the recorded inputs, which
+include every field referenced by the rule's conditions.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from app.schemas.common import ConditionClause
+from app.utils.conditions import EvaluatedClause, evaluate_boolean_chain
+
+
+def render_rationale(
+    status: str,
+    clauses: List[Dict[str, Any]],
+    inputs: Dict[str, Any],
+    rule_logic_business: Optional[str] = None,
+) -> str:
+    if not clauses:
+        return rule_logic_business or "Rule evaluated without explicit clauses."
+    evaluated = [
+        EvaluatedClause(
+            clause=ConditionClause(
+                field=clause["field"],
+                operator=clause["operator"],
+                value=clause.get("value"),
+                connector=clause.get("connector"),
+            ),
+            result=bool(clause.get("result")),
+        )
+        for clause in clauses
+    ]
+    boolean_result = evaluate_boolean_chain(evaluated)
+    if boolean_result:
+        clause = next((ec for ec in evaluated if ec.result), None)
+        if clause:
+            value = inputs.get(clause.clause.field)
+            return (
+                f"Because {clause.clause.field} value {value} satisfied {clause.clause.operator} {clause.clause.value}, "
+                f"the rule triggered and marked the record as {status}."
+            )
+    else:
+        clause = next((ec for ec in evaluated if not ec.result), None)
+        if clause:
+            value = inputs.get(clause.clause.field)
+            return (
+                f"Clause {clause.clause.field} value {value} did not satisfy {clause.clause.operator} {clause.clause.value}, "
+                f"so the record is considered {status}."
+            )
+    clause = evaluated[0]
+    value = inputs.get(clause.clause.field)
+    return f"{clause.clause.field} with value {value} maintained rule outcome {status}."
@@ -1,13 +1,64 @@
+"""Bulk loading of seed documents into Elasticsearch.
+
+Seed files are either JSON objects mapping index names to arrays of
+documents (``{"hr_records": [{...}, ...]}``) or NDJSON with one document per
+line naming its index in ``_index``. ``.gz`` files are decompressed on the
+fly. Input is parsed incrementally, so files larger than memory can be
+loaded, and documents are sent through the bulk API in chunks of
+``chunk_size``, optionally from ``concurrency`` parallel senders. Index
+refresh is disabled while an index is loading and restored afterwards. A
+document's ``id`` field becomes its ``_id``, so reloading a file is
+idempotent.
+"""
+
 from __future__ import annotations
 
+import gzip
 import json
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    from elasticsearch import Elasticsearch
+
+DEFAULT_CHUNK_SIZE = 1000
+_READ_SIZE = 64 * 1024
+_WHITESPACE = re.compile(r"\s*")
+_DECODER = json.JSONDecoder()
+
+
+class SeedError(RuntimeError):
+    """Raised when the bulk API rejects seed documents."""
 
-from elasticsearch import Elasticsearch
+    def __init__(self, message: str, errors: List[Dict[str, Any]]):
+        self.errors = errors
+        super().__init__(message)
 
 
-def seed_elasticsearch(es: Elasticsearch, seed_file: Path) -> int:
+@dataclass
+class SeedStats:
+    indexed: int = 0
+    seconds: float = 0.0
+    indices: Set[str] = field(default_factory=set)
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.indexed / self.seconds if self.seconds > 0 else 0.0
+
+
+def seed_elasticsearch(
+    es: Elasticsearch,
+    seed_file: Path,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    concurrency: int = 1,
+    default_index: Optional[str] = None,
+) -> int:
     """Populate Elasticsearch with demo documents.
 
     Returns the number of documents indexed so callers can surface
@@ -16,14 +67,218 @@ def seed_elasticsearch(es: Elasticsearch, seed_file: Path) -> int:
     data is optional.
     """
 
+    stats = bulk_seed(es, seed_file, chunk_size=chunk_size, concurrency=concurrency, default_index=default_index)
+    return stats.indexed
+
+
+def bulk_seed(
+    es: Elasticsearch,
+    seed_file: Path,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    concurrency: int = 1,
+    default_index: Optional[str] = None,
+) -> SeedStats:
+    """Stream ``seed_file`` into Elasticsearch and return what was loaded and how fast."""
+
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    if concurrency <= 0:
+        raise ValueError("concurrency must be positive")
+    stats = SeedStats()
     if not seed_file.exists():
-        return 0
-    data: Dict[str, Any] = json.loads(seed_file.read_text())
-    indexed = 0
-    for index_name, documents in data.items():
-        es.indices.create(index=index_name, ignore=400)
-        for doc in documents:
-            doc_id = doc.get("id")
-            es.index(index=index_name, id=doc_id, document=doc)
-            indexed += 1
-    return indexed
+        return stats
+    started = time.perf_counter()
+    refresh_intervals: Dict[str, Any] = {}
+    try:
+        with _open_seed(seed_file) as handle:
+            if _is_ndjson(seed_file):
+                documents = iter_ndjson_documents(handle, default_index)
+            else:
+                documents = iter_json_documents(handle)
+            chunks = _chunks(documents, chunk_size)
+            prepared = (_prepare_chunk(es, chunk, refresh_intervals) for chunk in chunks)
+            for indexed in _send_chunks(es, prepared, concurrency):
+                stats.indexed += indexed
+    finally:
+        _restore_refresh(es, refresh_intervals)
+    stats.indices = set(refresh_intervals)
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def iter_json_documents(handle: IO[str]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ``(index, document)`` pairs from a ``{index: [documents]}`` JSON object without loading it whole."""
+
+    stream = _JsonStream(handle)
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        index = stream.value()
+        if not isinstance(index, str):
+            raise ValueError("Seed file keys must be index names")
+        stream.expect(":")
+        stream.expect("[")
+        if stream.peek() == "]":
+            stream.advance()
+        else:
+            while True:
+                document = stream.value()
+                if not isinstance(document, dict):
+                    raise ValueError(f"Seed documents for index '{index}' must be JSON objects")
+                yield index, document
+                if stream.expect(",]") == "]":
+                    break
+        if stream.expect(",}") == "}":
+            return
+
+
+def iter_ndjson_documents(handle: IO[str], default_index: Optional[str] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ``(index, document)`` pairs from NDJSON; each line names its index in ``_index`` unless a default is given."""
+
+    for line_number, line in enumerate(handle, start=1):
+        if not line.strip():
+            continue
+        document = json.loads(line)
+        if not isinstance(document, dict):
+            raise ValueError(f"Line {line_number} of the seed file is not a JSON object")
+        index = document.pop("_index", None) or default_index
+        if not index:
+            raise ValueError(f"Line {line_number} of the seed file has no '_index' and no default index was given")
+        yield index, document
+
+
+class _JsonStream:
+    """Incremental reader that decodes one JSON value at a time from a text stream."""
+
+    def __init__(self, handle: IO[str]):
+        self.handle = handle
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.handle.read(_READ_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position :] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.position = _WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                raise ValueError("Unexpected end of seed file")
+
+    def advance(self) -> None:
+        self.position += 1
+
+    def expect(self, allowed: str) -> str:
+        char = self.peek()
+        if char not in allowed:
+            raise ValueError(f"Malformed seed file: expected one of {allowed!r}, found {char!r}")
+        self.advance()
+        return char
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number or literal at the very end of the buffer may continue in the next read.
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.position = end
+            return value
+
+
+def _open_seed(seed_file: Path) -> IO[str]:
+    if seed_file.suffix == ".gz":
+        return gzip.open(seed_file, "rt", encoding="utf-8")
+    return seed_file.open("r", encoding="utf-8")
+
+
+def _is_ndjson(seed_file: Path) -> bool:
+    suffixes = seed_file.suffixes[:-1] if seed_file.suffix == ".gz" else seed_file.suffixes
+    return bool(suffixes) and suffixes[-1] in {".ndjson", ".jsonl"}
+
+
+def _chunks(
+    documents: Iterable[Tuple[str, Dict[str, Any]]], chunk_size: int
+) -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+    iterator = iter(documents)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _prepare_chunk(
+    es: Elasticsearch, chunk: List[Tuple[str, Dict[str, Any]]], refresh_intervals: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Create and pause refresh on indices seen for the first time, and build the chunk's bulk operations."""
+
+    operations: List[Dict[str, Any]] = []
+    for index, document in chunk:
+        if index not in refresh_intervals:
+            es.indices.create(index=index, ignore=400)
+            settings = es.indices.get_settings(index=index).get(index, {}).get("settings", {}).get("index", {})
+            refresh_intervals[index] = settings.get("refresh_interval")
+            es.indices.put_settings(index=index, settings={"index": {"refresh_interval": "-1"}})
+        action: Dict[str, Any] = {"_index": index}
+        if document.get("id") is not None:
+            action["_id"] = document["id"]
+        operations.append({"index": action})
+        operations.append(document)
+    return operations
+
+
+def _bulk(es: Elasticsearch, operations: List[Dict[str, Any]]) -> int:
+    response = es.bulk(operations=operations)
+    items = response.get("items", [])
+    if response.get("errors"):
+        errors = [item["index"] for item in items if item.get("index", {}).get("error")]
+        reason = errors[0]["error"] if errors else "unknown error"
+        raise SeedError(f"Elasticsearch rejected {len(errors)} seed documents: {reason}", errors)
+    return len(items)
+
+
+def _send_chunks(es: Elasticsearch, chunks: Iterator[List[Dict[str, Any]]], concurrency: int) -> Iterator[int]:
+    """Bulk-index ``chunks`` with up to ``concurrency`` requests in flight, yielding documents indexed per chunk."""
+
+    if concurrency == 1:
+        for operations in chunks:
+            yield _bulk(es, operations)
+        return
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="seed-bulk") as executor:
+        pending: Set[Future] = set()
+        try:
+            for operations in chunks:
+                if len(pending) >= concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                pending.add(executor.submit(_bulk, es, operations))
+            for future in pending:
+                yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _restore_refresh(es: Elasticsearch, refresh_intervals: Dict[str, Any]) -> None:
+    for index, interval in refresh_intervals.items():
+        es.indices.put_settings(index=index, settings={"index": {"refresh_interval": interval}})
+        es.indices.refresh(index=index)
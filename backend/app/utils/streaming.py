@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, TypeVar
+
+from app.core.metrics import ES_FETCH_SECONDS
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 1000
+POINT_IN_TIME_KEEP_ALIVE = "2m"
+
+_END = object()
+
+
+def iter_search_pages(
+    es: Any,
+    index: str,
+    query_body: Dict[str, Any],
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield every hit matching ``query_body`` in pages of ``page_size`` documents.
+
+    Pages are read from a point-in-time snapshot with ``search_after`` so the
+    whole result set is covered, not just the first ``index.max_result_window``
+    hits, while only one page is held in memory at a time. The point in time is
+    closed once the generator finishes or is closed early.
+    """
+
+    pit = es.open_point_in_time(index=index, keep_alive=POINT_IN_TIME_KEEP_ALIVE)
+    pit_id = pit["id"]
+    sort = list(query_body.get("sort", [])) + [{"_shard_doc": "asc"}]
+    search_after: Optional[List[Any]] = None
+    try:
+        while True:
+            body = {
+                **query_body,
+                "pit": {"id": pit_id, "keep_alive": POINT_IN_TIME_KEEP_ALIVE},
+                "sort": sort,
+            }
+            if search_after is not None:
+                body["search_after"] = search_after
+            with ES_FETCH_SECONDS.time():
+                response = es.search(body=body, size=page_size)
+            pit_id = response.get("pit_id", pit_id)
+            hits = response.get("hits", {}).get("hits", [])
+            if not hits:
+                return
+            yield hits
+            if len(hits) < page_size:
+                return
+            search_after = hits[-1].get("sort")
+    finally:
+        try:
+            es.close_point_in_time(id=pit_id)
+        except Exception:  # pragma: no cover - the PIT expires on its own after keep_alive
+            pass
+
+
+def prefetch(items: Iterator[T]) -> Iterator[T]:
+    """Iterate ``items`` while computing the next element on a background thread.
+
+    Used to overlap network-bound page fetches with evaluation of the current
+    page. At most one element is fetched ahead.
+    """
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch") as executor:
+        future = executor.submit(next, items, _END)
+        try:
+            while True:
+                item = future.result()
+                if item is _END:
+                    return
+                future = executor.submit(next, items, _END)
+                yield item
+        finally:
+            future.cancel()
+            try:
+                future.result()
+            except Exception:
+                pass
+            close = getattr(items, "close", None)
+            if close is not None:
+                close()
@@ -0,0 +1,7 @@
+"""Performance benchmarks for RuleTrail's evaluation, import and export hot paths.
+
+Run ``python -m benchmarks --help`` from ``backend/``. Scenarios use synthetic
+rulepacks and documents (see ``benchmarks.generators``), an in-memory SQLite
+database and an in-process Elasticsearch stand-in, so they need no services.
+Results are written as JSON and can be compared against a stored baseline.
+"""
@@ -0,0 +1,58 @@
+"""Command line entry point: ``python -m benchmarks``."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from benchmarks.runner import compare, format_comparison, format_results, load_results, run_suite, write_results
+from benchmarks.scenarios import PROFILES, build_scenarios
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run RuleTrail performance benchmarks")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick", help="Input sizes to benchmark")
+    parser.add_argument(
+        "--scenario", action="append", default=None, help="Only run scenarios whose name starts with this (repeatable)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions per scenario")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed repetitions before timing")
+    parser.add_argument("--output", type=Path, default=None, help="Write results as JSON to this path")
+    parser.add_argument("--baseline", type=Path, default=None, help="Compare against results stored at this path")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Allowed slowdown against the baseline before failing (0.2 = 20%%)"
+    )
+    parser.add_argument("--list", action="store_true", help="List scenario names and exit")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    scenarios = build_scenarios(args.profile)
+    if args.scenario:
+        scenarios = [scenario for scenario in scenarios if scenario.name.startswith(tuple(args.scenario))]
+    if args.list:
+        for scenario in scenarios:
+            print(scenario.name)
+        return 0
+    results = run_suite(scenarios, repeat=args.repeat, warmup=args.warmup, profile=args.profile)
+    print(format_results(results))
+    if args.output:
+        write_results(results, args.output)
+    if args.baseline:
+        baseline = load_results(args.baseline)
+        if baseline.get("meta", {}).get("profile") != args.profile:
+            print(f"warning: baseline was recorded with profile {baseline.get('meta', {}).get('profile')!r}")
+        rows = compare(results, baseline, args.threshold)
+        print()
+        print(format_comparison(rows))
+        if any(row["regressed"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
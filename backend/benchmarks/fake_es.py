@@ -0,0 +1,34 @@
+"""Minimal in-process Elasticsearch stand-in for full-mode evaluation runs.
+
+Supports point-in-time paging with ``search_after`` over a ``match_all``
+query and ``_source`` include lists of field names, which is everything a
+full run without a change field issues.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+
+class InMemoryElasticsearch:
+    def __init__(self, documents: List[Dict[str, Any]]):
+        self.documents = documents
+
+    def open_point_in_time(self, index: str, keep_alive: str) -> Dict[str, Any]:
+        return {"id": f"pit-{index}"}
+
+    def close_point_in_time(self, id: str) -> Dict[str, Any]:
+        return {"succeeded": True}
+
+    def search(self, index: str | None = None, body: Dict[str, Any] | None = None, size: int = 1000):
+        body = body or {}
+        start = body.get("search_after", [-1])[0] + 1
+        includes = body.get("_source")
+        hits = []
+        for position, document in enumerate(self.documents[start : start + size], start=start):
+            if isinstance(includes, list):
+                source = {field: document[field] for field in includes if field in document}
+            else:
+                source = dict(document)
+            hits.append({"_id": document.get("_id", str(position)), "_source": source, "sort": [position]})
+        return {"hits": {"total": {"value": len(self.documents)}, "hits": hits}}
@@ -0,0 +1,101 @@
+"""Synthetic rulepacks and documents for benchmarks.
+
+Documents have ``field_count`` fields named ``f0``, ``f1``, ...: even fields
+hold integers in ``[0, cardinality)`` and odd fields hold one of
+``cardinality`` category strings (``v0``, ``v1``, ...). Generated conditions
+only reference those fields, so every clause is meaningful for every
+document. All generators are deterministic for a given ``seed``.
+"""
+
+from __future__ import annotations
+
+import io
+import random
+from typing import Any, Dict, List
+
+import pandas as pd
+
+_NUMERIC_OPERATORS = (">", ">=", "<", "<=", "==", "!=")
+_CATEGORY_OPERATORS = ("==", "!=")
+
+
+def field_name(index: int) -> str:
+    return f"f{index}"
+
+
+def generate_condition(rng: random.Random, clause_count: int, field_count: int, cardinality: int) -> str:
+    """A condition string of ``clause_count`` comparisons joined with AND/OR."""
+
+    clauses: List[str] = []
+    for _ in range(clause_count):
+        index = rng.randrange(field_count)
+        if index % 2 == 0:
+            clause = f"{field_name(index)} {rng.choice(_NUMERIC_OPERATORS)} {rng.randrange(cardinality)}"
+        else:
+            clause = f"{field_name(index)} {rng.choice(_CATEGORY_OPERATORS)} 'v{rng.randrange(cardinality)}'"
+        clauses.append(clause)
+    condition = clauses[0]
+    for clause in clauses[1:]:
+        condition += f" {rng.choice(('AND', 'OR'))} {clause}"
+    return condition
+
+
+def generate_conditions(
+    count: int, clause_count: int, field_count: int, cardinality: int, seed: int = 0
+) -> List[str]:
+    rng = random.Random(seed)
+    return [generate_condition(rng, clause_count, field_count, cardinality) for _ in range(count)]
+
+
+def generate_rulepack_frame(
+    rule_count: int, clause_count: int, field_count: int, cardinality: int, seed: int = 0
+) -> pd.DataFrame:
+    """A sheet of ``rule_count`` rules in the importer's column layout."""
+
+    rng = random.Random(seed)
+    rows = []
+    for number in range(1, rule_count + 1):
+        condition = generate_condition(rng, clause_count, field_count, cardinality)
+        fields = sorted({part.split()[0] for part in condition.replace(" OR ", " AND ").split(" AND ")})
+        rows.append(
+            {
+                "S. No.": number,
+                "Rule No.": f"BENCH-{number:05d}",
+                "New Rule Name": f"Benchmark rule {number}",
+                "Rule Logic - Business": f"Synthetic rule {number}",
+                "Conditions AND OR": condition,
+                "Original Fields": ", ".join(fields),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def generate_rulepack_xlsx(
+    rule_count: int,
+    clause_count: int,
+    field_count: int,
+    cardinality: int,
+    *,
+    sheets: int = 1,
+    seed: int = 0,
+) -> bytes:
+    """An Excel workbook with ``sheets`` domains of ``rule_count`` rules each."""
+
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        for sheet in range(sheets):
+            frame = generate_rulepack_frame(rule_count, clause_count, field_count, cardinality, seed=seed + sheet)
+            frame.to_excel(writer, sheet_name=f"BENCH{sheet}", index=False)
+    return buffer.getvalue()
+
+
+def generate_documents(count: int, field_count: int, cardinality: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    documents = []
+    for number in range(count):
+        document: Dict[str, Any] = {"_id": str(number)}
+        for index in range(field_count):
+            value = rng.randrange(cardinality)
+            document[field_name(index)] = value if index % 2 == 0 else f"v{value}"
+        documents.append(document)
+    return documents
@@ -0,0 +1,112 @@
+"""Timing harness, result files and baseline comparison."""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from benchmarks.scenarios import Scenario
+
+RESULTS_VERSION = 1
+
+
+def measure(scenario: Scenario, repeat: int = 3, warmup: int = 1) -> Dict[str, Any]:
+    """Time ``scenario.run`` ``repeat`` times after ``warmup`` untimed runs."""
+
+    if repeat <= 0:
+        raise ValueError("repeat must be positive")
+    context = scenario.prepare()
+    timings: List[float] = []
+    for iteration in range(warmup + repeat):
+        if scenario.before is not None:
+            scenario.before(context)
+        started = time.perf_counter()
+        scenario.run(context)
+        elapsed = time.perf_counter() - started
+        if iteration >= warmup:
+            timings.append(elapsed)
+    median = statistics.median(timings)
+    return {
+        "name": scenario.name,
+        "params": scenario.params,
+        "units": scenario.units,
+        "unit_count": scenario.unit_count,
+        "repeat": repeat,
+        "min_seconds": round(min(timings), 6),
+        "median_seconds": round(median, 6),
+        "mean_seconds": round(statistics.fmean(timings), 6),
+        "stdev_seconds": round(statistics.stdev(timings), 6) if len(timings) > 1 else 0.0,
+        "units_per_second": round(scenario.unit_count / median, 2) if median > 0 else None,
+    }
+
+
+def run_suite(
+    scenarios: Iterable[Scenario], repeat: int = 3, warmup: int = 1, profile: Optional[str] = None
+) -> Dict[str, Any]:
+    return {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "profile": profile,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "results": [measure(scenario, repeat, warmup) for scenario in scenarios],
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2) -> List[Dict[str, Any]]:
+    """Compare median timings per scenario; ``regressed`` when slower than the baseline by more than ``threshold``."""
+
+    previous = {result["name"]: result for result in baseline.get("results", [])}
+    rows = []
+    for result in current["results"]:
+        before = previous.get(result["name"])
+        if before is None or not before["median_seconds"]:
+            continue
+        ratio = result["median_seconds"] / before["median_seconds"]
+        rows.append(
+            {
+                "name": result["name"],
+                "baseline_seconds": before["median_seconds"],
+                "current_seconds": result["median_seconds"],
+                "ratio": round(ratio, 3),
+                "regressed": ratio > 1 + threshold,
+            }
+        )
+    return rows
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text())
+
+
+def write_results(results: Dict[str, Any], path: Path) -> None:
+    Path(path).write_text(json.dumps(results, indent=2) + "\n")
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    lines = [f"{'scenario':<28} {'median s':>10} {'min s':>10} {'units/s':>14}"]
+    for result in results["results"]:
+        rate = result["units_per_second"]
+        lines.append(
+            f"{result['name']:<28} {result['median_seconds']:>10.4f} {result['min_seconds']:>10.4f} "
+            f"{(f'{rate:,.0f} ' + result['units']) if rate else '-':>14}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'scenario':<28} {'baseline s':>11} {'current s':>10} {'ratio':>7}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regressed"] else ""
+        lines.append(
+            f"{row['name']:<28} {row['baseline_seconds']:>11.4f} {row['current_seconds']:>10.4f} {row['ratio']:>7.3f}{flag}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,190 @@
+"""Timed benchmark scenarios.
+
+Each scenario prepares its inputs once (``prepare``), optionally resets
+per-repetition state (``before``) and times ``run`` only. Sizes come from a
+profile: ``smoke`` keeps the suite fast enough for the test-suite, ``quick``
+is meant for local iteration and ``standard`` for comparing against a stored
+baseline.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models.dataset import Dataset
+from app.models.run import DecisionTrace, Run, RunRuleResult
+from app.services.evaluation_service import EvaluationService, RunOptions
+from app.services.rulepack_cache import get_rulepack_cache
+from app.services.rulepack_service import load_rulepack_from_excel
+from app.services.run_export import RunExporter
+from app.utils.conditions import evaluate_conditions, parse_conditions
+from benchmarks.fake_es import InMemoryElasticsearch
+from benchmarks.generators import generate_conditions, generate_documents, generate_rulepack_xlsx
+
+PROFILES: Dict[str, Dict[str, int]] = {
+    "smoke": {"rules": 5, "clauses": 3, "fields": 6, "cardinality": 10, "documents": 200, "conditions": 200, "sheets": 1},
+    "quick": {
+        "rules": 25,
+        "clauses": 4,
+        "fields": 12,
+        "cardinality": 50,
+        "documents": 5000,
+        "conditions": 5000,
+        "sheets": 2,
+    },
+    "standard": {
+        "rules": 100,
+        "clauses": 5,
+        "fields": 20,
+        "cardinality": 100,
+        "documents": 20000,
+        "conditions": 20000,
+        "sheets": 4,
+    },
+}
+
+
+@dataclass
+class Scenario:
+    name: str
+    units: str
+    unit_count: int
+    prepare: Callable[[], Any]
+    run: Callable[[Any], Any]
+    before: Optional[Callable[[Any], None]] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+def _session() -> Session:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+
+def _evaluation_context(size: Dict[str, int]) -> Dict[str, Any]:
+    db = _session()
+    workbook = generate_rulepack_xlsx(size["rules"], size["clauses"], size["fields"], size["cardinality"])
+    rulepack = load_rulepack_from_excel(db, workbook)[0]
+    dataset = Dataset(name="bench", host="http://bench", index_name="bench", query={"query": {"match_all": {}}})
+    db.add(dataset)
+    db.commit()
+    documents = generate_documents(size["documents"], size["fields"], size["cardinality"])
+    service = EvaluationService(db, InMemoryElasticsearch(documents), workers=1)
+    return {"db": db, "service": service, "rulepack_id": rulepack.id, "dataset_id": dataset.id}
+
+
+def _run_evaluation(context: Dict[str, Any], options: RunOptions) -> Run:
+    return context["service"].run("BENCH0", context["rulepack_id"], context["dataset_id"], options=options)
+
+
+def _export_context(size: Dict[str, int]) -> Dict[str, Any]:
+    context = _evaluation_context(size)
+    context["run"] = _run_evaluation(context, RunOptions())
+    return context
+
+
+def _export(context: Dict[str, Any], fmt: str) -> int:
+    exporter = RunExporter(context["db"], context["run"])
+    return sum(len(chunk) for chunk in exporter.iter_bytes(fmt))
+
+
+def build_scenarios(profile: str = "quick") -> List[Scenario]:
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown benchmark profile: {profile}")
+    size = PROFILES[profile]
+    decisions = size["rules"] * size["documents"]
+
+    def parsed_rules() -> Dict[str, Any]:
+        conditions = generate_conditions(size["rules"], size["clauses"], size["fields"], size["cardinality"])
+        return {
+            "rules": [parse_conditions(condition) for condition in conditions],
+            "documents": generate_documents(size["documents"], size["fields"], size["cardinality"]),
+        }
+
+    def evaluate_all(context: Dict[str, Any]) -> None:
+        for document in context["documents"]:
+            for clauses in context["rules"]:
+                evaluate_conditions(clauses, document)
+
+    def import_context() -> Dict[str, Any]:
+        workbook = generate_rulepack_xlsx(
+            size["rules"], size["clauses"], size["fields"], size["cardinality"], sheets=size["sheets"]
+        )
+        return {"workbook": workbook}
+
+    def fresh_database(context: Dict[str, Any]) -> None:
+        context["db"] = _session()
+
+    def cold_cache_without_runs(context: Dict[str, Any]) -> None:
+        # Start every repetition from an empty run history, so traces written by
+        # earlier repetitions do not slow down later ones.
+        get_rulepack_cache().clear()
+        db = context["db"]
+        for model in (DecisionTrace, RunRuleResult, Run):
+            db.query(model).delete(synchronize_session=False)
+        db.commit()
+
+    scenarios = [
+        Scenario(
+            name="parse_conditions",
+            units="conditions",
+            unit_count=size["conditions"],
+            prepare=lambda: generate_conditions(size["conditions"], size["clauses"], size["fields"], size["cardinality"]),
+            run=lambda conditions: [parse_conditions(condition) for condition in conditions],
+        ),
+        Scenario(
+            name="evaluate_conditions",
+            units="rule_evaluations",
+            unit_count=decisions,
+            prepare=parsed_rules,
+            run=evaluate_all,
+        ),
+        Scenario(
+            name="rulepack_import",
+            units="rules",
+            unit_count=size["rules"] * size["sheets"],
+            prepare=import_context,
+            before=fresh_database,
+            run=lambda context: load_rulepack_from_excel(context["db"], context["workbook"]),
+        ),
+    ]
+    for engine in ("row", "vectorized"):
+        scenarios.append(
+            Scenario(
+                name=f"evaluation_run[{engine}]",
+                units="documents",
+                unit_count=size["documents"],
+                prepare=lambda: _evaluation_context(size),
+                before=cold_cache_without_runs,
+                run=lambda context, engine=engine: _run_evaluation(context, RunOptions(engine=engine)),
+            )
+        )
+    scenarios.append(
+        Scenario(
+            name="evaluation_run[no_traces]",
+            units="documents",
+            unit_count=size["documents"],
+            prepare=lambda: _evaluation_context(size),
+            before=cold_cache_without_runs,
+            run=lambda context: _run_evaluation(context, RunOptions(retention="none")),
+        )
+    )
+    for fmt in ("json", "ndjson"):
+        scenarios.append(
+            Scenario(
+                name=f"export_run[{fmt}]",
+                units="decisions",
+                unit_count=decisions,
+                prepare=lambda: _export_context(size),
+                run=lambda context, fmt=fmt: _export(context, fmt),
+            )
+        )
+    for scenario in scenarios:
+        scenario.params = {"profile": profile, **size}
+    return scenarios
@@ -22,6 +22,8 @@ from sqlalchemy.orm import sessionmaker
 from app.core.config import Settings
 from app.db.base import Base
 from app.main import app, seed_data
+from app.services.es_clients import close_es_clients
+from app.services.rulepack_cache import get_rulepack_cache
 
 TEST_DB_URL = "sqlite:///:memory:"
 
@@ -79,9 +81,12 @@ def db_session(monkeypatch):
     monkeypatch.setattr(config_module, "get_settings", _get_settings)
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    # Every test starts from a fresh database whose ids would collide with cached rulepacks.
+    get_rulepack_cache().clear()
     db = TestingSessionLocal()
     yield db
     db.close()
+    close_es_clients()
     Base.metadata.drop_all(bind=engine)
 
 
@@ -101,9 +106,121 @@ def client(db_session, monkeypatch):
     yield TestClient(app)
 
 
+def _field_values(doc: Dict, field: str, runtime_mappings: Dict | None = None) -> List:
+    """Indexed values of ``field``: like Elasticsearch, arrays (also of objects) are flattened."""
+
+    if runtime_mappings and field in runtime_mappings:
+        # The only runtime field the app defines flags arrays, see ``app.utils.es_query.array_probes``.
+        probed = runtime_mappings[field]["script"]["params"]["field"]
+        return [isinstance(doc.get(probed), list)]
+    if field.endswith(".keyword"):
+        field = field[: -len(".keyword")]
+    values = [doc]
+    for key in field.split("."):
+        found = []
+        for value in values:
+            for item in value if isinstance(value, list) else [value]:
+                if isinstance(item, dict) and key in item:
+                    found.append(item[key])
+        values = found
+    flat = []
+    for value in values:
+        flat.extend(value if isinstance(value, list) else [value])
+    return [value for value in flat if value is not None]
+
+
+def fake_query_matches(query: Dict, doc: Dict, runtime_mappings: Dict | None = None) -> bool:
+    """Evaluate the subset of the Elasticsearch query DSL the app generates, with its array semantics."""
+
+    (kind, spec), = query.items()
+    if kind == "match_all":
+        return True
+    if kind == "term":
+        (field, value), = spec.items()
+        return value in _field_values(doc, field, runtime_mappings)
+    if kind == "range":
+        (field, bounds), = spec.items()
+        for value in _field_values(doc, field, runtime_mappings):
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                checks = {"gt": value.__gt__, "gte": value.__ge__, "lt": value.__lt__, "lte": value.__le__}
+                if all(checks[op](bound) for op, bound in bounds.items()):
+                    return True
+        return False
+    if kind == "exists":
+        return bool(_field_values(doc, spec["field"], runtime_mappings))
+    if kind == "bool":
+        matches = lambda q: fake_query_matches(q, doc, runtime_mappings)  # noqa: E731
+        return (
+            all(matches(q) for q in spec.get("filter", []) + spec.get("must", []))
+            and not any(matches(q) for q in spec.get("must_not", []))
+            and (not spec.get("should") or any(matches(q) for q in spec["should"]))
+        )
+    raise NotImplementedError(kind)
+
+
+def fake_source(doc: Dict, includes) -> Dict:
+    """Apply ``_source`` filtering: ``False`` drops the source, a list keeps the named (dotted) paths."""
+
+    if includes is None or includes is True:
+        return dict(doc)
+    if includes is False:
+        return {}
+
+    def keep(value, prefix: str):
+        if isinstance(value, list):
+            return [keep(item, prefix) for item in value]
+        if not isinstance(value, dict):
+            return value
+        kept = {}
+        for key, item in value.items():
+            path = f"{prefix}{key}"
+            if any(pattern == path or pattern.startswith(f"{path}.") for pattern in includes):
+                kept[key] = item if path in includes else keep(item, f"{path}.")
+        return kept
+
+    return keep(doc, "")
+
+
+def _map_properties(document: Dict, properties: Dict[str, Dict]) -> None:
+    """Dynamic mapping: arrays take the type of their elements, objects get nested properties."""
+
+    for field, value in document.items():
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, dict):
+                _map_properties(item, properties.setdefault(field, {"properties": {}})["properties"])
+            elif isinstance(item, bool):
+                properties.setdefault(field, {"type": "boolean"})
+            elif isinstance(item, int):
+                properties.setdefault(field, {"type": "long"})
+            elif isinstance(item, float):
+                properties.setdefault(field, {"type": "float"})
+            elif isinstance(item, str):
+                properties.setdefault(field, {"type": "text", "fields": {"keyword": {"type": "keyword"}}})
+
+
 class FakeIndicesClient:
-    def __init__(self):
+    def __init__(self, owner: "FakeElasticsearch | None" = None):
         self.created: List[str] = []
+        self.owner = owner
+        self.settings: Dict[str, Dict] = {}
+        self.settings_updates: List[Dict] = []
+        self.refreshed: List[str] = []
+
+    def get_mapping(self, index: str):
+        properties: Dict[str, Dict] = {}
+        for doc in self.owner.documents if self.owner else []:
+            _map_properties(doc, properties)
+        return {index: {"mappings": {"properties": properties}}}
+
+    def get_settings(self, index: str):
+        return {index: {"settings": {"index": {"number_of_shards": "1", **self.settings.get(index, {})}}}}
+
+    def put_settings(self, index: str, settings: Dict):
+        self.settings_updates.append({"index": index, "settings": settings})
+        self.settings.setdefault(index, {}).update(settings["index"])
+
+    def refresh(self, index: str):
+        self.refreshed.append(index)
 
     def create(self, index: str, ignore: int | None = None):
         if index not in self.created:
@@ -113,19 +230,64 @@ class FakeIndicesClient:
 class FakeElasticsearch:
     def __init__(self, documents: List[Dict]):
         self.documents = list(documents)
-        self.indices = FakeIndicesClient()
+        self.indices = FakeIndicesClient(self)
         self.indexed: List[Dict] = []
+        self.searches: List[Dict] = []
 
-    def search(self, index: str, body: Dict, size: int = 1000):
+    def close(self):
+        self.closed = True
+
+    def open_point_in_time(self, index: str, keep_alive: str):
+        return {"id": f"pit-{index}"}
+
+    def close_point_in_time(self, id: str):
+        return {"succeeded": True}
+
+    def search(self, index: str | None = None, body: Dict | None = None, **params):
+        body = body or {}
+        # Like elasticsearch-py 8, refuse a parameter given both in the body and as a keyword.
+        duplicated = sorted(set(body) & set(params))
+        if duplicated:
+            raise ValueError(
+                f"Received multiple values for '{', '.join(duplicated)}', specify parameters "
+                "using either body or parameters, not both."
+            )
+        size = params.get("size", body.get("size", 10))
+        self.searches.append({"index": index, "body": body, "size": size})
+        if "aggs" in body:
+            matching = [doc for doc in self.documents if fake_query_matches(body.get("query", {"match_all": {}}), doc)]
+            runtime_mappings = body.get("runtime_mappings")
+            aggregations = {
+                name: {
+                    "buckets": {
+                        key: {
+                            "doc_count": sum(1 for doc in matching if fake_query_matches(query, doc, runtime_mappings))
+                        }
+                        for key, query in aggregation["filters"]["filters"].items()
+                    }
+                }
+                for name, aggregation in body["aggs"].items()
+            }
+            return {"hits": {"total": {"value": len(matching)}, "hits": []}, "aggregations": aggregations}
+        start = body.get("search_after", [-1])[0] + 1
+        matching = [doc for doc in self.documents if fake_query_matches(body.get("query", {"match_all": {}}), doc)]
         return {
             "hits": {
                 "hits": [
-                    {"_id": doc.get("_id", str(idx)), "_source": doc}
-                    for idx, doc in enumerate(self.documents)
+                    {"_id": doc.get("_id", str(idx)), "_source": fake_source(doc, body.get("_source")), "sort": [idx]}
+                    for idx, doc in enumerate(matching[start : start + size], start=start)
                 ]
             }
         }
 
+    def bulk(self, operations: List[Dict]):
+        items = []
+        for action, document in zip(operations[::2], operations[1::2]):
+            target = action["index"]
+            self.index(target["_index"], id=target.get("_id"), document=document)
+            items.append({"index": {"_index": target["_index"], "status": 201}})
+        return {"errors": False, "items": items}
+
     def index(self, index: str, id: str | None = None, document: Dict | None = None):
         doc = document.copy() if document else {}
         if id is not None:
@@ -2,8 +2,13 @@ import io
 
 import pandas as pd
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 
-from app.services import evaluation_service
+from app.models.dataset import Dataset
+from app.services import es_clients
+from app.services.evaluation_service import EvaluationService
+from app.services.rulepack_service import load_rulepack_from_excel
+from app.services.run_queue import get_run_queue
 from backend.tests.conftest import FakeElasticsearch
 
 
@@ -26,7 +31,7 @@ def prepare_rulepack_bytes():
     return buffer.getvalue()
 
 
-def test_rule_crud_and_run(client, db_session):
+def test_rule_crud_and_run(client, db_session, monkeypatch):
     excel_bytes = prepare_rulepack_bytes()
     response = client.post("/api/rulepacks/import", files={"file": ("rules.xlsx", excel_bytes, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")})
     assert response.status_code == 200
@@ -66,12 +71,7 @@ def test_rule_crud_and_run(client, db_session):
     def _fake_es_client(*args, **kwargs):
         return fake_es
 
-    evaluation_service.Elasticsearch = _fake_es_client  # type: ignore
-    from app.api.v1 import runs as runs_module
-    import elasticsearch
-
-    runs_module.Elasticsearch = _fake_es_client  # type: ignore
-    elasticsearch.Elasticsearch = _fake_es_client  # type: ignore
+    monkeypatch.setattr(es_clients, "Elasticsearch", _fake_es_client)
 
     run_payload = {
         "domain": "HR",
@@ -81,7 +81,21 @@ def test_rule_crud_and_run(client, db_session):
     run_resp = client.post("/api/runs/start", json=run_payload)
     assert run_resp.status_code == 200
     run_data = run_resp.json()
-    assert run_data["status_counts"]
+    assert run_data["state"] in {"queued", "running", "completed"}
+
+    get_run_queue().wait(run_data["id"], timeout=10)
+    status_resp = client.get(f"/api/runs/{run_data['id']}/status")
+    assert status_resp.status_code == 200
+    status = status_resp.json()
+    assert status["state"] == "completed"
+    assert status["status_counts"]
+    assert status["progress"]["documents_processed"] == 2
+    assert status["progress"]["pages_processed"] == 1
+    assert "rules_completed" not in status["progress"]
+
+    detail = client.get(f"/api/runs/{run_data['id']}").json()
+    assert detail["timing"]["documents"] == 2
+    assert detail["timing"]["phases"]["evaluate"]["items"] == 2
 
 
 def test_rulepack_import_includes_filename_metadata(client):
@@ -130,3 +144,60 @@ def test_rulepack_import_returns_validation_errors(client):
 
     assert response.status_code == 400
     assert "Unable to parse conditions" in response.json()["detail"]
+
+
+def test_run_decisions_are_filtered_and_keyset_paginated(client, db_session):
+    rulepack = load_rulepack_from_excel(db_session, prepare_rulepack_bytes())[0]
+    dataset = Dataset(name="paged", host="http://mock", index_name="hr", query={"match_all": {}})
+    db_session.add(dataset)
+    db_session.commit()
+    es = FakeElasticsearch([{"_id": str(idx), "score": idx} for idx in range(10)])
+    run = EvaluationService(db_session, es).run("HR", rulepack.id, dataset.id)
+    rule_id = run.rule_results[0].rule_id
+
+    seen = []
+    after = None
+    while True:
+        params = {"rule_id": rule_id, "status": "FAIL", "size": 2}
+        if after is not None:
+            params["after"] = after
+        response = client.get(f"/api/runs/{run.id}/decisions", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= 2
+        seen.extend(item["record_id"] for item in page["items"])
+        after = page["next_after"]
+        if after is None:
+            break
+
+    assert seen == ["6", "7", "8", "9"]
+    assert client.get(f"/api/runs/{run.id}/decisions", params={"size": 0}).status_code == 422
+    assert client.get("/api/runs/999/decisions").status_code == 404
+
+
+def test_run_detail_is_summary_shaped_and_loaded_without_n_plus_one(client, db_session):
+    rulepack = load_rulepack_from_excel(db_session, prepare_rulepack_bytes())[0]
+    dataset = Dataset(name="detail", host="http://mock", index_name="hr", query={"match_all": {}})
+    db_session.add(dataset)
+    db_session.commit()
+    es = FakeElasticsearch([{"_id": str(idx), "score": idx * 3} for idx in range(4)])
+    run = EvaluationService(db_session, es).run("HR", rulepack.id, dataset.id)
+    db_session.expunge_all()
+
+    statements = []
+
+    def _count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        response = client.get(f"/api/runs/{run.id}")
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+    assert response.status_code == 200
+    detail = response.json()
+    assert detail["rule_results"][0]["summary"]["counts"] == {"PASS": 2, "FAIL": 2}
+    assert "decisions" not in detail["rule_results"][0]
+    assert len(statements) == 2
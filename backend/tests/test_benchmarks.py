@@ -0,0 +1,53 @@
+import json
+
+from benchmarks.__main__ import main
+from benchmarks.runner import compare, measure
+from benchmarks.scenarios import Scenario, build_scenarios
+
+
+def test_smoke_profile_runs_every_scenario(tmp_path):
+    output = tmp_path / "results.json"
+
+    assert main(["--profile", "smoke", "--repeat", "1", "--warmup", "0", "--output", str(output)]) == 0
+
+    results = json.loads(output.read_text())
+    assert results["meta"]["profile"] == "smoke"
+    assert [result["name"] for result in results["results"]] == [scenario.name for scenario in build_scenarios("smoke")]
+    assert all(result["units_per_second"] > 0 for result in results["results"])
+
+
+def test_measure_resets_state_before_each_timed_run():
+    calls = []
+    scenario = Scenario(
+        name="noop",
+        units="items",
+        unit_count=10,
+        prepare=lambda: calls.append("prepare") or {},
+        before=lambda context: calls.append("before"),
+        run=lambda context: calls.append("run"),
+    )
+
+    result = measure(scenario, repeat=2, warmup=1)
+
+    assert calls == ["prepare", "before", "run", "before", "run", "before", "run"]
+    assert result["repeat"] == 2
+    assert result["unit_count"] == 10
+
+
+def test_compare_flags_slowdowns_beyond_threshold(tmp_path):
+    baseline = {"results": [{"name": "a", "median_seconds": 1.0}, {"name": "b", "median_seconds": 1.0}]}
+    current = {
+        "results": [
+            {"name": "a", "median_seconds": 1.1},
+            {"name": "b", "median_seconds": 1.5},
+            {"name": "new", "median_seconds": 9.0},
+        ]
+    }
+
+    rows = compare(current, baseline, threshold=0.2)
+
+    assert [(row["name"], row["regressed"]) for row in rows] == [("a", False), ("b", True)]
+
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps({"meta": {"profile": "smoke"}, "results": [{"name": "parse_conditions", "median_seconds": 1e-9}]}))
+    assert main(["--profile", "smoke", "--scenario", "parse", "--repeat", "1", "--warmup", "0", "--baseline", str(path)]) == 1
@@ -0,0 +1,64 @@
+import pytest
+
+from app.schemas.common import ConditionClause
+from app.utils.columnar import ColumnarBatch, evaluate_rule_masks
+from app.utils.conditions import compile_clauses, parse_conditions
+
+
+DOCUMENTS = [
+    {"amount": 15, "status": "OPEN", "tags": ["vip"]},
+    {"amount": 5.5, "status": "CLOSED", "tags": []},
+    {"amount": None, "status": None},
+    {"amount": "12", "status": "OPEN", "tags": ["late"]},
+    {"status": "PENDING", "flag": "yes"},
+]
+
+
+def _assert_parity(raw: str):
+    compiled = compile_clauses(parse_conditions(raw))
+    masks, matched = evaluate_rule_masks(ColumnarBatch(DOCUMENTS), compiled)
+    for idx, doc in enumerate(DOCUMENTS):
+        evaluated = compiled.evaluate(doc)
+        assert [bool(mask[idx]) for mask in masks] == [bool(ec.result) for ec in evaluated]
+        assert bool(matched[idx]) == bool(compiled.matches(evaluated))
+
+
+def test_numeric_masks_match_row_semantics():
+    _assert_parity("amount > 10 or amount <= 5.5")
+    _assert_parity("amount != 15 and amount = 12")
+
+
+def test_object_masks_fall_back_for_incomparable_values():
+    _assert_parity("status >= 'OPEN' or status == 'PENDING'")
+    _assert_parity("tags contains 'vip' and NOT flag")
+
+
+@pytest.mark.parametrize("operator", ["==", "!=", ">", "<="])
+@pytest.mark.parametrize("value", [["vip"], [15, 5.5], [15, 5.5, None, "12", 0], ("OPEN",), {"a": 1}])
+def test_sequence_constants_are_compared_whole_not_broadcast(operator, value):
+    for field in ("amount", "status", "tags"):
+        compiled = compile_clauses([ConditionClause(field=field, operator=operator, value=value)])
+        masks, matched = evaluate_rule_masks(ColumnarBatch(DOCUMENTS), compiled)
+        assert masks[0].shape == (len(DOCUMENTS),)
+        assert matched.tolist() == [compiled.matches(compiled.evaluate(doc)) for doc in DOCUMENTS]
+
+
+def test_rule_without_clauses_matches_every_document():
+    masks, matched = evaluate_rule_masks(ColumnarBatch(DOCUMENTS), compile_clauses([]))
+    assert masks == []
+    assert matched.all()
+
+
+NESTED_DOCUMENTS = [
+    {"order": {"total": 20}, "items": [{"price": 3}, {"price": 12}]},
+    {"order": {"total": 4}, "items": [{"price": 15}]},
+    {"order": {}, "items": []},
+    {"items": {"price": 30}},
+]
+
+
+def test_nested_and_array_paths_match_row_semantics():
+    for raw in ("order.total > 10", "items.price > 10 or order.total < 5", "items[all].price > 10"):
+        compiled = compile_clauses(parse_conditions(raw))
+        masks, matched = evaluate_rule_masks(ColumnarBatch(NESTED_DOCUMENTS), compiled)
+        assert matched.tolist() == [compiled.matches(compiled.evaluate(doc)) for doc in NESTED_DOCUMENTS]
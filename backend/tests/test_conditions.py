@@ -1,6 +1,8 @@
 from app.schemas.common import ConditionClause
 from app.utils.conditions import (
+    ClausePool,
     ConditionParserError,
+    compile_clauses,
     evaluate_boolean_chain,
     evaluate_conditions,
     parse_conditions,
@@ -72,3 +74,42 @@ def test_evaluate_conditions_exists_operator_falsey():
     clauses = parse_conditions("NOT optional_field")
     evaluated = evaluate_conditions(clauses, {"optional_field": None})
     assert evaluated[0].result is True
+
+
+def test_compiled_rule_matches_interpreted_chain():
+    clauses = parse_conditions("amount > 10 or status == 'CLOSED' and owner.team = 'ops'")
+    compiled = compile_clauses([clause.dict() for clause in clauses])
+    for inputs in (
+        {"amount": 15, "status": "OPEN", "owner": {"team": "ops"}},
+        {"amount": 5, "status": "CLOSED", "owner": {"team": "ops"}},
+        {"amount": None, "status": "CLOSED", "owner": {"team": "hr"}},
+        {},
+    ):
+        evaluated = compiled.evaluate(inputs)
+        assert [ec.result for ec in evaluated] == [ec.result for ec in evaluate_conditions(clauses, inputs)]
+        assert compiled.matches(evaluated) == evaluate_boolean_chain(evaluated)
+
+
+def test_compile_clauses_rejects_unknown_operator():
+    clause = ConditionClause(field="amount", operator="~~", value=1)
+    try:
+        compile_clauses([clause])
+    except ConditionParserError as exc:
+        assert "Unsupported operator" in str(exc)
+    else:
+        raise AssertionError("Expected ConditionParserError")
+
+
+def test_clause_pool_shares_identical_clauses_across_rules():
+    pool = ClausePool()
+    first = compile_clauses(parse_conditions("status = 'Active' and amount > 10"), pool)
+    second = compile_clauses(parse_conditions("amount > 10.0 or status == 'Active'"), pool)
+
+    assert len(pool) == 3
+    assert first.clauses[0].slot == second.clauses[1].slot
+    assert first.clauses[1].slot != second.clauses[0].slot
+
+    inputs = {"status": "Active", "amount": 5}
+    row = pool.evaluate(inputs)
+    assert [ec.result for ec in second.select(row)] == [ec.result for ec in second.evaluate(inputs)]
+    assert second.select(row)[0].clause.connector == "OR"
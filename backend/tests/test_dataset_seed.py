@@ -2,6 +2,7 @@ import json
 from pathlib import Path
 
 from app.core import config as config_module
+from app.services import es_clients
 from backend.tests.conftest import FakeElasticsearch
 
 
@@ -18,13 +19,14 @@ def test_seed_demo_endpoint(client, monkeypatch, tmp_path):
 
     fake_es = FakeElasticsearch([])
 
-    def _fake_es_client(hosts):  # noqa: ANN001 - signature dictated by Elasticsearch
+    def _fake_es_client(hosts, **options):  # noqa: ANN001 - signature dictated by Elasticsearch
         assert hosts == settings.elasticsearch_hosts
+        assert options["max_retries"] == settings.elasticsearch_max_retries
         return fake_es
 
     import app.api.v1.datasets as datasets_module
 
-    monkeypatch.setattr(datasets_module, "Elasticsearch", _fake_es_client)
+    monkeypatch.setattr(es_clients, "Elasticsearch", _fake_es_client)
     monkeypatch.setattr(datasets_module, "get_settings", lambda: settings)
 
     response = client.post("/api/datasets/seed-demo")
@@ -44,7 +46,7 @@ def test_seed_demo_missing_file(client, monkeypatch, tmp_path):
 
     import app.api.v1.datasets as datasets_module
 
-    monkeypatch.setattr(datasets_module, "Elasticsearch", lambda hosts: FakeElasticsearch([]))
+    monkeypatch.setattr(es_clients, "Elasticsearch", lambda hosts, **options: FakeElasticsearch([]))
     monkeypatch.setattr(datasets_module, "get_settings", lambda: settings)
 
     response = client.post("/api/datasets/seed-demo")
@@ -62,7 +64,7 @@ def test_seed_demo_uses_default_path_from_backend(monkeypatch, client):
 
     fake_es = FakeElasticsearch([])
 
-    monkeypatch.setattr(datasets_module, "Elasticsearch", lambda hosts: fake_es)
+    monkeypatch.setattr(es_clients, "Elasticsearch", lambda hosts, **options: fake_es)
     monkeypatch.setattr(datasets_module, "get_settings", lambda: settings)
 
     backend_dir = Path(__file__).resolve().parents[1]
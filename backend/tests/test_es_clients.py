@@ -0,0 +1,21 @@
+from app.core.config import Settings
+from app.services import es_clients
+from app.services.es_clients import ElasticsearchClients
+
+
+def test_clients_are_shared_per_host_list_and_closed(monkeypatch):
+    settings = Settings(elasticsearch_connections_per_node=4, elasticsearch_request_timeout=5, elasticsearch_max_retries=1)
+    monkeypatch.setattr(es_clients, "get_settings", lambda: settings)
+    registry = ElasticsearchClients()
+
+    first = registry.get(["http://es-a:9200"])
+    assert registry.get(["http://es-a:9200"]) is first
+    assert registry.get(["http://es-b:9200"]) is not first
+    assert len(registry) == 2
+    assert (first._max_retries, first._request_timeout, first._retry_on_timeout) == (1, 5, True)
+    assert first.transport.node_pool.get().config.connections_per_node == 4
+
+    registry.close()
+    assert len(registry) == 0
+    assert registry.get(["http://es-a:9200"]) is not first
+    registry.close()
@@ -0,0 +1,63 @@
+from app.schemas.common import ConditionClause
+from app.utils.conditions import parse_conditions
+from app.utils.es_query import flatten_mapping, translate_clauses
+
+MAPPING = {
+    "hr": {
+        "mappings": {
+            "properties": {
+                "amount": {"type": "long"},
+                "status": {"type": "text", "fields": {"keyword": {"type": "keyword"}}},
+                "notes": {"type": "text"},
+                "owner": {"properties": {"team": {"type": "keyword"}}},
+            }
+        }
+    }
+}
+
+
+def test_flatten_mapping_includes_nested_and_multi_fields():
+    field_types = flatten_mapping(MAPPING)
+    assert field_types == {
+        "amount": "long",
+        "status": "text",
+        "status.keyword": "keyword",
+        "notes": "text",
+        "owner.team": "keyword",
+    }
+
+
+def test_translate_clauses_chains_left_to_right():
+    clauses = parse_conditions("amount > 10 or status = 'OPEN' and amount <= 100")
+    query = translate_clauses(clauses, flatten_mapping(MAPPING))
+    assert query == {
+        "bool": {
+            "filter": [
+                {
+                    "bool": {
+                        "should": [{"range": {"amount": {"gt": 10}}}, {"term": {"status.keyword": "OPEN"}}],
+                        "minimum_should_match": 1,
+                    }
+                },
+                {"range": {"amount": {"lte": 100}}},
+            ]
+        }
+    }
+
+
+def test_untranslatable_clauses_return_none():
+    field_types = flatten_mapping(MAPPING)
+    assert translate_clauses(parse_conditions("notes = 'late'"), field_types) is None
+    assert translate_clauses(parse_conditions("status contains 'OP'"), field_types) is None
+    assert translate_clauses(parse_conditions("amount > 'ten'"), field_types) is None
+    assert translate_clauses([ConditionClause(field="missing", operator="=", value=1)], field_types) is None
+
+
+def test_clauses_that_differ_on_arrays_are_not_translated():
+    field_types = flatten_mapping(MAPPING)
+    assert translate_clauses(parse_conditions("status != 'OPEN'"), field_types) is None
+    assert translate_clauses([ConditionClause(field="amount", operator="exists", value=False)], field_types) is None
+    assert translate_clauses(parse_conditions("owner.team = 'ops'"), field_types) is None
+    assert translate_clauses([ConditionClause(field="amount", operator="exists", value=True)], field_types) == {
+        "exists": {"field": "amount"}
+    }
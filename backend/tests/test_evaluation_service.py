@@ -1,9 +1,12 @@
 import io
 
 import pandas as pd
+import pytest
 
 from app.models.dataset import Dataset
-from app.services.evaluation_service import EvaluationService
+from app.models.rulepack import Rule
+from app.models.run import DecisionTrace, Run
+from app.services.evaluation_service import DEFAULT_LABELS, EvaluationService, PageEvaluator, RuleSpec, RunOptions
 from app.services.rulepack_service import load_rulepack_from_excel
 from backend.tests.conftest import FakeElasticsearch
 
@@ -46,3 +49,540 @@ def test_evaluation_run(db_session):
     statuses = {trace.status for trace in rule_result.decisions}
     assert "FAIL" in statuses
     assert "PASS" in statuses
+
+
+def test_vectorized_engine_matches_row_engine(db_session):
+    rulepack = build_rulepack(db_session)
+    dataset = Dataset(name="test", host="http://mock", index_name="hr", query={"query": {"match_all": {}}})
+    db_session.add(dataset)
+    db_session.commit()
+    documents = [
+        {"_id": "1", "overtime_hours": 45},
+        {"_id": "2", "overtime_hours": 30},
+        {"_id": "3", "overtime_hours": None},
+        {"_id": "4", "overtime_hours": "n/a"},
+    ]
+    service = EvaluationService(db_session, FakeElasticsearch(documents))
+    row_run = service.run("HR", rulepack.id, dataset.id)
+    vectorized_run = service.run("HR", rulepack.id, dataset.id, options=RunOptions(engine="vectorized"))
+
+    def traces(run):
+        return [
+            (trace.record_id, trace.status, trace.clauses, trace.rationale)
+            for result in run.rule_results
+            for trace in result.decisions
+        ]
+
+    assert vectorized_run.status_counts == row_run.status_counts
+    assert traces(vectorized_run) == traces(row_run)
+
+
+def test_evaluation_run_streams_every_page(db_session):
+    rulepack = build_rulepack(db_session)
+    dataset = Dataset(name="paged", host="http://mock", index_name="hr", query={"match_all": {}}, page_size=2)
+    db_session.add(dataset)
+    db_session.commit()
+    es = FakeElasticsearch([{"_id": str(idx), "overtime_hours": 38 + idx} for idx in range(5)])
+    run = EvaluationService(db_session, es).run("HR", rulepack.id, dataset.id)
+
+    assert len(es.searches) == 3
+    assert all(search["size"] == 2 and "pit" in search["body"] for search in es.searches)
+    rule_result = run.rule_results[0]
+    assert rule_result.summary["total_records"] == 5
+    assert rule_result.summary["counts"] == {"PASS": 3, "FAIL": 2}
+    assert sorted(trace.record_id for trace in rule_result.decisions) == ["0", "1", "2", "3", "4"]
+    assert run.status_counts == {"PASS": 3, "FAIL": 2}
+
+
+def test_decision_traces_are_written_in_batches_without_orm_objects(db_session):
+    rulepack = build_rulepack(db_session)
+    dataset = Dataset(name="bulk", host="http://mock", index_name="hr", query={"match_all": {}})
+    db_session.add(dataset)
+    db_session.commit()
+    es = FakeElasticsearch([{"_id": str(idx), "overtime_hours": idx * 10} for idx in range(7)])
+    service = EvaluationService(db_session, es, trace_batch_size=3)
+    run = service.run("HR", rulepack.id, dataset.id)
+
+    assert not any(isinstance(obj, DecisionTrace) for obj in db_session.identity_map.values())
+    rule_result = run.rule_results[0]
+    assert db_session.query(DecisionTrace).filter(DecisionTrace.rule_result_id == rule_result.id).count() == 7
+
+
+def test_parallel_evaluation_matches_serial(db_session):
+    rulepack = build_rulepack(db_session)
+    dataset = Dataset(name="parallel", host="http://mock", index_name="hr", query={"match_all": {}}, page_size=4)
+    db_session.add(dataset)
+    db_session.commit()
+    documents = [{"_id": str(idx), "overtime_hours": idx * 7} for idx in range(11)]
+
+    def traces(run):
+        return [
+            (trace.record_id, trace.status, trace.clauses, trace.rationale)
+            for result in run.rule_results
+            for trace in result.decisions
+        ]
+
+    serial_run = EvaluationService(db_session, FakeElasticsearch(documents)).run("HR", rulepack.id, dataset.id)
+    parallel_run = EvaluationService(db_session, FakeElasticsearch(documents), workers=3).run(
+        "HR", rulepack.id, dataset.id
+    )
+
+    assert parallel_run.status_counts == serial_run.status_counts
+    assert traces(parallel_run) == traces(serial_run)
+
+
+def test_failed_execution_marks_queued_run_failed(db_session):
+    rulepack = build_rulepack(db_session)
+    dataset = Dataset(name="broken", host="http://mock", index_name="hr", query={"match_all": {}})
+    db_session.add(dataset)
+    db_session.commit()
+
+    class BrokenElasticsearch(FakeElasticsearch):
+        def search(self, *args, **kwargs):
+            raise ConnectionError("cluster unavailable")
+
+    service = EvaluationService(db_session, BrokenElasticsearch([]))
+    run = service.create_run("HR", rulepack.id, dataset.id)
+    db_session.commit()
+    run_id = run.id
+
+    with pytest.raises(ConnectionError):
+        service.execute(run)
+
+    failed = db_session.get(Run, run_id)
+    assert failed.state == "failed"
+    assert "cluster unavailable" in failed.error
+    assert failed.rule_results == []
+    assert "rulepack" in failed.timing["phases"]
+
+
+def test_summary_mode_pushes_translatable_rules_down(db_session):
+    rulepack = build_rulepack(db_session)
+    rulepack.rules.append(
+        Rule(
+            order_index=2,
+            rule_no="HR-002",
+            new_rule_name="Untranslatable",
+            conditions=[{"field": "notes", "operator": "contains", "value": "late", "connector": None}],
+        )
+    )
+    dataset = Dataset(name="summary", host="http://mock", index_name="hr", query={"match_all": {}})
+    db_session.add(dataset)
+    db_session.commit()
+    documents = [
+        {"_id": "1", "overtime_hours": 45, "notes": "late again"},
+        {"_id": "2", "overtime_hours": 30, "notes": "fine"},
+        {"_id": "3", "overtime_hours": 41, "notes": "late"},
+    ]
+    full_run = EvaluationService(db_session, FakeElasticsearch(documents)).run("HR", rulepack.id, dataset.id)
+    summary_run = EvaluationService(db_session, FakeElasticsearch(documents)).run(
+        "HR", rulepack.id, dataset.id, options=RunOptions(mode="summary")
+    )
+
+    assert summary_run.status_counts == full_run.status_counts
+    by_rule = {result.summary["rule_no"]: result.summary for result in summary_run.rule_results}
+    assert by_rule["HR-001"]["evaluated_by"] == "elasticsearch"
+    assert by_rule["HR-002"]["evaluated_by"] == "engine"
+    assert by_rule["HR-001"]["counts"] == {"FAIL": 2, "PASS": 1}
+    assert all(not result.decisions for result in summary_run.rule_results)
+
+
+def test_summary_mode_matches_full_runs_on_array_data(db_session):
+    rulepack = build_rulepack(db_session)
+    for order, (rule_no, field, operator, value) in enumerate(
+        [
+            ("HR-002", "tags", "==", "x"),
+            ("HR-003", "owner.team", "!=", "ops"),
+            ("HR-004", "grade", ">", 4),
+            ("HR-005", "tags", "!=", "x"),
+        ],
+        start=2,
+    ):
+        rulepack.rules.append(
+            Rule(
+                order_index=order,
+                rule_no=rule_no,
+                new_rule_name=rule_no,
+                conditions=[{"field": field, "operator": operator, "value": value, "connector": None}],
+            )
+        )
+    dataset = Dataset(name="arrays", host="http://mock", index_name="hr", query={"match_all": {}})
+    db_session.add(dataset)
+    db_session.commit()
+    documents = [
+        {"_id": "1", "overtime_hours": 45, "tags": ["x", "y"], "owner": {"team": ["ops", "hr"]}, "grade": 3},
+        {"_id": "2", "overtime_hours": 30, "tags": "x", "owner": {"team": "hr"}, "grade": [1, 5]},
+        {"_id": "3", "overtime_hours": 41, "tags": "z", "owner": {"team": "ops"}, "grade": 7},
+    ]
+
+    def counts(**options):
+        run = EvaluationService(db_session, FakeElasticsearch(documents)).run(
+            "HR", rulepack.id, dataset.id, options=RunOptions(**options)
+        )
+        return {result.summary["rule_no"]: result.summary for result in run.rule_results}
+
+    full, summary = counts(), counts(mode="summary")
+
+    assert {rule_no: result["counts"] for rule_no, result in summary.items()} == {
+        rule_no: result["counts"] for rule_no, result in full.items()
+    }
+    assert {rule_no: result["evaluated_by"] for rule_no, result in summary.items()} == {
+        "HR-001": "elasticsearch",
+        "HR-002": "engine",
+        "HR-003": "engine",
+        "HR-004": "engine",
+        "HR-005": "engine",
+    }
+
+
+def test_summary_mode_logs_unreadable_mapping_and_evaluates_in_process(db_session, caplog):
+    rulepack = build_rulepack(db_session)
+    dataset = Dataset(name="summary", host="http://mock", index_name="hr", query={"match_all": {}})
+    db_session.add(dataset)
+    db_session.commit()
+
+    class ForbiddenMapping(FakeElasticsearch):
+        def __init__(self, documents):
+            super().__init__(documents)
+            self.indices.get_mapping = self._forbidden
+
+        @staticmethod
+        def _forbidden(index):
+            raise PermissionError("security_exception")
+
+    es = ForbiddenMapping([{"_id": "1", "overtime_hours": 45}])
+    with caplog.at_level("WARNING", logger="app.services.evaluation_service"):
+        run = EvaluationService(db_session, es).run("HR", rulepack.id, dataset.id, options=RunOptions(mode="summary"))
+
+    assert run.state == "completed"
+    assert run.rule_results[0].summary["evaluated_by"] == "engine"
+    assert "Could not read the mapping of index hr" in caplog.text
+    assert "security_exception" in caplog.text
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_trace_retention_policies_keep_exact_counts(db_session, workers):
+    rulepack = build_rulepack(db_session)
+    dataset = Dataset(name="retention", host="http://mock", index_name="hr", query={"match_all": {}}, page_size=3)
+    db_session.add(dataset)
+    db_session.commit()
+    documents = [{"_id": str(idx), "overtime_hours": 35 + idx} for idx in range(10)]
+
+    def run_with(**options):
+        service = EvaluationService(db_session, FakeElasticsearch(documents), workers=workers)
+        run = service.run("HR", rulepack.id, dataset.id, options=RunOptions(**options))
+        return run.rule_results[0]
+
+    failures = run_with(retention="failures")
+    assert failures.summary["counts"] == {"PASS": 6, "FAIL": 4}
+    assert sorted(trace.record_id for trace in failures.decisions) == ["6", "7", "8", "9"]
+
+    sampled = run_with(retention="sample", sample_size=2)
+    assert sampled.summary["counts"] == {"PASS": 6, "FAIL": 4}
+    statuses = [trace.status for trace in sampled.decisions]
+    assert statuses.count("PASS") == 2 and statuses.count("FAIL") == 2
+    assert len({trace.record_id for trace in sampled.decisions}) == 4
+
+    nothing = run_with(retention="none")
+    assert nothing.summary["counts"] == {"PASS": 6, "FAIL": 4}
+    assert nothing.summary["retention"] == "none"
+    assert nothing.decisions == []
+
+
+@pytest.mark.parametrize("engine", ["row", "vectorized"])
+def test_clause_rows_are_only_built_for_retained_records(engine, monkeypatch):
+    built = []
+    page_outcomes = EvaluationService._page_outcomes
+
+    def counting_page_outcomes(pool, documents, engine):
+        outcomes_for = page_outcomes(pool, documents, engine)
+
+        def counted(compiled):
+            outcomes = outcomes_for(compiled)
+            clauses = outcomes.clauses
+            outcomes.clauses = lambda index: built.append(index) or clauses(index)
+            return outcomes
+
+        return counted
+
+    monkeypatch.setattr(EvaluationService, "_page_outcomes", staticmethod(counting_page_outcomes))
+    spec = RuleSpec(
+        id=1,
+        rule_no="HR-001",
+        new_rule_name="Overtime Alert",
+        domain="HR",
+        rule_logic_business=None,
+        conditions=[{"field": "overtime_hours", "operator": ">", "value": 40}],
+        input_fields=("overtime_hours",),
+    )
+    documents = [{"_id": str(idx), "overtime_hours": 35 + idx} for idx in range(10)]
+
+    for retention, kept in (("failures", [6, 7, 8, 9]), ("none", [])):
+        built.clear()
+        [(decisions, counter)] = PageEvaluator([spec], engine, DEFAULT_LABELS, retention)(documents)
+        assert counter == {"PASS": 6, "FAIL": 4}
+        assert built == kept
+        assert [decision["record_id"] for decision in decisions] == [str(idx) for idx in kept]
+        assert all(decision["clauses"][0]["result"] is True for decision in decisions)
+
+
+def test_unknown_retention_policy_is_rejected():
+    with pytest.raises(ValueError):
+        RunOptions(retention="everything").validate()
+    with pytest.raises(ValueError):
+        RunOptions(retention="sample", sample_size=0).validate()
+
+
+def test_rationales_are_rendered_on_read(db_session):
+    rulepack = build_rulepack(db_session)
+    dataset = Dataset(name="rationale", host="http://mock", index_name="hr", query={"match_all": {}})
+    db_session.add(dataset)
+    db_session.commit()
+    es = FakeElasticsearch([{"_id": "1", "overtime_hours": 45}, {"_id": "2", "overtime_hours": 30}])
+    run = EvaluationService(db_session, es).run("HR", rulepack.id, dataset.id)
+
+    assert "rationale" not in DecisionTrace.__table__.columns
+    rationales = {trace.record_id: trace.rationale for trace in run.rule_results[0].decisions}
+    assert rationales["1"] == (
+        "Because overtime_hours value 45 satisfied > 40, the rule triggered and marked the record as FAIL."
+    )
+    assert rationales["2"] == "Clause overtime_hours value 30 did not satisfy > 40, so the record is considered PASS."
+
+
+def test_decisions_of_deleted_rules_still_render(client, db_session):
+    rulepack = build_rulepack(db_session)
+    dataset = Dataset(name="rationale", host="http://mock", index_name="hr", query={"match_all": {}})
+    db_session.add(dataset)
+    db_session.commit()
+    run = EvaluationService(db_session, FakeElasticsearch([{"_id": "1", "overtime_hours": 45}])).run(
+        "HR", rulepack.id, dataset.id
+    )
+    run_rule = run.rule_results[0]
+    run_rule.decisions[0].clauses = []
+    db_session.commit()
+    assert client.delete(f"/api/rulepacks/rules/{run_rule.rule_id}").status_code == 200
+
+    response = client.get(f"/api/runs/{run.id}/decisions", params={"rule_id": run_rule.rule_id})
+
+    assert response.status_code == 200
+    assert [item["rationale"] for item in response.json()["items"]] == [f"Rule {run_rule.rule_id} (deleted)"]
+
+
+def test_incremental_run_only_evaluates_changed_documents_and_rules(db_session):
+    rulepack = build_rulepack(db_session)
+    rulepack.rules.append(
+        Rule(
+            order_index=2,
+            rule_no="HR-002",
+            new_rule_name="Night shifts",
+            conditions=[{"field": "night_shifts", "operator": ">", "value": 3, "connector": None}],
+        )
+    )
+    dataset = Dataset(
+        name="incremental", host="http://mock", index_name="hr", query={"match_all": {}}, change_field="updated_at"
+    )
+    db_session.add(dataset)
+    db_session.commit()
+    documents = [
+        {"_id": str(idx), "overtime_hours": 38 + idx, "night_shifts": idx, "updated_at": idx} for idx in range(5)
+    ]
+    es = FakeElasticsearch(documents)
+    baseline = EvaluationService(db_session, es).run("HR", rulepack.id, dataset.id)
+    assert baseline.watermark == {"field": "updated_at", "value": 4}
+
+    documents[1].update(overtime_hours=50, updated_at=10)
+    documents.append({"_id": "5", "overtime_hours": 45, "night_shifts": 0, "updated_at": 11})
+    es.documents = list(documents)
+    rulepack.rules[1].conditions = [{"field": "night_shifts", "operator": ">", "value": 1, "connector": None}]
+    db_session.commit()
+
+    es.searches.clear()
+    incremental = EvaluationService(db_session, es).run(
+        "HR", rulepack.id, dataset.id, options=RunOptions(baseline_run_id=baseline.id)
+    )
+    full = EvaluationService(db_session, FakeElasticsearch(documents)).run("HR", rulepack.id, dataset.id)
+
+    def traces(result):
+        return sorted((trace.record_id, trace.status, trace.inputs) for trace in result.decisions)
+
+    by_rule = {result.summary["rule_no"]: result for result in incremental.rule_results}
+    assert by_rule["HR-001"].summary["evaluated_by"] == "incremental"
+    assert by_rule["HR-002"].summary["evaluated_by"] == "engine"
+    assert [len(search["body"].get("query", {}).get("bool", {}).get("filter", [])) for search in es.searches] == [0, 2]
+    assert incremental.baseline_run_id == baseline.id
+    assert incremental.watermark == {"field": "updated_at", "value": 11}
+    assert incremental.status_counts == full.status_counts
+    for incremental_result, full_result in zip(incremental.rule_results, full.rule_results):
+        assert incremental_result.summary["counts"] == full_result.summary["counts"]
+        assert incremental_result.summary["total_records"] == full_result.summary["total_records"]
+        assert traces(incremental_result) == traces(full_result)
+
+
+def test_incremental_run_requires_a_watermarked_baseline(db_session):
+    rulepack = build_rulepack(db_session)
+    dataset = Dataset(name="plain", host="http://mock", index_name="hr", query={"match_all": {}})
+    db_session.add(dataset)
+    db_session.commit()
+    service = EvaluationService(db_session, FakeElasticsearch([{"_id": "1", "overtime_hours": 45}]))
+    baseline = service.run("HR", rulepack.id, dataset.id)
+
+    with pytest.raises(ValueError, match="watermark"):
+        service.resolve_baseline(baseline.id, rulepack.id, dataset.id)
+    with pytest.raises(ValueError):
+        RunOptions(baseline_run_id=baseline.id, retention="sample").validate()
+
+
+@pytest.mark.parametrize("engine", ["row", "vectorized"])
+def test_nested_documents_are_evaluated_and_projected(db_session, engine):
+    rulepack = build_rulepack(db_session)
+    rule = rulepack.rules[0]
+    rule.conditions = [{"field": "shifts[all].hours", "operator": ">", "value": 8, "connector": None}]
+    rule.original_fields = ["employee.grade"]
+    dataset = Dataset(name="test", host="http://mock", index_name="hr", query={"query": {"match_all": {}}})
+    db_session.add(dataset)
+    db_session.commit()
+    documents = [
+        {"_id": "1", "employee": {"grade": "B"}, "shifts": [{"hours": 9}, {"hours": 10}]},
+        {"_id": "2", "employee": {"grade": "C"}, "shifts": [{"hours": 9}, {"hours": 4}]},
+    ]
+
+    run = EvaluationService(db_session, FakeElasticsearch(documents)).run(
+        "HR", rulepack.id, dataset.id, options=RunOptions(engine=engine)
+    )
+
+    decisions = {trace.record_id: trace for trace in run.rule_results[0].decisions}
+    assert (decisions["1"].status, decisions["2"].status) == ("FAIL", "PASS")
+    assert decisions["1"].inputs == {"employee.grade": "B", "shifts[all].hours": [9, 10]}
+
+
+def test_only_referenced_fields_are_fetched(db_session):
+    rulepack = build_rulepack(db_session)
+    rulepack.rules[0].conditions = [{"field": "shifts[all].hours", "operator": ">", "value": 8, "connector": None}]
+    dataset = Dataset(
+        name="test",
+        host="http://mock",
+        index_name="hr",
+        query={"query": {"match_all": {}}},
+        change_field="updated_at",
+    )
+    db_session.add(dataset)
+    db_session.commit()
+    es = FakeElasticsearch(
+        [{"_id": "1", "overtime_hours": 45, "updated_at": 3, "shifts": [{"hours": 9, "site": "A"}], "notes": "x" * 100}]
+    )
+
+    run = EvaluationService(db_session, es).run("HR", rulepack.id, dataset.id)
+
+    page_searches = [search for search in es.searches if "pit" in search["body"]]
+    assert page_searches[0]["body"]["_source"] == ["overtime_hours", "shifts.hours", "updated_at"]
+    assert run.watermark == {"field": "updated_at", "value": 3}
+    trace = run.rule_results[0].decisions[0]
+    assert trace.inputs == {"overtime_hours": 45, "shifts[all].hours": [9]}
+
+
+def test_run_records_phase_and_rule_timing(db_session):
+    rulepack = build_rulepack(db_session)
+    dataset = Dataset(name="timed", host="http://mock", index_name="hr", query={"query": {"match_all": {}}}, page_size=2)
+    db_session.add(dataset)
+    db_session.commit()
+    es = FakeElasticsearch([{"_id": str(i), "overtime_hours": 35 + i} for i in range(5)])
+
+    run = EvaluationService(db_session, es).run("HR", rulepack.id, dataset.id)
+
+    timing = run.timing
+    assert timing["documents"] == 5
+    assert timing["profile"] is None
+    phases = timing["phases"]
+    assert {"rulepack", "prepare", "fetch", "fetch_wait", "evaluate", "clauses", "write_traces", "summarize", "commit"} <= set(phases)
+    assert phases["fetch"]["items"] == 5
+    assert phases["evaluate"]["calls"] == 3
+    assert phases["write_traces"]["items"] == 5
+    assert all(phase["wall_seconds"] >= 0 and phase["cpu_seconds"] >= 0 for phase in phases.values())
+    assert [(rule["rule_no"], rule["items"]) for rule in timing["rules"]] == [("HR-001", 5)]
+
+
+def test_profiled_run_dumps_cprofile_stats(db_session, tmp_path, monkeypatch):
+    import pstats
+
+    from app.core.config import Settings
+    from app.services import evaluation_service as evaluation_module
+
+    settings = Settings(run_export_dir=str(tmp_path / "exports"))
+    monkeypatch.setattr(evaluation_module, "get_settings", lambda: settings)
+    rulepack = build_rulepack(db_session)
+    dataset = Dataset(name="profiled", host="http://mock", index_name="hr", query={"query": {"match_all": {}}})
+    db_session.add(dataset)
+    db_session.commit()
+    es = FakeElasticsearch([{"_id": "1", "overtime_hours": 45}])
+
+    run = EvaluationService(db_session, es).run("HR", rulepack.id, dataset.id, options=RunOptions(profile=True))
+
+    profile_path = tmp_path / "exports" / f"run_{run.id}.prof"
+    assert run.timing["profile"] == str(profile_path)
+    stats = pstats.Stats(str(profile_path))
+    assert any(function == "_execute" for _, _, function in stats.stats)
+
+
+def test_profiling_is_skipped_while_another_run_is_profiled(db_session, tmp_path, monkeypatch):
+    from app.core.config import Settings
+    from app.services import evaluation_service as evaluation_module
+
+    settings = Settings(run_export_dir=str(tmp_path / "exports"))
+    monkeypatch.setattr(evaluation_module, "get_settings", lambda: settings)
+    rulepack = build_rulepack(db_session)
+    dataset = Dataset(name="profiled", host="http://mock", index_name="hr", query={"query": {"match_all": {}}})
+    db_session.add(dataset)
+    db_session.commit()
+    es = FakeElasticsearch([{"_id": "1", "overtime_hours": 45}])
+
+    with evaluation_module._profile_lock:
+        run = EvaluationService(db_session, es).run("HR", rulepack.id, dataset.id, options=RunOptions(profile=True))
+    assert run.state == "completed"
+    assert run.timing["profile"] is None
+
+    run = EvaluationService(db_session, es).run("HR", rulepack.id, dataset.id, options=RunOptions(profile=True))
+    assert run.timing["profile"] == str(tmp_path / "exports" / f"run_{run.id}.prof")
+
+
+def test_profiler_setup_failure_marks_run_failed(db_session, monkeypatch):
+    from app.services import evaluation_service as evaluation_module
+
+    def broken_profile_path(run_id):
+        raise OSError("export directory is read-only")
+
+    monkeypatch.setattr(evaluation_module, "_profile_path", broken_profile_path)
+    rulepack = build_rulepack(db_session)
+    dataset = Dataset(name="profiled", host="http://mock", index_name="hr", query={"query": {"match_all": {}}})
+    db_session.add(dataset)
+    db_session.commit()
+    service = EvaluationService(db_session, FakeElasticsearch([{"_id": "1", "overtime_hours": 45}]))
+    run = service.create_run("HR", rulepack.id, dataset.id)
+    db_session.commit()
+
+    with pytest.raises(OSError):
+        service.execute(run, options=RunOptions(profile=True))
+
+    stored = db_session.get(Run, run.id)
+    assert stored.state == "failed"
+    assert stored.error == "export directory is read-only"
+    assert not evaluation_module._profile_lock.locked()
+
+
+def test_run_cpu_time_excludes_other_threads():
+    import threading
+    import time
+
+    from app.services.run_timing import RunTiming
+
+    timing = RunTiming()
+
+    def burn():
+        deadline = time.perf_counter() + 0.3
+        while time.perf_counter() < deadline:
+            pass
+
+    worker = threading.Thread(target=burn)
+    worker.start()
+    worker.join()
+
+    assert timing.as_dict()["cpu_seconds"] < 0.1
@@ -0,0 +1,63 @@
+import pytest
+
+from app.utils.conditions import ConditionParserError, compile_clauses, parse_conditions
+from app.utils.field_paths import AllValues, AnyValues, compile_field_path
+
+DOCUMENT = {
+    "amount": 12,
+    "employee": {"grade": "B", "address": {"city": "Dubai"}},
+    "employee.grade": "A",
+    "items": [{"price": 3, "tags": ["x"]}, {"price": 7}, {"sku": "no-price"}],
+    "single": {"price": 9},
+}
+
+
+def test_flat_and_nested_paths():
+    assert compile_field_path("amount").get(DOCUMENT) == 12
+    assert compile_field_path("employee.address.city").get(DOCUMENT) == "Dubai"
+    # A literal dotted key wins over the nested lookup.
+    assert compile_field_path("employee.grade").get(DOCUMENT) == "A"
+    assert compile_field_path("employee.missing.city").get(DOCUMENT) is None
+
+
+def test_array_paths_collect_values_with_their_quantifier():
+    implicit = compile_field_path("items.price").get(DOCUMENT)
+    assert isinstance(implicit, AnyValues) and implicit == (3, 7)
+    assert compile_field_path("items[].price").get(DOCUMENT) == AnyValues((3, 7))
+    every = compile_field_path("items[all].price").get(DOCUMENT)
+    assert isinstance(every, AllValues) and every == (3, 7)
+    assert compile_field_path("single[].price").get(DOCUMENT) == (9,)
+    assert compile_field_path("items[].tags").get(DOCUMENT) == (["x"],)
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("items.price > 5", True),
+        ("items[any].price > 5", True),
+        ("items[all].price > 5", False),
+        ("items[all].price > 2", True),
+        ("missing[].price > 2", False),
+        ("NOT missing[].price", True),
+    ],
+)
+def test_clauses_match_array_paths(raw, expected):
+    compiled = compile_clauses(parse_conditions(raw))
+    assert compiled.matches(compiled.evaluate(DOCUMENT)) is expected
+
+
+def test_mixed_quantifiers_are_rejected():
+    with pytest.raises(ConditionParserError):
+        compile_clauses([{"field": "a[all].b[any].c", "operator": ">", "value": 1, "connector": None}])
+    with pytest.raises(ConditionParserError):
+        parse_conditions("a[all].b[any].c > 1")
+
+
+def test_fields_with_empty_dot_segments_are_flat_keys():
+    path = compile_field_path("Ref. No.")
+    assert not path.multi_valued
+    assert path.get({"Ref. No.": 7}) == 7
+
+    compiled = compile_clauses(parse_conditions("Ref. No. > 5"))
+    assert compiled.matches(compiled.evaluate({"Ref. No.": 7})) is True
+    assert compiled.matches(compiled.evaluate({"Ref. No.": 3})) is False
@@ -0,0 +1,57 @@
+from app.core.metrics import DB_COMMIT_SECONDS, RUNS, TRACES_WRITTEN, MetricsRegistry
+from app.models.dataset import Dataset
+from app.services.evaluation_service import EvaluationService
+from backend.tests.conftest import FakeElasticsearch
+from backend.tests.test_evaluation_service import build_rulepack
+
+
+def test_registry_renders_prometheus_text_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("app_requests", "Requests.", ("route",))
+    latency = registry.histogram("app_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    requests.inc(route='/a"b')
+    requests.inc(2, route='/a"b')
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    lines = registry.render().splitlines()
+
+    assert lines == [
+        "# HELP app_requests Requests.",
+        "# TYPE app_requests counter",
+        'app_requests_total{route="/a\\"b"} 3',
+        "# HELP app_latency_seconds Latency.",
+        "# TYPE app_latency_seconds histogram",
+        'app_latency_seconds_bucket{le="0.1"} 1',
+        'app_latency_seconds_bucket{le="1"} 2',
+        'app_latency_seconds_bucket{le="+Inf"} 3',
+        "app_latency_seconds_sum 5.55",
+        "app_latency_seconds_count 3",
+    ]
+
+
+def test_metrics_endpoint_reports_requests_runs_and_caches(client, db_session):
+    rulepack = build_rulepack(db_session)
+    dataset = Dataset(name="metrics", host="http://mock", index_name="hr", query={"query": {"match_all": {}}})
+    db_session.add(dataset)
+    db_session.commit()
+    completed = RUNS.value(state="completed")
+    traces = TRACES_WRITTEN.value()
+    commits = DB_COMMIT_SECONDS.count()
+    es = FakeElasticsearch([{"_id": "1", "overtime_hours": 45}, {"_id": "2", "overtime_hours": 30}])
+
+    run = EvaluationService(db_session, es).run("HR", rulepack.id, dataset.id)
+    assert client.get(f"/api/runs/{run.id}").status_code == 200
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert RUNS.value(state="completed") == completed + 1
+    assert TRACES_WRITTEN.value() == traces + 2
+    assert DB_COMMIT_SECONDS.count() > commits
+    body = response.text
+    assert 'ruletrail_http_request_duration_seconds_count{method="GET",route="/api/runs/{run_id}"}' in body
+    assert "ruletrail_elasticsearch_fetch_duration_seconds_count" in body
+    assert 'ruletrail_cache_hit_ratio{cache="rulepack"}' in body
+    assert 'ruletrail_cache_misses_total{cache="field_path"}' in body
@@ -4,6 +4,7 @@ from pathlib import Path
 import pytest
 
 from app.core import config as config_module
+from app.services import es_clients
 from backend.tests.conftest import FakeElasticsearch
 
 
@@ -19,14 +20,18 @@ def test_populate_demo_main(monkeypatch, tmp_path, capsys):
 
     fake_es = FakeElasticsearch([])
 
-    def _fake_es(hosts):
+    def _fake_es(hosts, **options):
         assert hosts == settings.elasticsearch_hosts
         return fake_es
 
     import app.scripts.populate_demo as script
 
-    monkeypatch.setattr(script, "Elasticsearch", _fake_es)
-    monkeypatch.setattr(script, "parse_args", lambda: script.argparse.Namespace(seed_path=None))
+    monkeypatch.setattr(es_clients, "Elasticsearch", _fake_es)
+    monkeypatch.setattr(
+        script,
+        "parse_args",
+        lambda: script.argparse.Namespace(seed_path=None, chunk_size=None, concurrency=None, index=None),
+    )
 
     result = script.main()
     captured = capsys.readouterr()
@@ -44,8 +49,12 @@ def test_populate_demo_missing_seed(monkeypatch, tmp_path):
 
     import app.scripts.populate_demo as script
 
-    monkeypatch.setattr(script, "Elasticsearch", lambda hosts: FakeElasticsearch([]))
-    monkeypatch.setattr(script, "parse_args", lambda: script.argparse.Namespace(seed_path=None))
+    monkeypatch.setattr(es_clients, "Elasticsearch", lambda hosts, **options: FakeElasticsearch([]))
+    monkeypatch.setattr(
+        script,
+        "parse_args",
+        lambda: script.argparse.Namespace(seed_path=None, chunk_size=None, concurrency=None, index=None),
+    )
 
     with pytest.raises(SystemExit) as excinfo:
         script.main()
@@ -0,0 +1,65 @@
+from app.models.dataset import Dataset
+from app.services.evaluation_service import EvaluationService
+from app.services.rulepack_cache import RulepackCache, get_rulepack_cache
+from backend.tests.conftest import FakeElasticsearch
+from backend.tests.test_evaluation_service import build_rulepack
+
+
+def _dataset(db_session):
+    dataset = Dataset(name="test", host="http://mock", index_name="hr", query={"query": {"match_all": {}}})
+    db_session.add(dataset)
+    db_session.commit()
+    return dataset
+
+
+def test_runs_reuse_the_compiled_rulepack(db_session):
+    rulepack = build_rulepack(db_session)
+    dataset = _dataset(db_session)
+    service = EvaluationService(db_session, FakeElasticsearch([{"_id": "1", "overtime_hours": 45}]))
+
+    first = service.run("HR", rulepack.id, dataset.id)
+    second = service.run("HR", rulepack.id, dataset.id)
+
+    assert first.status_counts == second.status_counts == {"FAIL": 1}
+    stats = get_rulepack_cache().stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+    cached = get_rulepack_cache().get(db_session, rulepack.id)
+    assert cached.domain == "HR"
+    assert [spec.rule_no for spec in cached.specs] == ["HR-001"]
+
+
+def test_rule_edits_through_the_api_invalidate_the_cache(client, db_session):
+    rulepack = build_rulepack(db_session)
+    dataset = _dataset(db_session)
+    service = EvaluationService(db_session, FakeElasticsearch([{"_id": "1", "overtime_hours": 45}]))
+    assert service.run("HR", rulepack.id, dataset.id).status_counts == {"FAIL": 1}
+
+    rule = rulepack.rules[0]
+    payload = {
+        "order_index": rule.order_index,
+        "rule_no": rule.rule_no,
+        "new_rule_name": rule.new_rule_name,
+        "conditions": [{"field": "overtime_hours", "operator": ">", "value": 50, "connector": None}],
+    }
+    assert client.put(f"/api/rulepacks/rules/{rule.id}", json=payload).status_code == 200
+    assert get_rulepack_cache().stats()["size"] == 0
+
+    assert service.run("HR", rulepack.id, dataset.id).status_counts == {"PASS": 1}
+    stats = client.get("/api/rulepacks/cache/stats").json()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (0, 2, 1)
+
+    assert client.delete(f"/api/rulepacks/rules/{rule.id}").status_code == 200
+    assert get_rulepack_cache().stats()["size"] == 0
+
+
+def test_cache_evicts_least_recently_used_rulepacks(db_session):
+    first = build_rulepack(db_session)
+    cache = RulepackCache(maxsize=1)
+    cache.get(db_session, first.id)
+    first.checksum = "edited"
+    db_session.commit()
+
+    cache.get(db_session, first.id)
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["misses"] == 2
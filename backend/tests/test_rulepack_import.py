@@ -2,7 +2,7 @@ import io
 
 import pandas as pd
 
-from app.models.rulepack import RulePack
+from app.models.rulepack import Rule, RulePack
 import pytest
 
 from app.services.rulepack_service import RulepackImportError, load_rulepack_from_excel
@@ -109,3 +109,70 @@ def test_load_rulepack_from_excel_raises_on_invalid_conditions(db_session):
     assert "Unable to parse conditions" in str(excinfo.value)
     assert excinfo.value.sheet == "HR"
     assert excinfo.value.row == 1
+
+
+def create_multi_sheet_excel_bytes(broken_row=None):
+    hr_rows = [
+        {"S. No.": 1, "Rule No.": "HR-010", "Conditions AND OR": "amount > 10", "Original Fields": "amount, grade\nband", "Notes": 5},
+        {"S. No.": None, "Rule No.": None, "Conditions AND OR": None, "Original Fields": None, "Notes": None},
+        {"S. No.": 3, "Rule No.": None, "DE_RuleName": "Grade check", "Conditions AND OR": "grade and NOT band", "Original Fields": 7, "Notes": 2.5},
+    ]
+    finance_rows = [
+        {"Rule No.": "FIN-001", "Conditions AND OR": "status == 'OPEN'"},
+        {"Rule No.": "FIN-002", "Conditions AND OR": "amount > 1"},
+    ]
+    if broken_row is not None:
+        finance_rows[broken_row]["Conditions AND OR"] = "amount ~~ 10"
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
+        pd.DataFrame(hr_rows).to_excel(writer, sheet_name="HR", index=False)
+        pd.DataFrame(finance_rows).to_excel(writer, sheet_name="Finance", index=False)
+    return buffer.getvalue()
+
+
+def _rule_rows(rulepacks):
+    columns = [column.name for column in Rule.__table__.columns if column.name not in {"id", "rulepack_id"}]
+    return [
+        (rulepack.domain, [{column: getattr(rule, column) for column in columns} for rule in rulepack.rules])
+        for rulepack in rulepacks
+    ]
+
+
+def test_load_rulepack_from_excel_maps_rows_by_position(db_session):
+    timings = []
+    rulepacks = load_rulepack_from_excel(db_session, create_multi_sheet_excel_bytes(), timings=timings)
+
+    assert [timing.sheet for timing in timings] == ["HR", "Finance"]
+    assert [timing.rules for timing in timings] == [2, 2]
+    hr_rules = sorted(rulepacks[0].rules, key=lambda rule: rule.order_index)
+    assert [rule.order_index for rule in hr_rules] == [1, 3]
+    assert hr_rules[0].original_fields == ["amount", "grade", "band"]
+    assert hr_rules[0].new_rule_name == "Rule 0"
+    assert hr_rules[0].extra == {"S. No.": 1.0, "Notes": 5.0}
+    assert hr_rules[1].rule_no == "2"
+    assert hr_rules[1].new_rule_name == "Grade check"
+    assert hr_rules[1].original_fields == [7]
+    finance_rules = sorted(rulepacks[1].rules, key=lambda rule: rule.order_index)
+    assert [rule.order_index for rule in finance_rules] == [1, 2]
+
+
+def test_load_rulepack_from_excel_parallel_matches_serial(db_session):
+    serial = load_rulepack_from_excel(db_session, create_multi_sheet_excel_bytes(), workers=1)
+    serial_rows = _rule_rows(serial)
+    for rulepack in serial:
+        db_session.delete(rulepack)
+    db_session.commit()
+
+    parallel = load_rulepack_from_excel(db_session, create_multi_sheet_excel_bytes(), workers=2)
+
+    assert _rule_rows(parallel) == serial_rows
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_load_rulepack_from_excel_reports_first_failing_sheet(db_session, workers):
+    with pytest.raises(RulepackImportError) as excinfo:
+        load_rulepack_from_excel(db_session, create_multi_sheet_excel_bytes(broken_row=1), workers=workers)
+
+    assert excinfo.value.sheet == "Finance"
+    assert excinfo.value.row == 2
+    assert db_session.query(RulePack).count() == 0
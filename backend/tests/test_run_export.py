@@ -0,0 +1,180 @@
+import gzip
+import json
+
+import pytest
+import yaml
+
+from app.models.dataset import Dataset
+from app.schemas.common import Run as RunSchema
+from app.services.evaluation_service import EvaluationService
+from app.models.run import DecisionTrace
+from app.services.columnar_export import _coerce, _merge_kinds, _value_kind, require_pyarrow
+from app.services.run_export import RunExporter
+from backend.tests.test_evaluation_service import build_rulepack
+from backend.tests.conftest import FakeElasticsearch
+
+
+def create_run(db_session, count=5):
+    rulepack = build_rulepack(db_session)
+    dataset = Dataset(name="export", host="http://mock", index_name="hr", query={"match_all": {}})
+    db_session.add(dataset)
+    db_session.commit()
+    es = FakeElasticsearch([{"_id": str(idx), "overtime_hours": 38 + idx} for idx in range(count)])
+    return EvaluationService(db_session, es).run("HR", rulepack.id, dataset.id)
+
+
+def test_json_export_matches_run_schema(db_session, tmp_path):
+    run = create_run(db_session)
+    path = RunExporter(db_session, run, chunk_size=2).write(tmp_path / "run.json", "json")
+
+    expected = json.loads(json.dumps(RunSchema.from_orm(run).dict(), default=str))
+    assert json.loads(path.read_text()) == expected
+
+
+def test_ndjson_export_streams_gzip_records_in_chunks(db_session, tmp_path):
+    run = create_run(db_session)
+    path = RunExporter(db_session, run, chunk_size=2).write(tmp_path / "run.ndjson.gz", "ndjson", compress=True)
+
+    records = [json.loads(line) for line in gzip.decompress(path.read_bytes()).decode().splitlines()]
+    assert [record["type"] for record in records] == ["run", "rule_result"] + ["decision"] * 5
+    assert records[0]["id"] == run.id
+    assert [record["record_id"] for record in records[2:]] == ["0", "1", "2", "3", "4"]
+    assert all(record["rationale"] for record in records[2:])
+
+
+def test_yaml_export_without_decisions(db_session):
+    run = create_run(db_session)
+    exporter = RunExporter(db_session, run, include_decisions=False)
+    documents = list(yaml.safe_load_all("".join(exporter.iter_text("yaml"))))
+
+    assert [document["type"] for document in documents] == ["run", "rule_result"]
+    assert documents[1]["summary"]["counts"] == {"PASS": 3, "FAIL": 2}
+
+
+def test_export_endpoint_streams_response(client, db_session):
+    run = create_run(db_session, count=3)
+    response = client.post(f"/api/runs/{run.id}/export", json={"format": "ndjson", "stream": True})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert len(response.text.splitlines()) == 2 + 3
+    assert client.post(f"/api/runs/{run.id}/export", json={"format": "xml"}).status_code == 400
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_columnar_export_writes_row_groups(db_session, tmp_path, fmt):
+    try:
+        pa = require_pyarrow()
+    except ValueError:
+        pytest.skip("pyarrow is not available")
+
+    run = create_run(db_session)
+    path = RunExporter(db_session, run, chunk_size=2).write(tmp_path / f"run.{fmt}", fmt)
+
+    if fmt == "parquet":
+        parquet_file = pa.parquet.ParquetFile(path)
+        assert parquet_file.metadata.num_row_groups == 3
+        table = parquet_file.read()
+    else:
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+    rows = table.to_pylist()
+    assert [row["record_id"] for row in rows] == ["0", "1", "2", "3", "4"]
+    assert [row["clause_0"] for row in rows] == [False, False, False, True, True]
+    assert {row["rule_no"] for row in rows} == {"HR-001"}
+    assert table.schema.field("input.overtime_hours").type == pa.int64()
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_columnar_export_widens_types_seen_after_the_first_row_group(db_session, tmp_path, fmt):
+    try:
+        pa = require_pyarrow()
+    except ValueError:
+        pytest.skip("pyarrow is not available")
+
+    run = create_run(db_session, count=3)
+    traces = db_session.query(DecisionTrace).order_by(DecisionTrace.id).all()
+    traces[2].inputs = {"overtime_hours": 40.5}
+    db_session.commit()
+
+    path = RunExporter(db_session, run, chunk_size=2).write(tmp_path / f"run.{fmt}", fmt)
+
+    if fmt == "parquet":
+        table = pa.parquet.read_table(path)
+    else:
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+    assert table.schema.field("input.overtime_hours").type == pa.float64()
+    assert table.column("input.overtime_hours").to_pylist() == [38.0, 39.0, 40.5]
+
+
+def test_input_kinds_widen_instead_of_dropping_values():
+    values = [None, 3, 2.5, None]
+    kind = None
+    for value in values:
+        kind = _merge_kinds(kind, _value_kind(value))
+    assert kind == "float"
+    assert [_coerce(value, kind) for value in values] == [None, 3.0, 2.5, None]
+
+    assert _merge_kinds("int", _value_kind(True)) == "string"
+    assert _merge_kinds("float", _value_kind({"a": 1})) == "string"
+    assert _value_kind(2**64) == "string"
+    assert [_coerce(value, "string") for value in (7, True, {"a": 1})] == ["7", "True", '{"a": 1}']
+    assert _merge_kinds(None, None) is None
+
+
+def test_columnar_export_rejects_gzip():
+    with pytest.raises(ValueError):
+        RunExporter.validate_format("parquet", compress=True)
+
+
+def test_streamed_export_returns_its_connection(client, db_session, tmp_path, monkeypatch):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.db import session as session_module
+    from app.db.base import Base
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    FileSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    setup_db = FileSessionLocal()
+    run_id = create_run(setup_db, count=3).id
+    setup_db.close()
+    monkeypatch.setattr(session_module, "SessionLocal", FileSessionLocal)
+
+    response = client.post(f"/api/runs/{run_id}/export", json={"format": "ndjson", "stream": True})
+
+    assert len(response.text.splitlines()) == 2 + 3
+    assert engine.pool.checkedout() == 0
+    engine.dispose()
+
+
+def test_export_keeps_decisions_of_deleted_rules(client, db_session, tmp_path):
+    run = create_run(db_session, count=3)
+    rule_id = run.rule_results[0].rule_id
+    assert client.delete(f"/api/rulepacks/rules/{rule_id}").status_code == 200
+    db_session.expire_all()
+
+    exporter = RunExporter(db_session, run)
+    decisions = list(exporter.iter_decisions())
+    assert [decision["record_id"] for decision in decisions] == ["0", "1", "2"]
+    assert all(decision["rationale"] for decision in decisions)
+
+    trace = db_session.query(DecisionTrace).order_by(DecisionTrace.id).first()
+    trace.clauses = []
+    db_session.commit()
+    assert next(exporter.iter_decisions())["rationale"] == f"Rule {rule_id} (deleted)"
+    trace.clauses = [{"field": "overtime_hours", "operator": ">", "value": 40, "connector": None, "result": False}]
+    db_session.commit()
+
+    try:
+        pa = require_pyarrow()
+    except ValueError:
+        return
+    path = exporter.write(tmp_path / "run.parquet", "parquet")
+    rows = pa.parquet.read_table(path).to_pylist()
+    assert [row["record_id"] for row in rows] == ["0", "1", "2"]
+    assert {(row["rule_id"], row["rule_no"]) for row in rows} == {(rule_id, "HR-001")}
+    assert [row["input.overtime_hours"] for row in rows] == [38, 39, 40]
+    assert [row["clause_0"] for row in rows] == [False, False, False]
@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+
+from app.models.dataset import Dataset
+from app.models.run import RUN_COMPLETED, RUN_FAILED, RUN_QUEUED, RUN_RUNNING, Run
+from app.services.evaluation_service import EvaluationService
+from app.services.run_queue import (
+    CANCELLED_RUN_ERROR,
+    ORPHANED_RUN_ERROR,
+    RunCancelled,
+    RunProgress,
+    RunQueue,
+    fail_orphaned_runs,
+)
+from backend.tests.conftest import FakeElasticsearch
+from backend.tests.test_evaluation_service import build_rulepack
+
+
+def create_dataset(db_session):
+    dataset = Dataset(name="queue", host="http://mock", index_name="hr", query={"match_all": {}})
+    db_session.add(dataset)
+    db_session.commit()
+    return dataset
+
+
+def test_fail_orphaned_runs_only_touches_unfinished_runs(db_session):
+    rulepack = build_rulepack(db_session)
+    dataset = create_dataset(db_session)
+    service = EvaluationService(db_session, FakeElasticsearch([]))
+    runs = {state: service.create_run("HR", rulepack.id, dataset.id) for state in (RUN_QUEUED, RUN_RUNNING, RUN_COMPLETED)}
+    for state, run in runs.items():
+        run.state = state
+    db_session.commit()
+
+    assert fail_orphaned_runs(db_session) == 2
+
+    db_session.expire_all()
+    for state in (RUN_QUEUED, RUN_RUNNING):
+        assert runs[state].state == RUN_FAILED
+        assert runs[state].error == ORPHANED_RUN_ERROR
+        assert runs[state].completed_at is not None
+    assert runs[RUN_COMPLETED].state == RUN_COMPLETED
+    assert runs[RUN_COMPLETED].error is None
+
+
+def test_shutdown_does_not_wait_for_active_runs():
+    queue = RunQueue(workers=1)
+    started = threading.Event()
+
+    def long_run(progress: RunProgress) -> None:
+        started.set()
+        while True:
+            progress.raise_if_cancelled()
+            time.sleep(0.01)
+
+    active = queue.submit(1, long_run)
+    pending = queue.submit(2, long_run)
+    assert started.wait(5)
+
+    began = time.perf_counter()
+    queue.shutdown()
+    assert time.perf_counter() - began < 1
+
+    assert pending.cancelled()
+    with pytest.raises(RunCancelled):
+        active.result(timeout=5)
+
+
+def test_cancelled_run_is_marked_failed(db_session):
+    rulepack = build_rulepack(db_session)
+    dataset = create_dataset(db_session)
+    service = EvaluationService(db_session, FakeElasticsearch([{"_id": "1", "overtime_hours": 50}]))
+    run = service.create_run("HR", rulepack.id, dataset.id)
+    progress = RunProgress()
+    progress.cancel()
+
+    with pytest.raises(RunCancelled):
+        service.execute(run, progress=progress)
+
+    stored = db_session.get(Run, run.id)
+    assert stored.state == RUN_FAILED
+    assert stored.error == CANCELLED_RUN_ERROR
@@ -0,0 +1,90 @@
+import gzip
+import io
+import json
+
+import pytest
+
+from app.utils import seeder
+from app.utils.seeder import SeedError, bulk_seed, iter_json_documents, iter_ndjson_documents
+from backend.tests.conftest import FakeElasticsearch
+
+SEED = {
+    "hr": [{"id": "1", "hours": 12.5, "tags": ["a", "b"], "nested": {"x": [1, {"y": None}]}}, {"id": "2", "note": "}],[{"}],
+    "empty": [],
+    "finance": [{"id": "F1", "amount": 18000}, {"amount": -3e-5, "flag": True}],
+}
+
+
+def test_json_stream_matches_json_loads_across_tiny_reads(monkeypatch):
+    monkeypatch.setattr(seeder, "_READ_SIZE", 3)
+    text = json.dumps(SEED, indent=2)
+
+    documents = list(iter_json_documents(io.StringIO(text)))
+
+    assert documents == [(index, doc) for index, docs in SEED.items() for doc in docs]
+
+
+def test_json_stream_rejects_truncated_input():
+    with pytest.raises(ValueError):
+        list(iter_json_documents(io.StringIO('{"hr": [{"id": "1"}, ')))
+
+
+def test_ndjson_documents_name_their_index():
+    lines = '{"_index": "hr", "id": "1"}\n\n{"id": "2"}\n'
+
+    assert list(iter_ndjson_documents(io.StringIO(lines), default_index="misc")) == [
+        ("hr", {"id": "1"}),
+        ("misc", {"id": "2"}),
+    ]
+    with pytest.raises(ValueError, match="Line 3"):
+        list(iter_ndjson_documents(io.StringIO(lines)))
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_bulk_seed_chunks_documents_and_pauses_refresh(tmp_path, concurrency):
+    seed_file = tmp_path / "seed.json"
+    seed_file.write_text(json.dumps(SEED))
+    es = FakeElasticsearch([])
+    es.bulk_sizes = []
+    original_bulk = es.bulk
+
+    def bulk(operations):
+        es.bulk_sizes.append(len(operations) // 2)
+        return original_bulk(operations)
+
+    es.bulk = bulk
+
+    stats = bulk_seed(es, seed_file, chunk_size=2, concurrency=concurrency)
+
+    assert stats.indexed == 4
+    assert stats.indices == {"hr", "finance"}
+    assert sorted(es.bulk_sizes) == [2, 2]
+    assert sorted(doc["id"] for doc in es.indexed if doc["id"]) == ["1", "2", "F1"]
+    updates = [(update["index"], update["settings"]["index"]["refresh_interval"]) for update in es.indices.settings_updates]
+    assert updates[:2] == [("hr", "-1"), ("finance", "-1")]
+    assert sorted(updates[2:], key=str) == [("finance", None), ("hr", None)]
+    assert sorted(es.indices.refreshed) == ["finance", "hr"]
+
+
+def test_bulk_seed_reads_gzipped_ndjson(tmp_path):
+    seed_file = tmp_path / "seed.ndjson.gz"
+    with gzip.open(seed_file, "wt") as handle:
+        handle.write('{"_index": "hr", "id": "1"}\n{"_index": "hr", "id": "2"}\n')
+    es = FakeElasticsearch([])
+
+    assert bulk_seed(es, seed_file).indexed == 2
+    assert es.indices.created == ["hr"]
+
+
+def test_bulk_seed_raises_on_rejected_documents(tmp_path):
+    seed_file = tmp_path / "seed.json"
+    seed_file.write_text(json.dumps({"hr": [{"id": "1"}]}))
+    es = FakeElasticsearch([])
+    es.bulk = lambda operations: {
+        "errors": True,
+        "items": [{"index": {"_index": "hr", "status": 400, "error": {"type": "mapper_parsing_exception"}}}],
+    }
+
+    with pytest.raises(SeedError, match="rejected 1 seed documents"):
+        bulk_seed(es, seed_file)
+    assert es.indices.refreshed == ["hr"]
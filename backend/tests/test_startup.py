@@ -0,0 +1,86 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.services import startup
+from app.services.startup import StartupState
+
+STARTUP_BUDGET_SECONDS = 1.0
+
+# Imports the app and runs its startup until readiness in a fresh interpreter.
+STARTUP_SCRIPT = """
+import json, sys, time
+from fastapi.testclient import TestClient
+started = time.perf_counter()
+from app.main import app
+with TestClient(app) as client:
+    while client.get("/api/health/ready").status_code != 200:
+        time.sleep(0.005)
+    elapsed = time.perf_counter() - started
+heavy = [name for name in ("pandas", "openpyxl", "elasticsearch", "yaml", "numpy", "pyarrow") if name in sys.modules]
+print(json.dumps({"seconds": elapsed, "heavy": heavy}))
+"""
+
+
+def _measure_startup(tmp_path):
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'startup.db'}",
+        "SEED_EXCEL_PATH": "",
+        "SEED_DATASET_PATH": "",
+        "SEED_ES_PATH": "",
+    }
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT], cwd=backend, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def test_startup_is_ready_within_budget_without_heavy_imports(tmp_path):
+    results = [_measure_startup(tmp_path) for _ in range(3)]
+
+    assert results[0]["heavy"] == []
+    assert min(result["seconds"] for result in results) < STARTUP_BUDGET_SECONDS
+
+
+def test_seeding_runs_in_background_and_gates_readiness(db_session, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(startup, "_state", StartupState())
+    monkeypatch.setattr(main, "_seed", lambda: release.wait(5))
+
+    with TestClient(main.app) as client:
+        assert client.get("/api/health/").json() == {"status": "ok"}
+        pending = client.get("/api/health/ready")
+        assert pending.status_code == 503
+        assert pending.json()["checks"]["startup"]["status"] == "running"
+
+        release.set()
+        assert startup.get_startup_state().wait(5)
+        ready = client.get("/api/health/ready")
+        assert ready.status_code == 200
+        assert ready.json()["checks"] == {
+            "database": "ok",
+            "startup": {"status": "completed", "error": None, "seconds": ready.json()["checks"]["startup"]["seconds"]},
+        }
+
+
+def test_failed_seeding_is_reported_without_blocking_readiness(db_session, monkeypatch):
+    def broken_seed():
+        raise RuntimeError("seed file is corrupt")
+
+    monkeypatch.setattr(startup, "_state", StartupState())
+    monkeypatch.setattr(main, "_seed", broken_seed)
+
+    with TestClient(main.app) as client:
+        assert startup.get_startup_state().wait(5)
+        response = client.get("/api/health/ready")
+
+    assert response.status_code == 200
+    assert response.json()["checks"]["startup"]["status"] == "failed"
+    assert response.json()["checks"]["startup"]["error"] == "seed file is corrupt"
@@ -0,0 +1,26 @@
+import random
+from collections import Counter
+
+from app.services.trace_retention import PageSampler, SampleAccumulator
+
+
+def test_page_sampler_keeps_at_most_size_per_status():
+    sampler = PageSampler(3, random.Random(7))
+    statuses = ["PASS"] * 20 + ["FAIL"] * 2
+    decisions = [{"record_id": str(idx), "status": status} for idx, status in enumerate(statuses) if sampler.offer(status)]
+    kept = sampler.collect(decisions)
+
+    assert Counter(decision["status"] for decision in kept) == {"PASS": 3, "FAIL": 2}
+
+
+def test_sample_accumulator_is_roughly_uniform_across_pages():
+    hits = Counter()
+    for seed in range(400):
+        accumulator = SampleAccumulator(1, random.Random(seed))
+        for page in range(4):
+            accumulator.merge([{"record_id": str(page), "status": "PASS"}], Counter({"PASS": 1}))
+        (decision,) = accumulator.decisions()
+        hits[decision["record_id"]] += 1
+
+    assert set(hits) == {"0", "1", "2", "3"}
+    assert all(60 <= count <= 140 for count in hits.values())
@@ -1,6 +1,8 @@
 import { useEffect, useState } from 'react'
 import api from '../api/client'
-import { RunDetail, RunRuleResult, RunSummary } from '../types'
+import { DecisionTracePage, RunDetail, RunRuleResult, RunStatus, RunSummary } from '../types'
+
+export const FINISHED_RUN_STATES = ['completed', 'failed']
 
 export function useRuns() {
   const [runs, setRuns] = useState<RunSummary[]>([])
@@ -30,3 +32,17 @@ export async function fetchRunDetail(runId: number) {
   ])
   return { ...runRes.data, rule_results: ruleRes.data }
 }
+
+export async function fetchRunStatus(runId: number) {
+  const res = await api.get<RunStatus>(`/runs/${runId}/status`)
+  return res.data
+}
+
+export async function fetchRuleDecisions(runId: number, ruleId: number, after?: number | null) {
+  const params: Record<string, number> = { rule_id: ruleId, size: 50 }
+  if (after != null) {
+    params.after = after
+  }
+  const res = await api.get<DecisionTracePage>(`/runs/${runId}/decisions`, { params })
+  return res.data
+}
@@ -43,7 +43,7 @@ export default function EvaluationPage() {
         rulepack_id: rulepackId,
         dataset_id: datasetId
       })
-      setMessage('Run started successfully.')
+      // The run is queued; the results page follows its progress until it finishes.
       navigate(`/results/${response.data.id}`)
     } catch (error: any) {
       setMessage(error.message || 'Failed to start run')
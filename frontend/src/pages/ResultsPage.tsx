@@ -1,7 +1,9 @@
 import { useEffect, useState } from 'react'
 import { useParams } from 'react-router-dom'
-import { fetchRunDetail } from '../hooks/useRuns'
-import { DecisionTrace, RunDetail, RunRuleResult } from '../types'
+import { FINISHED_RUN_STATES, fetchRuleDecisions, fetchRunDetail, fetchRunStatus } from '../hooks/useRuns'
+import { DecisionTrace, RunDetail, RunRuleResult, RunStatus } from '../types'
+
+const STATUS_POLL_INTERVAL_MS = 2000
 
 interface BreadcrumbItem {
   label: string
@@ -14,15 +16,42 @@ export default function ResultsPage() {
   const [selectedRule, setSelectedRule] = useState<RunRuleResult | null>(null)
   const [selectedTrace, setSelectedTrace] = useState<DecisionTrace | null>(null)
   const [breadcrumbs, setBreadcrumbs] = useState<BreadcrumbItem[]>([])
+  const [status, setStatus] = useState<RunStatus | null>(null)
+  const [error, setError] = useState<string | null>(null)
 
   useEffect(() => {
-    if (runId) {
-      fetchRunDetail(Number(runId)).then((detail) => {
+    if (!runId) return
+    let cancelled = false
+    let timer: ReturnType<typeof setTimeout> | undefined
+    setRun(null)
+    setStatus(null)
+    setError(null)
+
+    // Runs are evaluated in the background: poll their status and only load
+    // the results once the run has completed or failed.
+    const poll = async () => {
+      try {
+        const current = await fetchRunStatus(Number(runId))
+        if (cancelled) return
+        setStatus(current)
+        if (!FINISHED_RUN_STATES.includes(current.state)) {
+          timer = setTimeout(poll, STATUS_POLL_INTERVAL_MS)
+          return
+        }
+        const detail = await fetchRunDetail(Number(runId))
+        if (cancelled) return
         setRun(detail)
         if (detail.rule_results.length) {
           setSelectedRule(detail.rule_results[0])
         }
-      })
+      } catch (err: any) {
+        if (!cancelled) setError(err.message || 'Failed to load run')
+      }
+    }
+    poll()
+    return () => {
+      cancelled = true
+      clearTimeout(timer)
     }
   }, [runId])
 
@@ -37,8 +66,15 @@ export default function ResultsPage() {
     setBreadcrumbs(crumbs)
   }, [selectedRule, selectedTrace])
 
+  if (error) {
+    return <p className="text-sm text-red-500">{error}</p>
+  }
+
   if (!run) {
-    return <p className="text-sm text-slate-500">Loading run…</p>
+    if (!status) {
+      return <p className="text-sm text-slate-500">Loading run…</p>
+    }
+    return <RunProgressPanel status={status} />
   }
 
   const statusBadges = Object.entries(run.status_counts || {})
@@ -59,6 +95,12 @@ export default function ResultsPage() {
         </div>
       </div>
 
+      {status?.state === 'failed' && (
+        <p className="rounded-lg border border-red-200 bg-red-50 px-3 py-2 text-sm text-red-600">
+          Run failed{status.error ? `: ${status.error}` : '.'}
+        </p>
+      )}
+
       <nav className="flex items-center gap-2 text-xs text-slate-500">
         {breadcrumbs.map((crumb, index) => (
           <span key={`${crumb.label}-${index}`} className="flex items-center gap-2">
@@ -105,7 +147,7 @@ export default function ResultsPage() {
           {selectedTrace ? (
             <TraceDetail trace={selectedTrace} onBack={() => setSelectedTrace(null)} />
           ) : selectedRule ? (
-            <RuleDetail rule={selectedRule} onSelectTrace={setSelectedTrace} />
+            <RuleDetail key={selectedRule.id} runId={run.id} rule={selectedRule} onSelectTrace={setSelectedTrace} />
           ) : (
             <p className="text-sm text-slate-500">Select a rule to inspect decisions.</p>
           )}
@@ -115,7 +157,51 @@ export default function ResultsPage() {
   )
 }
 
-function RuleDetail({ rule, onSelectTrace }: { rule: RunRuleResult; onSelectTrace: (trace: DecisionTrace) => void }) {
+function RunProgressPanel({ status }: { status: RunStatus }) {
+  const progress = status.progress || {}
+  return (
+    <div className="space-y-2">
+      <h1 className="text-2xl font-semibold text-presight-primary">Run #{status.id}</h1>
+      <p className="text-sm text-slate-600">
+        {status.state === 'queued' ? 'Queued, waiting for a worker…' : 'Running…'}
+      </p>
+      {status.state === 'running' && (
+        <p className="text-xs text-slate-500">
+          {progress.documents_processed ?? 0} documents evaluated
+          {progress.documents_per_second ? ` (${progress.documents_per_second} docs/sec)` : ''}
+        </p>
+      )}
+    </div>
+  )
+}
+
+function RuleDetail({
+  runId,
+  rule,
+  onSelectTrace
+}: {
+  runId: number
+  rule: RunRuleResult
+  onSelectTrace: (trace: DecisionTrace) => void
+}) {
+  const [decisions, setDecisions] = useState<DecisionTrace[]>([])
+  const [nextAfter, setNextAfter] = useState<number | null>(null)
+  const [loading, setLoading] = useState(false)
+
+  const loadPage = (after: number | null) => {
+    setLoading(true)
+    fetchRuleDecisions(runId, rule.rule_id, after)
+      .then((page) => {
+        setDecisions((current) => (after == null ? page.items : [...current, ...page.items]))
+        setNextAfter(page.next_after ?? null)
+      })
+      .finally(() => setLoading(false))
+  }
+
+  useEffect(() => {
+    loadPage(null)
+  }, [runId, rule.rule_id])
+
   return (
     <div className="rounded-xl border border-slate-200">
       <header className="border-b border-slate-200 bg-slate-50 px-5 py-4">
@@ -123,7 +209,7 @@ function RuleDetail({ rule, onSelectTrace }: { rule: RunRuleResult; onSelectTrac
         <p className="text-xs text-slate-500">Status: {rule.status}</p>
       </header>
       <div className="divide-y divide-slate-200">
-        {rule.decisions.map((decision) => (
+        {decisions.map((decision) => (
           <button
             key={decision.id}
             onClick={() => onSelectTrace(decision)}
@@ -138,9 +224,18 @@ function RuleDetail({ rule, onSelectTrace }: { rule: RunRuleResult; onSelectTrac
             <p className="mt-1 text-xs text-slate-500">{decision.rationale}</p>
           </button>
         ))}
-        {!rule.decisions.length && (
+        {!decisions.length && !loading && (
           <p className="px-5 py-6 text-sm text-slate-400">No records evaluated.</p>
         )}
+        {nextAfter != null && (
+          <button
+            onClick={() => loadPage(nextAfter)}
+            disabled={loading}
+            className="w-full px-5 py-3 text-center text-xs font-semibold text-presight-primary hover:bg-slate-50"
+          >
+            {loading ? 'Loading…' : 'Load more decisions'}
+          </button>
+        )}
       </div>
     </div>
   )
@@ -0,0 +1,87 @@
+import { act, render, screen } from '@testing-library/react'
+import { vi, type Mock } from 'vitest'
+import { MemoryRouter, Route, Routes } from 'react-router-dom'
+import ResultsPage from '../../pages/ResultsPage'
+import * as runHooks from '../../hooks/useRuns'
+import { RunDetail, RunStatus } from '../../types'
+
+vi.mock('../../hooks/useRuns', () => ({
+  FINISHED_RUN_STATES: ['completed', 'failed'],
+  fetchRunStatus: vi.fn(),
+  fetchRunDetail: vi.fn(),
+  fetchRuleDecisions: vi.fn()
+}))
+
+const baseStatus: RunStatus = {
+  id: 7,
+  state: 'queued',
+  status_counts: {},
+  progress: {},
+  started_at: new Date().toISOString()
+}
+
+const detail: RunDetail = {
+  id: 7,
+  domain: 'HR',
+  rulepack_id: 1,
+  status_counts: { PASS: 1 },
+  rule_results: [{ id: 3, rule_id: 10, status: 'PASS', summary: { new_rule_name: 'Overtime cap', rule_no: 'HR-001' } }]
+}
+
+function renderResults() {
+  return render(
+    <MemoryRouter initialEntries={['/results/7']}>
+      <Routes>
+        <Route path="/results/:runId" element={<ResultsPage />} />
+      </Routes>
+    </MemoryRouter>
+  )
+}
+
+describe('ResultsPage', () => {
+  beforeEach(() => {
+    vi.clearAllMocks()
+    vi.useFakeTimers({ shouldAdvanceTime: true })
+    ;(runHooks.fetchRunDetail as unknown as Mock).mockResolvedValue(detail)
+    ;(runHooks.fetchRuleDecisions as unknown as Mock).mockResolvedValue({ items: [], next_after: null })
+  })
+
+  afterEach(() => {
+    vi.useRealTimers()
+  })
+
+  it('polls the run status until the run completes', async () => {
+    ;(runHooks.fetchRunStatus as unknown as Mock)
+      .mockResolvedValueOnce(baseStatus)
+      .mockResolvedValueOnce({ ...baseStatus, state: 'running', progress: { documents_processed: 40 } })
+      .mockResolvedValue({ ...baseStatus, state: 'completed', status_counts: { PASS: 1 } })
+
+    renderResults()
+
+    expect(await screen.findByText(/queued/i)).toBeInTheDocument()
+    expect(runHooks.fetchRunDetail).not.toHaveBeenCalled()
+
+    await act(() => vi.advanceTimersByTimeAsync(2000))
+    expect(await screen.findByText(/40 documents evaluated/)).toBeInTheDocument()
+    expect(runHooks.fetchRunDetail).not.toHaveBeenCalled()
+
+    await act(() => vi.advanceTimersByTimeAsync(2000))
+    expect(await screen.findByText('Overtime cap')).toBeInTheDocument()
+    expect(runHooks.fetchRunStatus).toHaveBeenCalledTimes(3)
+    expect(runHooks.fetchRunDetail).toHaveBeenCalledWith(7)
+  })
+
+  it('shows the error of a failed run', async () => {
+    ;(runHooks.fetchRunStatus as unknown as Mock).mockResolvedValue({
+      ...baseStatus,
+      state: 'failed',
+      error: 'Elasticsearch unavailable'
+    })
+
+    renderResults()
+
+    expect(await screen.findByText('Run failed: Elasticsearch unavailable')).toBeInTheDocument()
+    await act(() => vi.advanceTimersByTimeAsync(4000))
+    expect(runHooks.fetchRunStatus).toHaveBeenCalledTimes(1)
+  })
+})
@@ -50,6 +50,18 @@ export interface RunSummary {
   completed_at?: string
 }
 
+export type RunState = 'queued' | 'running' | 'completed' | 'failed'
+
+export interface RunStatus {
+  id: number
+  state: RunState | string
+  status_counts: Record<string, number>
+  progress: Record<string, any>
+  error?: string | null
+  started_at: string
+  completed_at?: string | null
+}
+
 export interface DecisionTrace {
   id: number
   record_id: string
@@ -59,12 +71,16 @@ export interface DecisionTrace {
   clauses: Array<Record<string, any>>
 }
 
+export interface DecisionTracePage {
+  items: DecisionTrace[]
+  next_after?: number | null
+}
+
 export interface RunRuleResult {
   id: number
   rule_id: number
   status: StatusLabel | string
   summary: Record<string, any>
-  decisions: DecisionTrace[]
 }
 
 export interface RunDetail {